@@ -1,20 +1,263 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./alunos.db"  # caminho relativo ao projeto
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from app.utils import setup_logger_estruturado, invalidacoes_adiadas
+from app.utils.contexto import registrar_consulta
+from app.utils.metricas import metricas
+
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./alunos.db")  # caminho relativo ao projeto
+
+# Modo de perfilamento: registra comandos lentos (com parâmetros e plano de
+# execução) e devolve a contagem de consultas de cada requisição em cabeçalhos
+DB_PERFILAMENTO = os.getenv("DB_PERFILAMENTO", "0") == "1"
+DB_CONSULTA_LENTA_MS = float(os.getenv("DB_CONSULTA_LENTA_MS", "100"))
+
+logger = setup_logger_estruturado("app.banco", log_level="INFO", log_file="logs/banco.log")
+
+# Perfis de PRAGMAs aplicados a cada nova conexão SQLite.
+# "padrao" mantém o comportamento do SQLite (rollback journal, synchronous=FULL);
+# "producao" usa WAL, para que leitores não bloqueiem durante os commits.
+PERFIS_SQLITE: Dict[str, Dict[str, object]] = {
+    "padrao": {},
+    "producao": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,         # ms esperando por locks antes de SQLITE_BUSY
+        "mmap_size": 268435456,       # 256MB de leitura via memory-map
+        "cache_size": -64000,         # valores negativos são em KiB (~64MB)
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def pragmas_do_perfil(perfil: str) -> Dict[str, object]:
+    """
+    Retorna os PRAGMAs do perfil, com sobrescritas vindas do ambiente.
+
+    Cada PRAGMA pode ser ajustado individualmente com uma variável
+    `SQLITE_<NOME>` (ex.: `SQLITE_BUSY_TIMEOUT=10000`).
+    """
+    if perfil not in PERFIS_SQLITE:
+        raise ValueError(f"Perfil de banco desconhecido: {perfil}")
+    pragmas = dict(PERFIS_SQLITE[perfil])
+    for nome in PERFIS_SQLITE["producao"]:
+        valor = os.getenv(f"SQLITE_{nome.upper()}")
+        if valor is not None:
+            pragmas[nome] = valor
+    return pragmas
+
+
+def configurar_sqlite(engine: Engine, pragmas: Dict[str, object]) -> None:
+    """Registra um listener que aplica os PRAGMAs em cada conexão aberta."""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _aplicar_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for nome, valor in pragmas.items():
+            cursor.execute(f"PRAGMA {nome}={valor}")
+        cursor.close()
+
+
+def explicar_consulta(conn, statement: str, parameters) -> str:
+    """Retorna o plano de execução de um comando (EXPLAIN QUERY PLAN no SQLite)."""
+    prefixo = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    # Cursor do DBAPI: o EXPLAIN não passa pelos listeners nem entra nas métricas
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefixo + statement, parameters)
+        return " | ".join(str(linha[-1]) for linha in cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def _registrar_consulta_lenta(conn, statement: str, parameters, executemany: bool, duracao: float) -> None:
+    plano = None
+    if not executemany and statement.lstrip()[:6].upper() in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+        try:
+            plano = explicar_consulta(conn, statement, parameters)
+        except Exception as erro:
+            plano = f"indisponível: {erro}"
+    logger.warning(
+        "Consulta lenta",
+        duracao_ms=round(duracao * 1000, 3),
+        sql=" ".join(statement.split()),
+        parametros=parameters,
+        plano=plano,
+    )
+
+
+def instrumentar_consultas(engine: Engine, limite_consulta_lenta_ms: Optional[float] = None) -> None:
+    """
+    Mede cada comando SQL e o tempo de espera por conexões do pool.
+
+    A duração de cada comando é somada à requisição atual e registrada no
+    histograma por operação; a espera por conexão vai para o histograma do pool.
+
+    Args:
+        engine: Engine síncrona (ou `AsyncEngine.sync_engine`)
+        limite_consulta_lenta_ms: Comandos com duração igual ou maior são
+            registrados com parâmetros e plano de execução. Padrão:
+            DB_CONSULTA_LENTA_MS se DB_PERFILAMENTO=1; caso contrário, desativado.
+    """
+    if limite_consulta_lenta_ms is None and DB_PERFILAMENTO:
+        limite_consulta_lenta_ms = DB_CONSULTA_LENTA_MS
+    limite_lento = None if limite_consulta_lenta_ms is None else limite_consulta_lenta_ms / 1000
+    obter_conexao = engine.raw_connection
+
+    def raw_connection_medida(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return obter_conexao(*args, **kwargs)
+        finally:
+            metricas.espera_pool.observar(time.perf_counter() - inicio)
+
+    # Atributo da instância: continua valendo após engine.dispose() recriar o pool
+    engine.raw_connection = raw_connection_medida
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _iniciar_cronometro(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("inicio_consultas", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _parar_cronometro(conn, cursor, statement, parameters, context, executemany):
+        duracao = time.perf_counter() - conn.info["inicio_consultas"].pop()
+        registrar_consulta(duracao)
+        metricas.observar_consulta(statement, duracao)
+        if limite_lento is not None and duracao >= limite_lento:
+            _registrar_consulta_lenta(conn, statement, parameters, executemany, duracao)
+
+
+def criar_engine(url: str = SQLALCHEMY_DATABASE_URL, perfil: Optional[str] = None) -> Engine:
+    """
+    Cria a engine do banco aplicando o perfil de ajuste do SQLite.
+
+    Args:
+        url: URL de conexão SQLAlchemy
+        perfil: Nome do perfil em PERFIS_SQLITE (padrão: variável DB_PERFIL)
+    """
+    if not url.startswith("sqlite"):
+        nova_engine = create_engine(url)
+    else:
+        nova_engine = create_engine(url, connect_args={"check_same_thread": False})
+        configurar_sqlite(nova_engine, pragmas_do_perfil(perfil or os.getenv("DB_PERFIL", "padrao")))
+    instrumentar_consultas(nova_engine)
+    return nova_engine
+
+
+def url_assincrona(url: str) -> str:
+    """Converte uma URL síncrona para o driver assíncrono equivalente (aiosqlite/asyncpg)."""
+    for prefixo, prefixo_async in (
+        ("sqlite:", "sqlite+aiosqlite:"),
+        ("postgresql+psycopg2:", "postgresql+asyncpg:"),
+        ("postgresql:", "postgresql+asyncpg:"),
+    ):
+        if url.startswith(prefixo):
+            return prefixo_async + url[len(prefixo):]
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", url_assincrona(SQLALCHEMY_DATABASE_URL))
+
+
+def criar_engine_assincrona(url: str = ASYNC_DATABASE_URL, perfil: Optional[str] = None) -> AsyncEngine:
+    """
+    Cria a engine assíncrona, aplicando o mesmo perfil de ajuste do SQLite.
+
+    Args:
+        url: URL de conexão SQLAlchemy com driver assíncrono
+        perfil: Nome do perfil em PERFIS_SQLITE (padrão: variável DB_PERFIL)
+    """
+    nova_engine = create_async_engine(url)
+    if url.startswith("sqlite"):
+        configurar_sqlite(
+            nova_engine.sync_engine, pragmas_do_perfil(perfil or os.getenv("DB_PERFIL", "padrao"))
+        )
+    instrumentar_consultas(nova_engine.sync_engine)
+    return nova_engine
+
+
+engine = criar_engine()
+# expire_on_commit=False: as escritas dos repositórios já trazem os valores gravados
+# (INSERT/UPDATE ... RETURNING); expirar no commit forçaria um SELECT extra por objeto
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+
+async_engine = criar_engine_assincrona()
+# expire_on_commit=False: objetos retornados continuam legíveis fora do greenlet após o commit
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
 
-# Função usada nos routers com Depends(get_db)
+# Função usada com Depends(get_db) por código síncrono
 def get_db():
-    db = SessionLocal()
-    try:
+    """
+    Sessão síncrona dentro de uma unidade de trabalho.
+
+    Serviços e repositórios não fazem commit: como `executar` nas rotas
+    assíncronas, a dependência grava as escritas com um único commit ao final
+    e desfaz tudo se a rota lançar uma exceção. Código fora de rotas que use
+    `SessionLocal` diretamente deve abrir a sua própria `unidade_de_trabalho`.
+    """
+    with SessionLocal() as db, unidade_de_trabalho(db):
         yield db
+
+
+# Função usada nos routers com Depends(get_async_db)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@contextmanager
+def unidade_de_trabalho(db: Session) -> Iterator[Session]:
+    """
+    Agrupa as escritas dos repositórios numa única transação.
+
+    Os repositórios não fazem commit: a unidade mais externa faz um único
+    commit ao sair sem erro e desfaz tudo em qualquer exceção (inclusive
+    AppException). Uma unidade aberta dentro de outra vira um SAVEPOINT: um
+    erro nela desfaz apenas o trecho interno, e quem a abriu decide se
+    trata a exceção ou a propaga. As invalidações de cache são aplicadas
+    depois do commit.
+    """
+    if db.info.get("unidade_de_trabalho"):
+        with db.begin_nested():
+            yield db
+        return
+
+    db.info["unidade_de_trabalho"] = True
+    try:
+        with invalidacoes_adiadas():
+            try:
+                yield db
+                db.commit()
+            except BaseException:
+                db.rollback()
+                raise
     finally:
-        db.close()
\ No newline at end of file
+        db.info.pop("unidade_de_trabalho", None)
+
+
+async def executar(db: AsyncSession, servico, *args, **kwargs):
+    """
+    Executa um serviço síncrono sobre uma AsyncSession, numa unidade de trabalho.
+
+    O serviço recebe a sessão síncrona equivalente (`db=`) e roda dentro do
+    greenlet do SQLAlchemy: todo I/O de banco é aguardado pelo driver
+    assíncrono, sem ocupar uma thread do threadpool. Todas as escritas do
+    serviço são gravadas com um único commit ao final.
+    """
+    def em_transacao(sessao):
+        with unidade_de_trabalho(sessao):
+            return servico(*args, db=sessao, **kwargs)
+
+    return await db.run_sync(em_transacao)
@@ -1,15 +1,35 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.database import engine, Base
-from app.routers import alunos_router, turmas_router, materias_router, tarefas_router
+from fastapi.responses import ORJSONResponse
+from app.database import engine, async_engine, Base
+from app.middleware import MiddlewareRequisicoes
+from app.migrations import aplicar_migracoes
+from app.routers import alunos_router, turmas_router, materias_router, tarefas_router, metricas_router
 from app.models import Aluno, Turma, Materia, Tarefa
+from app.utils import iniciar_logs, parar_logs
 
-app = FastAPI(title="Gestão Escolar API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    iniciar_logs()
+    yield
+    # Fecha as conexões assíncronas abertas no pool ao desligar o servidor
+    await async_engine.dispose()
+    # Escreve os logs ainda na fila antes de encerrar
+    parar_logs()
+
+
+# Respostas serializadas com orjson a partir dos dados já validados pelos response_model
+app = FastAPI(title="Gestão Escolar API", lifespan=lifespan, default_response_class=ORJSONResponse)
+app.add_middleware(MiddlewareRequisicoes)
 
 # Cria tabelas
 Base.metadata.create_all(bind=engine)
+aplicar_migracoes(engine)
 
 # Registra os routers
 app.include_router(alunos_router.router)
 app.include_router(turmas_router.router)
 app.include_router(materias_router.router)
 app.include_router(tarefas_router.router)
+app.include_router(metricas_router.router)
@@ -0,0 +1,109 @@
+"""
+Middleware de correlação, tempo e métricas das requisições HTTP.
+
+Para cada requisição: define o request_id (recebido em `X-Request-ID` ou
+gerado), disponibiliza-o aos logs via contextvars, mede a latência total, o
+número de consultas SQL e o tempo gasto no banco, e registra uma linha de
+log com esses valores ao final. A latência também alimenta as métricas
+expostas em /metrics.
+"""
+
+import re
+import time
+
+from app.database import DB_PERFILAMENTO
+from app.utils import setup_logger_estruturado
+from app.utils.contexto import MetricasRequisicao, metricas_atuais, novo_request_id, request_id_atual
+from app.utils.metricas import metricas as metricas_app
+
+CABECALHO_REQUEST_ID = "X-Request-ID"
+# Ids recebidos fora deste formato são descartados e um novo é gerado
+FORMATO_REQUEST_ID = re.compile(r"[A-Za-z0-9._-]{1,64}")
+# Enviados apenas com DB_PERFILAMENTO=1
+CABECALHO_CONSULTAS = "X-DB-Queries"
+CABECALHO_TEMPO_DB = "X-DB-Time-ms"
+# Rótulo das requisições que não casaram com nenhuma rota (ex.: 404)
+ROTA_DESCONHECIDA = "<sem rota>"
+
+logger = setup_logger_estruturado("app.requisicoes", log_level="INFO", log_file="logs/requisicoes.log")
+
+
+def request_id_da_requisicao(scope) -> str:
+    """
+    Retorna o `X-Request-ID` recebido, se for válido, ou um id novo.
+
+    O valor é devolvido na resposta e gravado em todos os logs, então só são
+    aceitos até 64 caracteres alfanuméricos, `.`, `_` ou `-`; bytes inválidos
+    em UTF-8 não interrompem a requisição, apenas invalidam o id.
+    """
+    for nome, valor in scope.get("headers") or []:
+        if nome == CABECALHO_REQUEST_ID.lower().encode():
+            request_id = valor.decode("utf-8", errors="replace")
+            if FORMATO_REQUEST_ID.fullmatch(request_id):
+                return request_id
+            break
+    return novo_request_id()
+
+
+def rota_da_requisicao(scope) -> str:
+    """
+    Retorna o caminho da rota (ex.: /alunos/{id}) ou ROTA_DESCONHECIDA.
+
+    O valor vira rótulo das métricas; usar o caminho bruto das requisições
+    sem rota criaria uma série nova para cada URL inexistente.
+    """
+    rota = scope.get("route")
+    return getattr(rota, "path", None) or ROTA_DESCONHECIDA
+
+
+class MiddlewareRequisicoes:
+    """Middleware ASGI que registra request_id, rota, status, consultas e latência."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = request_id_da_requisicao(scope)
+        metricas = MetricasRequisicao()
+        token_id = request_id_atual.set(request_id)
+        token_metricas = metricas_atuais.set(metricas)
+        status = 500
+        metricas_app.requisicoes_em_andamento.somar(1)
+        inicio = time.perf_counter()
+
+        async def enviar(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+                extras = [(CABECALHO_REQUEST_ID.lower().encode(), request_id.encode())]
+                if DB_PERFILAMENTO:
+                    extras += [
+                        (CABECALHO_CONSULTAS.lower().encode(), str(metricas.consultas).encode()),
+                        (CABECALHO_TEMPO_DB.lower().encode(), f"{metricas.tempo_db * 1000:.3f}".encode()),
+                    ]
+                mensagem["headers"] = list(mensagem.get("headers", [])) + extras
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            duracao = time.perf_counter() - inicio
+            rota = rota_da_requisicao(scope)
+            metricas_app.requisicoes_em_andamento.somar(-1)
+            metricas_app.duracao_requisicoes.observar(duracao, metodo=scope["method"], rota=rota)
+            metricas_app.requisicoes.incrementar(metodo=scope["method"], rota=rota, status=str(status))
+            logger.info(
+                "Requisição concluída",
+                metodo=scope["method"],
+                rota=rota,
+                status=status,
+                duracao_ms=round(duracao * 1000, 3),
+                consultas_db=metricas.consultas,
+                tempo_db_ms=round(metricas.tempo_db * 1000, 3),
+            )
+            metricas_atuais.reset(token_metricas)
+            request_id_atual.reset(token_id)
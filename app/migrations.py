@@ -0,0 +1,99 @@
+"""
+Migrações incrementais para bancos SQLite já existentes.
+
+`Base.metadata.create_all` só cria tabelas que ainda não existem, então
+alterações de esquema em tabelas antigas (colunas, índices, chaves) precisam ser
+aplicadas aqui. Cada passo é idempotente e pode rodar a cada inicialização.
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.database import Base, unidade_de_trabalho
+from app.models import aluno_materia
+from app.services.contadores_service import reconciliar_contadores_service
+from app.utils import setup_logger
+
+logger = setup_logger(__name__, log_level="INFO", log_file="logs/app.log")
+
+
+def _converter_matriculas_para_chave_primaria(conn) -> None:
+    """
+    Recria aluno_materia com a chave primária composta (aluno_id, materia_id).
+
+    O SQLite não permite adicionar chave primária a uma tabela existente, então
+    a tabela é recriada; pares duplicados ou incompletos são descartados.
+    """
+    colunas = conn.execute(text("PRAGMA table_info(aluno_materia)")).all()
+    if not colunas or any(coluna.pk for coluna in colunas):
+        return
+    total = conn.execute(text("SELECT COUNT(*) FROM aluno_materia")).scalar()
+    conn.execute(text("ALTER TABLE aluno_materia RENAME TO aluno_materia_antiga"))
+    aluno_materia.create(conn)
+    conn.execute(text(
+        "INSERT OR IGNORE INTO aluno_materia (aluno_id, materia_id) "
+        "SELECT aluno_id, materia_id FROM aluno_materia_antiga "
+        "WHERE aluno_id IS NOT NULL AND materia_id IS NOT NULL"
+    ))
+    conn.execute(text("DROP TABLE aluno_materia_antiga"))
+    descartadas = total - conn.execute(text("SELECT COUNT(*) FROM aluno_materia")).scalar()
+    if descartadas:
+        logger.warning(f"Removidas {descartadas} matrículas duplicadas ou incompletas")
+
+
+# Colunas de contadores materializados: (tabela, coluna)
+COLUNAS_CONTADORES = [
+    ("alunos", "tarefas_pendentes"),
+    ("materias", "total_alunos"),
+    ("turmas", "total_bolsistas"),
+]
+
+
+def _adicionar_colunas_contadores(conn) -> bool:
+    """Adiciona as colunas de contadores ausentes; retorna True se alguma foi criada."""
+    adicionadas = False
+    for tabela, coluna in COLUNAS_CONTADORES:
+        existentes = {linha[1] for linha in conn.execute(text(f"PRAGMA table_info({tabela})"))}
+        if not existentes:
+            continue
+        if coluna not in existentes:
+            conn.execute(text(
+                f"ALTER TABLE {tabela} ADD COLUMN {coluna} INTEGER NOT NULL DEFAULT 0"
+            ))
+            adicionadas = True
+    return adicionadas
+
+
+def _criar_indices_do_modelo(conn) -> None:
+    """Cria os índices declarados nos modelos que ainda não existem no banco."""
+    for tabela in Base.metadata.sorted_tables:
+        if inspect(conn).has_table(tabela.name):
+            for indice in tabela.indexes:
+                indice.create(conn, checkfirst=True)
+
+
+MIGRACOES = [
+    _converter_matriculas_para_chave_primaria,
+    _adicionar_colunas_contadores,
+    _criar_indices_do_modelo,
+]
+
+
+def aplicar_migracoes(engine: Engine) -> None:
+    """
+    Aplica todas as migrações em uma única transação.
+
+    Se alguma migração criar colunas de contadores, eles são preenchidos
+    em seguida a partir dos dados existentes.
+
+    Args:
+        engine: Engine SQLAlchemy do banco a ser migrado
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        reconciliar = any([migracao(conn) for migracao in MIGRACOES])
+    if reconciliar:
+        with Session(engine) as db, unidade_de_trabalho(db):
+            reconciliar_contadores_service(db)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -6,20 +6,25 @@ from app.database import Base
 aluno_materia = Table(
     "aluno_materia",
     Base.metadata,
-    Column("aluno_id", Integer, ForeignKey("alunos.id")),
-    Column("materia_id", Integer, ForeignKey("materias.id"))
+    # Chave primária composta: impede matrículas duplicadas e indexa buscas por aluno
+    Column("aluno_id", Integer, ForeignKey("alunos.id"), primary_key=True),
+    Column("materia_id", Integer, ForeignKey("materias.id"), primary_key=True, index=True),
 )
 
 class Turma(Base):
     __tablename__ = "turmas"
     id = Column(Integer, primary_key=True, index=True)
     nome = Column(String, unique=True, index=True)
+    # Contador materializado para o ranking /turmas/mais-bolsistas
+    total_bolsistas = Column(Integer, nullable=False, default=0, server_default="0", index=True)
     alunos = relationship("Aluno", back_populates="turma")
 
 class Materia(Base):
     __tablename__ = "materias"
     id = Column(Integer, primary_key=True, index=True)
     nome = Column(String, unique=True, index=True)
+    # Contador materializado para o ranking /materias/mais-alunos
+    total_alunos = Column(Integer, nullable=False, default=0, server_default="0", index=True)
     alunos = relationship("Aluno", secondary=aluno_materia, back_populates="materias")
 
 class Aluno(Base):
@@ -29,7 +34,9 @@ class Aluno(Base):
     nome = Column(String)
     idade = Column(Integer)
     bolsista = Column(Boolean, default=False)  # Novo atributo
-    turma_id = Column(Integer, ForeignKey("turmas.id"))
+    turma_id = Column(Integer, ForeignKey("turmas.id"), index=True)
+    # Contador materializado para o ranking /alunos/mais-pendentes
+    tarefas_pendentes = Column(Integer, nullable=False, default=0, server_default="0", index=True)
     turma = relationship("Turma", back_populates="alunos")
     materias = relationship("Materia", secondary=aluno_materia, back_populates="alunos")
 
@@ -37,11 +44,13 @@ class Aluno(Base):
 
 class Tarefa(Base):
     __tablename__ = "tarefas"
+    # Índice composto: atende buscas por aluno e por tarefas pendentes do aluno
+    __table_args__ = (Index("ix_tarefas_aluno_id_concluido", "aluno_id", "concluido"),)
 
     id = Column(Integer, primary_key=True, index=True)
     nome = Column(String)
     concluido = Column(Boolean, default=False)
-    materia_id = Column(Integer, ForeignKey("materias.id"))
+    materia_id = Column(Integer, ForeignKey("materias.id"), index=True)
     aluno_id = Column(Integer, ForeignKey("alunos.id"))
 
     materia = relationship("Materia")
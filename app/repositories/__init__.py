@@ -3,6 +3,13 @@ from app.repositories.aluno_repository import AlunoRepository
 from app.repositories.turma_repository import TurmaRepository
 from app.repositories.materia_repository import MateriaRepository
 from app.repositories.tarefa_repository import TarefaRepository
+from app.repositories.async_repository import (
+    AsyncBaseRepository,
+    AsyncAlunoRepository,
+    AsyncTurmaRepository,
+    AsyncMateriaRepository,
+    AsyncTarefaRepository,
+)
 
 __all__ = [
     "BaseRepository",
@@ -10,4 +17,9 @@ __all__ = [
     "TurmaRepository",
     "MateriaRepository",
     "TarefaRepository",
+    "AsyncBaseRepository",
+    "AsyncAlunoRepository",
+    "AsyncTurmaRepository",
+    "AsyncMateriaRepository",
+    "AsyncTarefaRepository",
 ]
@@ -1,7 +1,10 @@
-from typing import List, Optional
+from collections import Counter
+from typing import Iterable, List, Optional, Set
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from app.repositories.base_repository import BaseRepository
-from app.models import Aluno
+from app.models import Aluno, Turma, Materia, Tarefa, aluno_materia
 
 class AlunoRepository(BaseRepository[Aluno]):
     """Repositório para operações de dados da entidade Aluno"""
@@ -9,38 +12,153 @@ class AlunoRepository(BaseRepository[Aluno]):
     def create(self, entity: Aluno) -> Aluno:
         """Cria um novo aluno no banco de dados"""
         self.db.add(entity)
-        self.db.commit()
-        self.db.refresh(entity)
+        if entity.bolsista:
+            self._ajustar_bolsistas({entity.turma_id: 1})
+        # O INSERT ... RETURNING preenche o ID; o commit fica com a unidade de trabalho
+        self.db.flush()
         return entity
 
+    def create_many(self, dados: List[dict]) -> List[dict]:
+        """
+        Cria vários alunos na transação corrente.
+
+        Usa um INSERT ... RETURNING em lote (executemany) e retorna as linhas
+        criadas como dicionários. Se qualquer inserção falhar, a unidade de
+        trabalho desfaz o lote inteiro.
+        """
+        if not dados:
+            return []
+        stmt = insert(Aluno).returning(*Aluno.__table__.c, sort_by_parameter_order=True)
+        self._ajustar_bolsistas(Counter(d["turma_id"] for d in dados if d.get("bolsista")))
+        return [dict(linha) for linha in self.db.execute(stmt, dados).mappings()]
+
+    def inserir_em_lote(self, dados: List[dict]) -> int:
+        """
+        Variante de `create_many` sem RETURNING; retorna quantos alunos foram inseridos.
+
+        Sem linhas a devolver, o lote vai num único executemany. Com RETURNING
+        ordenado, o SQLite (sem sentinela de inserção) exige um INSERT por linha.
+        """
+        if not dados:
+            return 0
+        self._ajustar_bolsistas(Counter(d["turma_id"] for d in dados if d.get("bolsista")))
+        self.db.execute(insert(Aluno), dados)
+        return len(dados)
+
     def get_by_id(self, id: int) -> Optional[Aluno]:
         """Busca um aluno por ID"""
         return self.db.query(Aluno).filter(Aluno.id == id).first()
 
-    def get_all(self) -> List[Aluno]:
-        """Retorna todos os alunos"""
-        return self.db.query(Aluno).all()
+    def get_all(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Aluno]:
+        """Retorna os alunos, paginados por cursor quando informado"""
+        return self._paginar(self.db.query(Aluno), Aluno.id, after_id, limit)
+
+    def listar_resumo(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Row]:
+        """
+        Lista os alunos como `Row`s com as colunas da tabela, sem hidratar objetos ORM.
+
+        Mesma paginação e mesmos campos de `get_all`, para leituras que vão
+        direto para a resposta.
+        """
+        return self._paginar_linhas(select(*Aluno.__table__.c), Aluno.id, after_id, limit)
 
     def update(self, id: int, **kwargs) -> Optional[Aluno]:
-        """Atualiza um aluno existente"""
-        aluno = self.get_by_id(id)
-        if aluno:
-            for campo, valor in kwargs.items():
-                if hasattr(aluno, campo):
-                    setattr(aluno, campo, valor)
-            self.db.commit()
-            self.db.refresh(aluno)
+        """
+        Atualiza um aluno existente com um único UPDATE ... RETURNING.
+
+        Se a turma ou a bolsa mudarem, o contador da turma antiga é
+        decrementado antes (com os valores ainda gravados) e o da nova é
+        incrementado a partir da linha retornada.
+        """
+        muda_bolsistas = "turma_id" in kwargs or "bolsista" in kwargs
+        if muda_bolsistas:
+            self._decrementar_contador(
+                Turma.__table__.c.total_bolsistas,
+                select(Aluno.turma_id).where(Aluno.id == id, Aluno.bolsista == True).scalar_subquery(),
+            )
+        aluno = self._atualizar(Aluno, id, kwargs)
+        if aluno and muda_bolsistas and aluno.bolsista:
+            self._ajustar_bolsistas({aluno.turma_id: 1})
         return aluno
 
     def delete(self, id: int) -> bool:
-        """Remove um aluno do banco de dados"""
-        aluno = self.get_by_id(id)
-        if aluno:
-            self.db.delete(aluno)
-            self.db.commit()
-            return True
-        return False
-
-    def get_by_turma_id(self, turma_id: int) -> List[Aluno]:
+        """
+        Remove um aluno do banco de dados, sem carregá-lo antes.
+
+        As matrículas são apagadas com DELETE ... RETURNING (que informa quais
+        contadores de matéria decrementar), as tarefas perdem o vínculo e o
+        aluno é removido com um único DELETE; nenhuma linha removida indica
+        aluno inexistente.
+        """
+        materias = self.db.execute(
+            delete(aluno_materia).where(aluno_materia.c.aluno_id == id).returning(aluno_materia.c.materia_id)
+        ).scalars().all()
+        self._ajustar_contador(Materia.__table__.c.total_alunos, {materia_id: -1 for materia_id in materias})
+        self.db.execute(update(Tarefa).where(Tarefa.aluno_id == id).values(aluno_id=None))
+        removido = self.db.execute(
+            delete(Aluno).where(Aluno.id == id).returning(Aluno.turma_id, Aluno.bolsista)
+        ).one_or_none()
+        if removido is None:
+            return False
+        if removido.bolsista:
+            self._ajustar_bolsistas({removido.turma_id: -1})
+        return True
+
+    def get_ids_existentes(self, ids: Iterable[int]) -> Set[int]:
+        """Retorna, com uma única consulta IN, quais dos IDs informados existem"""
+        ids = set(ids)
+        if not ids:
+            return set()
+        return {id for (id,) in self.db.query(Aluno.id).filter(Aluno.id.in_(ids))}
+
+    def get_by_turma_id(self, turma_id: int, after_id: Optional[int] = None,
+                        limit: Optional[int] = None) -> List[Aluno]:
         """Busca alunos por ID da turma"""
-        return self.db.query(Aluno).filter(Aluno.turma_id == turma_id).all()
+        query = self.db.query(Aluno).filter(Aluno.turma_id == turma_id)
+        return self._paginar(query, Aluno.id, after_id, limit)
+
+    def count_by_turma_id(self, turma_id: int) -> int:
+        """Conta os alunos de uma turma"""
+        return self.db.query(Aluno).filter(Aluno.turma_id == turma_id).count()
+
+    def get_by_materia_id(self, materia_id: int, after_id: Optional[int] = None,
+                          limit: Optional[int] = None) -> List[Aluno]:
+        """Busca alunos matriculados em uma matéria"""
+        query = (
+            self.db.query(Aluno)
+            .join(aluno_materia, Aluno.id == aluno_materia.c.aluno_id)
+            .filter(aluno_materia.c.materia_id == materia_id)
+        )
+        return self._paginar(query, Aluno.id, after_id, limit)
+
+    def listar_resumo_por_turma(self, turma_id: int, after_id: Optional[int] = None,
+                                limit: Optional[int] = None) -> List[Row]:
+        """Variante de `get_by_turma_id` que retorna `Row`s, como `listar_resumo`"""
+        stmt = select(*Aluno.__table__.c).where(Aluno.turma_id == turma_id)
+        return self._paginar_linhas(stmt, Aluno.id, after_id, limit)
+
+    def listar_resumo_por_materia(self, materia_id: int, after_id: Optional[int] = None,
+                                  limit: Optional[int] = None) -> List[Row]:
+        """Variante de `get_by_materia_id` que retorna `Row`s, como `listar_resumo`"""
+        stmt = (
+            select(*Aluno.__table__.c)
+            .join(aluno_materia, Aluno.id == aluno_materia.c.aluno_id)
+            .where(aluno_materia.c.materia_id == materia_id)
+        )
+        return self._paginar_linhas(stmt, Aluno.id, after_id, limit)
+
+    def recalcular_tarefas_pendentes(self) -> int:
+        """Recalcula do zero o contador de tarefas pendentes de todos os alunos (sem commit)"""
+        pendentes = (
+            select(func.count(Tarefa.id))
+            .where(Tarefa.aluno_id == Aluno.id, Tarefa.concluido == False)
+            .scalar_subquery()
+        )
+        resultado = self.db.execute(
+            update(Aluno).values(tarefas_pendentes=pendentes).execution_options(synchronize_session=False)
+        )
+        return resultado.rowcount
+
+    def _ajustar_bolsistas(self, deltas: dict) -> None:
+        """Aplica variações ao contador de bolsistas das turmas (sem commit)"""
+        self._ajustar_contador(Turma.__table__.c.total_bolsistas, deltas)
@@ -0,0 +1,108 @@
+from typing import AsyncIterator, Generic, List, Optional, Sequence, Type, TypeVar
+from sqlalchemy import select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import unidade_de_trabalho
+from app.repositories.base_repository import BaseRepository
+from app.repositories.aluno_repository import AlunoRepository
+from app.repositories.turma_repository import TurmaRepository
+from app.repositories.materia_repository import MateriaRepository
+from app.repositories.tarefa_repository import TarefaRepository
+from app.models import Aluno, Turma, Materia, Tarefa
+
+T = TypeVar('T')
+
+class AsyncBaseRepository(Generic[T]):
+    """
+    Variante assíncrona de um repositório, sobre uma AsyncSession.
+
+    As consultas são as mesmas do repositório síncrono (`repositorio`), executadas
+    via `AsyncSession.run_sync`: o I/O é aguardado pelo driver assíncrono e o
+    event loop fica livre enquanto a consulta está em andamento. Métodos
+    específicos do repositório síncrono (ex.: `get_by_turma_id`) também ficam
+    disponíveis como corrotinas. Cada chamada é uma unidade de trabalho própria
+    (commit ao final).
+    """
+
+    repositorio: Type[BaseRepository]
+    modelo: type
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _executar(self, metodo: str, *args, **kwargs):
+        def em_transacao(sessao):
+            with unidade_de_trabalho(sessao):
+                return getattr(self.repositorio(sessao), metodo)(*args, **kwargs)
+
+        return await self.db.run_sync(em_transacao)
+
+    async def create(self, entity: T) -> T:
+        """Cria uma nova entidade no banco de dados"""
+        return await self._executar("create", entity)
+
+    async def get_by_id(self, id: int) -> Optional[T]:
+        """Busca uma entidade por ID"""
+        return await self._executar("get_by_id", id)
+
+    async def get_all(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[T]:
+        """Retorna as entidades, opcionalmente paginadas por cursor"""
+        return await self._executar("get_all", after_id, limit)
+
+    async def update(self, id: int, **kwargs) -> Optional[T]:
+        """Atualiza uma entidade existente"""
+        return await self._executar("update", id, **kwargs)
+
+    async def delete(self, id: int) -> bool:
+        """Remove uma entidade do banco de dados"""
+        return await self._executar("delete", id)
+
+    async def exportar(self, lote: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        """
+        Percorre a tabela inteira, em ordem de ID, em lotes de até `lote` linhas.
+
+        Usa `AsyncSession.stream` com `yield_per`: o driver busca um lote por
+        vez do cursor (fetchmany), então a memória fica limitada ao lote
+        qualquer que seja o tamanho da tabela. Retorna `Row`s com as colunas
+        da tabela, sem objetos ORM.
+        """
+        stmt = select(*self.modelo.__table__.c).order_by(self.modelo.id).execution_options(yield_per=lote)
+        resultado = await self.db.stream(stmt)
+        try:
+            async for linhas in resultado.partitions():
+                yield linhas
+        finally:
+            await resultado.close()
+
+    def __getattr__(self, nome: str):
+        if nome.startswith("_") or not callable(getattr(self.repositorio, nome, None)):
+            raise AttributeError(nome)
+
+        async def metodo(*args, **kwargs):
+            return await self._executar(nome, *args, **kwargs)
+
+        return metodo
+
+
+class AsyncAlunoRepository(AsyncBaseRepository[Aluno]):
+    """Repositório assíncrono da entidade Aluno"""
+    repositorio = AlunoRepository
+    modelo = Aluno
+
+
+class AsyncTurmaRepository(AsyncBaseRepository[Turma]):
+    """Repositório assíncrono da entidade Turma"""
+    repositorio = TurmaRepository
+    modelo = Turma
+
+
+class AsyncMateriaRepository(AsyncBaseRepository[Materia]):
+    """Repositório assíncrono da entidade Materia"""
+    repositorio = MateriaRepository
+    modelo = Materia
+
+
+class AsyncTarefaRepository(AsyncBaseRepository[Tarefa]):
+    """Repositório assíncrono da entidade Tarefa"""
+    repositorio = TarefaRepository
+    modelo = Tarefa
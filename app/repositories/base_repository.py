@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Generic, TypeVar, List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import Column, Select, bindparam, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, Query
 
 T = TypeVar('T')
 
@@ -8,6 +10,10 @@ class BaseRepository(ABC, Generic[T]):
     """
     Interface abstrata para repositórios de dados.
     Define operações CRUD básicas que devem ser implementadas.
+
+    Os métodos não fazem commit: as escritas participam da transação da
+    sessão, gravada uma única vez pela unidade de trabalho
+    (`app.database.unidade_de_trabalho`).
     """
 
     def __init__(self, db: Session):
@@ -24,8 +30,8 @@ class BaseRepository(ABC, Generic[T]):
         pass
 
     @abstractmethod
-    def get_all(self) -> List[T]:
-        """Retorna todas as entidades"""
+    def get_all(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[T]:
+        """Retorna as entidades, opcionalmente paginadas por cursor"""
         pass
 
     @abstractmethod
@@ -37,3 +43,82 @@ class BaseRepository(ABC, Generic[T]):
     def delete(self, id: int) -> bool:
         """Remove uma entidade do banco de dados"""
         pass
+
+    def _paginar(self, query: Query, coluna_id, after_id: Optional[int] = None,
+                 limit: Optional[int] = None) -> List:
+        """
+        Aplica paginação por cursor (keyset) a uma consulta.
+
+        Retorna apenas as linhas com ID maior que `after_id`, ordenadas por ID,
+        de modo que cada página custa O(limit) independente da profundidade.
+        """
+        return self._aplicar_cursor(query, coluna_id, after_id, limit).all()
+
+    def _paginar_linhas(self, stmt: Select, coluna_id, after_id: Optional[int] = None,
+                        limit: Optional[int] = None) -> List[Row]:
+        """
+        Variante de `_paginar` para consultas de colunas (`select(Modelo.a, ...)`).
+
+        Retorna `Row`s (tuplas nomeadas, com acesso por atributo) sem hidratar
+        objetos ORM nem registrá-los no identity map.
+        """
+        return self.db.execute(self._aplicar_cursor(stmt, coluna_id, after_id, limit)).all()
+
+    @staticmethod
+    def _aplicar_cursor(consulta, coluna_id, after_id: Optional[int], limit: Optional[int]):
+        """Filtra por ID maior que `after_id`, ordena por ID e limita a página"""
+        if after_id is not None:
+            consulta = consulta.filter(coluna_id > after_id)
+        consulta = consulta.order_by(coluna_id)
+        if limit is not None:
+            consulta = consulta.limit(limit)
+        return consulta
+
+    def _atualizar(self, modelo, id: int, valores: dict) -> Optional[T]:
+        """
+        Atualiza uma linha com um único UPDATE ... WHERE id = ? RETURNING.
+
+        Campos que não são colunas do modelo são ignorados. A entidade volta
+        preenchida pelo RETURNING (e sincronizada no identity map), sem SELECT
+        antes ou depois; retorna None se nenhuma linha foi afetada.
+        """
+        colunas = modelo.__table__.c
+        valores = {campo: valor for campo, valor in valores.items() if campo in colunas and campo != "id"}
+        if not valores:
+            return self.get_by_id(id)
+        stmt = update(modelo).where(modelo.id == id).values(valores).returning(modelo)
+        return self.db.execute(stmt).scalars().one_or_none()
+
+    def _decrementar_contador(self, coluna: Column, chave) -> None:
+        """
+        Subtrai 1 do contador da linha cujo ID é dado pela subconsulta escalar `chave`.
+
+        Usado antes de alterar ou remover a linha de origem, quando o valor
+        antigo ainda está no banco; se a subconsulta não retornar linha, nada
+        é alterado. Não faz commit.
+        """
+        tabela = coluna.table
+        self.db.connection().execute(
+            update(tabela).where(tabela.c.id == chave).values({coluna.name: coluna - 1})
+        )
+
+    def _ajustar_contador(self, coluna: Column, deltas: dict) -> None:
+        """
+        Soma variações a uma coluna contadora, indexadas pelo ID da linha.
+
+        Não faz commit: a atualização participa da transação corrente e é
+        gravada junto com a escrita que a originou.
+        """
+        parametros = [
+            {"chave": chave, "delta": delta}
+            for chave, delta in deltas.items()
+            if chave is not None and delta
+        ]
+        if parametros:
+            tabela = coluna.table
+            self.db.connection().execute(
+                update(tabela)
+                .where(tabela.c.id == bindparam("chave"))
+                .values({coluna.name: coluna + bindparam("delta")}),
+                parametros,
+            )
@@ -1,7 +1,10 @@
-from typing import List, Optional
+from collections import Counter
+from typing import Iterable, List, Optional, Set
+from sqlalchemy import delete, insert, select, exists, true, func, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from app.repositories.base_repository import BaseRepository
-from app.models import Materia
+from app.models import Materia, Aluno, aluno_materia
 
 class MateriaRepository(BaseRepository[Materia]):
     """Repositório para operações de dados da entidade Materia"""
@@ -9,37 +12,76 @@ class MateriaRepository(BaseRepository[Materia]):
     def create(self, entity: Materia) -> Materia:
         """Cria uma nova matéria no banco de dados"""
         self.db.add(entity)
-        self.db.commit()
-        self.db.refresh(entity)
+        # O INSERT ... RETURNING preenche o ID; o commit fica com a unidade de trabalho
+        self.db.flush()
         return entity
 
     def get_by_id(self, id: int) -> Optional[Materia]:
         """Busca uma matéria por ID"""
         return self.db.query(Materia).filter(Materia.id == id).first()
 
-    def get_all(self) -> List[Materia]:
-        """Retorna todas as matérias"""
-        return self.db.query(Materia).all()
+    def get_all(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Materia]:
+        """Retorna as matérias, paginadas por cursor quando informado"""
+        return self._paginar(self.db.query(Materia), Materia.id, after_id, limit)
+
+    def listar_resumo(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Row]:
+        """Lista as matérias como `Row`s (id, nome), sem hidratar objetos ORM"""
+        return self._paginar_linhas(select(Materia.id, Materia.nome), Materia.id, after_id, limit)
 
     def update(self, id: int, **kwargs) -> Optional[Materia]:
-        """Atualiza uma matéria existente"""
-        materia = self.get_by_id(id)
-        if materia:
-            for campo, valor in kwargs.items():
-                if hasattr(materia, campo):
-                    setattr(materia, campo, valor)
-            self.db.commit()
-            self.db.refresh(materia)
-        return materia
+        """Atualiza uma matéria existente com um único UPDATE ... RETURNING"""
+        return self._atualizar(Materia, id, kwargs)
 
     def delete(self, id: int) -> bool:
-        """Remove uma matéria do banco de dados"""
-        materia = self.get_by_id(id)
-        if materia:
-            self.db.delete(materia)
-            self.db.commit()
-            return True
-        return False
+        """Remove uma matéria e suas matrículas, sem carregá-la antes"""
+        self.db.execute(delete(aluno_materia).where(aluno_materia.c.materia_id == id))
+        return self.db.execute(delete(Materia).where(Materia.id == id)).rowcount > 0
+
+    def get_ids_existentes(self, ids: Iterable[int]) -> Set[int]:
+        """Retorna, com uma única consulta IN, quais dos IDs informados existem"""
+        ids = set(ids)
+        if not ids:
+            return set()
+        return {id for (id,) in self.db.query(Materia.id).filter(Materia.id.in_(ids))}
+
+    def matricular_turma(self, turma_id: int, materia_ids: Iterable[int]) -> int:
+        """
+        Matricula todos os alunos da turma nas matérias informadas.
+
+        Usa um único INSERT ... SELECT ... WHERE NOT EXISTS, inserindo apenas
+        os pares (aluno, matéria) ainda inexistentes. Retorna quantas
+        matrículas novas foram criadas.
+        """
+        ja_matriculado = exists().where(
+            aluno_materia.c.aluno_id == Aluno.id,
+            aluno_materia.c.materia_id == Materia.id,
+        )
+        pares = select(Aluno.id, Materia.id).join_from(Aluno, Materia, true()).where(
+            Aluno.turma_id == turma_id,
+            Materia.id.in_(list(materia_ids)),
+            ~ja_matriculado,
+        )
+        stmt = (
+            insert(aluno_materia)
+            .from_select(["aluno_id", "materia_id"], pares)
+            .returning(aluno_materia.c.materia_id)
+        )
+        novas_por_materia = Counter(self.db.execute(stmt).scalars())
+        self._ajustar_contador(Materia.__table__.c.total_alunos, novas_por_materia)
+        return sum(novas_por_materia.values())
+
+    def recalcular_total_alunos(self) -> int:
+        """Recalcula do zero o contador de alunos de todas as matérias (sem commit)"""
+        total = (
+            select(func.count())
+            .select_from(aluno_materia)
+            .where(aluno_materia.c.materia_id == Materia.id)
+            .scalar_subquery()
+        )
+        resultado = self.db.execute(
+            update(Materia).values(total_alunos=total).execution_options(synchronize_session=False)
+        )
+        return resultado.rowcount
 
     def get_by_nome(self, nome: str) -> Optional[Materia]:
         """Busca uma matéria por nome"""
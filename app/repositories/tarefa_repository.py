@@ -1,7 +1,10 @@
-from typing import List, Optional
+from collections import Counter
+from typing import Iterable, List, Optional, Set, Tuple
+from sqlalchemy import delete, insert, select, literal, false, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from app.repositories.base_repository import BaseRepository
-from app.models import Tarefa
+from app.models import Tarefa, Aluno, Materia
 
 class TarefaRepository(BaseRepository[Tarefa]):
     """Repositório para operações de dados da entidade Tarefa"""
@@ -9,41 +12,123 @@ class TarefaRepository(BaseRepository[Tarefa]):
     def create(self, entity: Tarefa) -> Tarefa:
         """Cria uma nova tarefa no banco de dados"""
         self.db.add(entity)
-        self.db.commit()
-        self.db.refresh(entity)
+        if not entity.concluido:
+            self._ajustar_pendentes({entity.aluno_id: 1})
+        # O INSERT ... RETURNING preenche o ID; o commit fica com a unidade de trabalho
+        self.db.flush()
         return entity
 
+    def create_para_turma(self, nome: str, materia_id: int, turma_id: int) -> List[dict]:
+        """
+        Cria uma tarefa para cada aluno da turma com um único INSERT ... SELECT.
+
+        Retorna as tarefas criadas como dicionários (lista vazia se a turma
+        não tiver alunos).
+        """
+        alunos_da_turma = select(
+            literal(nome), literal(materia_id), Aluno.id, false()
+        ).where(Aluno.turma_id == turma_id).order_by(Aluno.id)
+        stmt = (
+            insert(Tarefa)
+            .from_select(["nome", "materia_id", "aluno_id", "concluido"], alunos_da_turma)
+            .returning(*Tarefa.__table__.c)
+        )
+        criadas = [dict(linha) for linha in self.db.execute(stmt).mappings()]
+        self._ajustar_pendentes({tarefa["aluno_id"]: 1 for tarefa in criadas})
+        return criadas
+
     def get_by_id(self, id: int) -> Optional[Tarefa]:
         """Busca uma tarefa por ID"""
         return self.db.query(Tarefa).filter(Tarefa.id == id).first()
 
-    def get_all(self) -> List[Tarefa]:
-        """Retorna todas as tarefas"""
-        return self.db.query(Tarefa).all()
+    def get_all(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Tarefa]:
+        """Retorna as tarefas, paginadas por cursor quando informado"""
+        return self._paginar(self.db.query(Tarefa), Tarefa.id, after_id, limit)
 
     def update(self, id: int, **kwargs) -> Optional[Tarefa]:
-        """Atualiza uma tarefa existente"""
-        tarefa = self.get_by_id(id)
-        if tarefa:
-            for campo, valor in kwargs.items():
-                if hasattr(tarefa, campo):
-                    setattr(tarefa, campo, valor)
-            self.db.commit()
-            self.db.refresh(tarefa)
+        """
+        Atualiza uma tarefa existente com um único UPDATE ... RETURNING.
+
+        Se o aluno ou a conclusão mudarem, o contador de pendentes do aluno
+        antigo é decrementado antes (com os valores ainda gravados) e o do
+        novo é incrementado a partir da linha retornada.
+        """
+        muda_pendentes = "aluno_id" in kwargs or "concluido" in kwargs
+        if muda_pendentes:
+            self._decrementar_contador(
+                Aluno.__table__.c.tarefas_pendentes,
+                select(Tarefa.aluno_id).where(Tarefa.id == id, Tarefa.concluido == False).scalar_subquery(),
+            )
+        tarefa = self._atualizar(Tarefa, id, kwargs)
+        # `concluido` pode voltar como 0/1 (valor informado pelo chamador)
+        if tarefa and muda_pendentes and not tarefa.concluido:
+            self._ajustar_pendentes({tarefa.aluno_id: 1})
         return tarefa
 
     def delete(self, id: int) -> bool:
-        """Remove uma tarefa do banco de dados"""
-        tarefa = self.get_by_id(id)
-        if tarefa:
-            self.db.delete(tarefa)
-            self.db.commit()
-            return True
-        return False
-
-    def get_by_aluno_id(self, aluno_id: int) -> List[Tarefa]:
+        """Remove uma tarefa com um único DELETE ... RETURNING, sem carregá-la antes"""
+        removida = self.db.execute(
+            delete(Tarefa).where(Tarefa.id == id).returning(Tarefa.aluno_id, Tarefa.concluido)
+        ).one_or_none()
+        if removida is not None and not removida.concluido:
+            self._ajustar_pendentes({removida.aluno_id: -1})
+        return removida is not None
+
+    def concluir(self, ids: Iterable[int]) -> Tuple[List[int], Set[int]]:
+        """
+        Marca tarefas como concluídas com um único UPDATE condicional.
+
+        Só as tarefas ainda pendentes são alteradas (`WHERE concluido = 0`); o
+        RETURNING informa quais foram, para decrementar os contadores dos
+        alunos. Apenas quando algum ID não volta no RETURNING (já concluído ou
+        inexistente) é feita uma consulta para separar os inexistentes.
+
+        Returns:
+            (IDs concluídos agora, IDs inexistentes)
+        """
+        ids = set(ids)
+        if not ids:
+            return [], set()
+        alteradas = self.db.execute(
+            update(Tarefa)
+            .where(Tarefa.id.in_(ids), Tarefa.concluido == False)
+            .values(concluido=True)
+            .returning(Tarefa.id, Tarefa.aluno_id)
+        ).all()
+        deltas = Counter()
+        for _, aluno_id in alteradas:
+            deltas[aluno_id] -= 1
+        self._ajustar_pendentes(deltas)
+
+        concluidas = sorted(id for id, _ in alteradas)
+        restantes = ids.difference(concluidas)
+        if restantes:
+            restantes -= {id for (id,) in self.db.query(Tarefa.id).filter(Tarefa.id.in_(restantes))}
+        return concluidas, restantes
+
+    def get_by_aluno_id(self, aluno_id: int, after_id: Optional[int] = None,
+                        limit: Optional[int] = None) -> List[Tarefa]:
         """Busca tarefas por ID do aluno"""
-        return self.db.query(Tarefa).filter(Tarefa.aluno_id == aluno_id).all()
+        query = self.db.query(Tarefa).filter(Tarefa.aluno_id == aluno_id)
+        return self._paginar(query, Tarefa.id, after_id, limit)
+
+    def listar_resumo_por_aluno(self, aluno_id: int, concluido: Optional[bool] = None,
+                                after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Row]:
+        """
+        Lista as tarefas do aluno como tuplas (id, nome, concluido, materia_nome).
+
+        Uma única consulta `tarefas LEFT JOIN materias`, sem hidratar objetos
+        ORM nem carregar `tarefa.materia` por linha. Filtra opcionalmente por
+        `concluido` e pagina por cursor como `get_by_aluno_id`.
+        """
+        stmt = (
+            select(Tarefa.id, Tarefa.nome, Tarefa.concluido, Materia.nome.label("materia_nome"))
+            .outerjoin(Materia, Materia.id == Tarefa.materia_id)
+            .where(Tarefa.aluno_id == aluno_id)
+        )
+        if concluido is not None:
+            stmt = stmt.where(Tarefa.concluido == concluido)
+        return self._paginar_linhas(stmt, Tarefa.id, after_id, limit)
 
     def get_pendentes_by_aluno(self, aluno_id: int) -> List[Tarefa]:
         """Busca tarefas pendentes de um aluno"""
@@ -51,3 +136,7 @@ class TarefaRepository(BaseRepository[Tarefa]):
             Tarefa.aluno_id == aluno_id,
             Tarefa.concluido == False
         ).all()
+
+    def _ajustar_pendentes(self, deltas: dict) -> None:
+        """Aplica variações ao contador de tarefas pendentes dos alunos (sem commit)"""
+        self._ajustar_contador(Aluno.__table__.c.tarefas_pendentes, deltas)
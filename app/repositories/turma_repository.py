@@ -1,7 +1,8 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Iterable, List, Optional, Set
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session, selectinload
 from app.repositories.base_repository import BaseRepository
-from app.models import Turma
+from app.models import Turma, Aluno
 
 class TurmaRepository(BaseRepository[Turma]):
     """Repositório para operações de dados da entidade Turma"""
@@ -9,38 +10,73 @@ class TurmaRepository(BaseRepository[Turma]):
     def create(self, entity: Turma) -> Turma:
         """Cria uma nova turma no banco de dados"""
         self.db.add(entity)
-        self.db.commit()
-        self.db.refresh(entity)
+        # O INSERT ... RETURNING preenche o ID; o commit fica com a unidade de trabalho
+        self.db.flush()
         return entity
 
     def get_by_id(self, id: int) -> Optional[Turma]:
         """Busca uma turma por ID"""
         return self.db.query(Turma).filter(Turma.id == id).first()
 
-    def get_all(self) -> List[Turma]:
-        """Retorna todas as turmas"""
-        return self.db.query(Turma).all()
+    def get_all(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Turma]:
+        """Retorna as turmas, paginadas por cursor quando informado"""
+        return self._paginar(self.db.query(Turma), Turma.id, after_id, limit)
+
+    def get_all_com_alunos(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Turma]:
+        """Retorna as turmas com os alunos já carregados (2 consultas no total)"""
+        query = self.db.query(Turma).options(selectinload(Turma.alunos))
+        return self._paginar(query, Turma.id, after_id, limit)
+
+    def listar_resumo_com_alunos(self, after_id: Optional[int] = None,
+                                 limit: Optional[int] = None) -> List[dict]:
+        """
+        Lista as turmas como dicionários (id, nome, alunos), sem hidratar objetos ORM.
+
+        Mesmas 2 consultas de `get_all_com_alunos`, mas só com as colunas
+        usadas na resposta: a página de turmas e os alunos dessas turmas
+        (id, nome, idade, bolsista), agrupados por turma em Python.
+        """
+        turmas = self._paginar_linhas(select(Turma.id, Turma.nome), Turma.id, after_id, limit)
+        if not turmas:
+            return []
+        resultado = {id: {"id": id, "nome": nome, "alunos": []} for id, nome in turmas}
+        alunos = self.db.execute(
+            select(Aluno.turma_id, Aluno.id, Aluno.nome, Aluno.idade, Aluno.bolsista)
+            .where(Aluno.turma_id.in_(list(resultado)))
+            .order_by(Aluno.id)
+        )
+        for turma_id, id, nome, idade, bolsista in alunos:
+            resultado[turma_id]["alunos"].append({"id": id, "nome": nome, "idade": idade, "bolsista": bolsista})
+        return list(resultado.values())
 
     def update(self, id: int, **kwargs) -> Optional[Turma]:
-        """Atualiza uma turma existente"""
-        turma = self.get_by_id(id)
-        if turma:
-            for campo, valor in kwargs.items():
-                if hasattr(turma, campo):
-                    setattr(turma, campo, valor)
-            self.db.commit()
-            self.db.refresh(turma)
-        return turma
+        """Atualiza uma turma existente com um único UPDATE ... RETURNING"""
+        return self._atualizar(Turma, id, kwargs)
 
     def delete(self, id: int) -> bool:
-        """Remove uma turma do banco de dados"""
-        turma = self.get_by_id(id)
-        if turma:
-            self.db.delete(turma)
-            self.db.commit()
-            return True
-        return False
+        """Remove uma turma com um único DELETE; os alunos ficam sem turma"""
+        self.db.execute(update(Aluno).where(Aluno.turma_id == id).values(turma_id=None))
+        return self.db.execute(delete(Turma).where(Turma.id == id)).rowcount > 0
+
+    def get_ids_existentes(self, ids: Iterable[int]) -> Set[int]:
+        """Retorna, com uma única consulta IN, quais dos IDs informados existem"""
+        ids = set(ids)
+        if not ids:
+            return set()
+        return {id for (id,) in self.db.query(Turma.id).filter(Turma.id.in_(ids))}
 
     def get_by_nome(self, nome: str) -> Optional[Turma]:
         """Busca uma turma por nome"""
         return self.db.query(Turma).filter(Turma.nome == nome).first()
+
+    def recalcular_total_bolsistas(self) -> int:
+        """Recalcula do zero o contador de bolsistas de todas as turmas (sem commit)"""
+        bolsistas = (
+            select(func.count(Aluno.id))
+            .where(Aluno.turma_id == Turma.id, Aluno.bolsista == True)
+            .scalar_subquery()
+        )
+        resultado = self.db.execute(
+            update(Turma).values(total_bolsistas=bolsistas).execution_options(synchronize_session=False)
+        )
+        return resultado.rowcount
@@ -1,8 +1,19 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.database import get_db
+from app.database import get_async_db, executar
+from app.repositories import AsyncAlunoRepository
+from app.schemas import AlunoOut, AlunoPendentesOut, ImportacaoOut, MensagemOut
+from app.utils import Paginacao
 from pydantic import BaseModel
+from app.services.exportacao_service import FormatoExportacao, resposta_exportacao
+from app.services.importacao_service import (
+    FormatoImportacao,
+    IMPORTACAO_LOTE,
+    IMPORTACAO_LOTE_MAXIMO,
+    importar_alunos_service,
+)
 from app.services.alunos_service import (
     criar_aluno_service,
     listar_alunos_service,
@@ -20,36 +31,55 @@ class AlunoCreate(BaseModel):
     idade: int
     turma_id: int
     bolsista: bool = False
-@router.post("")
-def criar_aluno(aluno: AlunoCreate, db: Session = Depends(get_db)):
-    return criar_aluno_service(aluno, db)
+@router.post("", response_model=AlunoOut)
+async def criar_aluno(aluno: AlunoCreate, db: AsyncSession = Depends(get_async_db)):
+    return await executar(db, criar_aluno_service, aluno)
+
+
+@router.get("", response_model=List[AlunoOut])
+async def listar_alunos(
+    response: Response, pagina: Paginacao = Depends(), db: AsyncSession = Depends(get_async_db)
+):
+    alunos = await executar(db, listar_alunos_service, after_id=pagina.after_id, limit=pagina.limit)
+    return pagina.responder(response, alunos)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def exportar_alunos(formato: FormatoExportacao = "ndjson", db: AsyncSession = Depends(get_async_db)):
+    return resposta_exportacao(AsyncAlunoRepository(db), formato)
 
 
-@router.get("")
-def listar_alunos(db: Session = Depends(get_db)):
-    return listar_alunos_service(db)
+@router.get("/mais-pendentes", response_model=List[AlunoPendentesOut])
+async def alunos_com_mais_tarefas_pendentes(db: AsyncSession = Depends(get_async_db)):
+    return await executar(db, alunos_com_mais_tarefas_pendentes_service)
 
 
-@router.get("/mais-pendentes")
-def alunos_com_mais_tarefas_pendentes(db: Session = Depends(get_db)):
-    return alunos_com_mais_tarefas_pendentes_service(db)
+@router.get("/{id}", response_model=AlunoOut)
+async def obter_aluno(id: int, db: AsyncSession = Depends(get_async_db)):
+    return await executar(db, obter_aluno_service, id)
 
 
-@router.get("/{id}")
-def obter_aluno(id: int, db: Session = Depends(get_db)):
-    return obter_aluno_service(id, db)
+@router.put("/{id}", response_model=AlunoOut)
+async def atualizar_aluno(id: int, dados: AlunoCreate, db: AsyncSession = Depends(get_async_db)):
+    return await executar(db, atualizar_aluno_service, id, dados)
 
 
-@router.put("/{id}")
-def atualizar_aluno(id: int, dados: AlunoCreate, db: Session = Depends(get_db)):
-    return atualizar_aluno_service(id, dados, db)
+@router.delete("/{id}", response_model=MensagemOut)
+async def deletar_aluno(id: int, db: AsyncSession = Depends(get_async_db)):
+    return await executar(db, deletar_aluno_service, id)
 
 
-@router.delete("/{id}")
-def deletar_aluno(id: int, db: Session = Depends(get_db)):
-    return deletar_aluno_service(id, db)
+@router.post("/lote", response_model=List[AlunoOut])
+async def criar_alunos_em_lote(alunos: List[AlunoCreate], db: AsyncSession = Depends(get_async_db)):
+    return await executar(db, criar_alunos_em_lote_service, alunos)
 
 
-@router.post("/lote")
-def criar_alunos_em_lote(alunos: List[AlunoCreate], db: Session = Depends(get_db)):
-    return criar_alunos_em_lote_service(alunos, db)
\ No newline at end of file
+@router.post("/import", response_model=ImportacaoOut)
+async def importar_alunos(
+    request: Request,
+    formato: FormatoImportacao = "ndjson",
+    lote: int = Query(IMPORTACAO_LOTE, ge=1, le=IMPORTACAO_LOTE_MAXIMO),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # O corpo é lido em fluxo (request.stream()), sem carregar o arquivo inteiro
+    return await importar_alunos_service(db, request.stream(), formato, AlunoCreate, lote)
@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, executar
+from app.repositories import AsyncMateriaRepository
+from app.schemas import AlunoOut, MateriaOut, MateriaPopularOut, MatriculaTurmaOut
+from app.utils import Paginacao
 from pydantic import BaseModel
 from typing import List
+from app.services.exportacao_service import FormatoExportacao, resposta_exportacao
 from app.services.materias_service import (
     criar_materia_service,
     listar_materias_service,
@@ -22,28 +27,41 @@ class MateriasParaTurma(BaseModel):
     materias_ids: List[int]
 
 
-@router.post("")
-def criar_materia(materia: MateriaCreate, db: Session = Depends(get_db)):
-    return criar_materia_service(materia, db)
+@router.post("", response_model=MateriaOut)
+async def criar_materia(materia: MateriaCreate, db: AsyncSession = Depends(get_async_db)):
+    return await executar(db, criar_materia_service, materia)
 
 
-@router.get("")
-def listar_materias(db: Session = Depends(get_db)):
-    return listar_materias_service(db)
+@router.get("", response_model=List[MateriaOut])
+async def listar_materias(
+    response: Response, pagina: Paginacao = Depends(), db: AsyncSession = Depends(get_async_db)
+):
+    materias = await executar(db, listar_materias_service, after_id=pagina.after_id, limit=pagina.limit)
+    return pagina.responder(response, materias)
+
 
+@router.get("/export", response_class=StreamingResponse)
+async def exportar_materias(formato: FormatoExportacao = "ndjson", db: AsyncSession = Depends(get_async_db)):
+    return resposta_exportacao(AsyncMateriaRepository(db), formato)
 
-@router.get("/{id}/alunos")
-def listar_alunos_por_materia(id: int, db: Session = Depends(get_db)):
-    return listar_alunos_por_materia_service(id, db)
+
+@router.get("/{id}/alunos", response_model=List[AlunoOut])
+async def listar_alunos_por_materia(
+    id: int, response: Response, pagina: Paginacao = Depends(), db: AsyncSession = Depends(get_async_db)
+):
+    alunos = await executar(
+        db, listar_alunos_por_materia_service, id, after_id=pagina.after_id, limit=pagina.limit
+    )
+    return pagina.responder(response, alunos)
 
 
-@router.get("/mais-alunos")
-def listar_materias_mais_populares(db: Session = Depends(get_db)):
-    return listar_materias_mais_populares_service(db)
+@router.get("/mais-alunos", response_model=List[MateriaPopularOut])
+async def listar_materias_mais_populares(db: AsyncSession = Depends(get_async_db)):
+    return await executar(db, listar_materias_mais_populares_service)
 
 
-@router.post("/turma/{turma_id}")
-def atribuir_materias_para_turma(
-    turma_id: int, dados: MateriasParaTurma, db: Session = Depends(get_db)
+@router.post("/turma/{turma_id}", response_model=MatriculaTurmaOut)
+async def atribuir_materias_para_turma(
+    turma_id: int, dados: MateriasParaTurma, db: AsyncSession = Depends(get_async_db)
 ):
-    return atribuir_materias_para_turma_service(turma_id, dados, db)
+    return await executar(db, atribuir_materias_para_turma_service, turma_id, dados)
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.utils.metricas import metricas
+
+router = APIRouter(tags=["Observabilidade"])
+
+# Formato de exposição em texto do Prometheus
+TIPO_CONTEUDO_PROMETHEUS = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def exportar_metricas():
+    return PlainTextResponse(metricas.exportar(), media_type=TIPO_CONTEUDO_PROMETHEUS)
@@ -1,11 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
-from pydantic import BaseModel
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, executar
+from app.repositories import AsyncTarefaRepository
+from app.schemas import (
+    ConclusaoTarefasOut,
+    MensagemOut,
+    TarefaDoAlunoOut,
+    TarefaOut,
+    TarefaParaAlunoOut,
+    TarefasDaTurmaOut,
+)
+from app.utils import Paginacao
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.services.exportacao_service import FormatoExportacao, resposta_exportacao
 from app.services.tarefas_service import (
     criar_tarefa_service,
     concluir_tarefa_service,
+    concluir_tarefas_service,
     atribuir_tarefa_para_turma_service,
     listar_tarefas_do_aluno_service,
     atribuir_tarefa_para_aluno_service,
@@ -30,30 +43,55 @@ class TarefaParaAluno(BaseModel):
     materia_id: int
 
 
-@router.post("")
-def criar_tarefa(tarefa: TarefaCreate, db: Session = Depends(get_db)):
-    return criar_tarefa_service(tarefa, db)
+class TarefasParaConcluir(BaseModel):
+    # Limite mantém o IN (...) abaixo do máximo de parâmetros do SQLite
+    tarefas_ids: List[int] = Field(min_length=1, max_length=1000)
+
+
+@router.post("", response_model=TarefaOut)
+async def criar_tarefa(tarefa: TarefaCreate, db: AsyncSession = Depends(get_async_db)):
+    return await executar(db, criar_tarefa_service, tarefa)
+
 
+@router.get("/export", response_class=StreamingResponse)
+async def exportar_tarefas(formato: FormatoExportacao = "ndjson", db: AsyncSession = Depends(get_async_db)):
+    return resposta_exportacao(AsyncTarefaRepository(db), formato)
 
-@router.put("/{id}/concluir")
-def concluir_tarefa(id: int, db: Session = Depends(get_db)):
-    return concluir_tarefa_service(id, db)
 
+@router.put("/concluir", response_model=ConclusaoTarefasOut)
+async def concluir_tarefas(dados: TarefasParaConcluir, db: AsyncSession = Depends(get_async_db)):
+    return await executar(db, concluir_tarefas_service, dados)
 
-@router.post("/turma/{turma_id}")
-def atribuir_tarefa_para_turma(
-    turma_id: int, tarefa_data: TarefaTurmaCreate, db: Session = Depends(get_db)
+
+@router.put("/{id}/concluir", response_model=MensagemOut)
+async def concluir_tarefa(id: int, db: AsyncSession = Depends(get_async_db)):
+    return await executar(db, concluir_tarefa_service, id)
+
+
+@router.post("/turma/{turma_id}", response_model=TarefasDaTurmaOut)
+async def atribuir_tarefa_para_turma(
+    turma_id: int, tarefa_data: TarefaTurmaCreate, db: AsyncSession = Depends(get_async_db)
 ):
-    return atribuir_tarefa_para_turma_service(turma_id, tarefa_data, db)
+    return await executar(db, atribuir_tarefa_para_turma_service, turma_id, tarefa_data)
 
 
-@router.get("/aluno/{aluno_id}")
-def listar_tarefas_do_aluno(aluno_id: int, db: Session = Depends(get_db)):
-    return listar_tarefas_do_aluno_service(aluno_id, db)
+@router.get("/aluno/{aluno_id}", response_model=List[TarefaDoAlunoOut])
+async def listar_tarefas_do_aluno(
+    aluno_id: int,
+    response: Response,
+    concluido: Optional[bool] = None,
+    pagina: Paginacao = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    tarefas = await executar(
+        db, listar_tarefas_do_aluno_service, aluno_id,
+        after_id=pagina.after_id, limit=pagina.limit, concluido=concluido,
+    )
+    return pagina.responder(response, tarefas)
 
 
-@router.post("/aluno/{aluno_id}")
-def atribuir_tarefa_para_aluno(
-    aluno_id: int, dados: TarefaParaAluno, db: Session = Depends(get_db)
+@router.post("/aluno/{aluno_id}", response_model=TarefaParaAlunoOut)
+async def atribuir_tarefa_para_aluno(
+    aluno_id: int, dados: TarefaParaAluno, db: AsyncSession = Depends(get_async_db)
 ):
-    return atribuir_tarefa_para_aluno_service(aluno_id, dados, db)
+    return await executar(db, atribuir_tarefa_para_aluno_service, aluno_id, dados)
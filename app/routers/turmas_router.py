@@ -1,7 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, executar
+from app.repositories import AsyncTurmaRepository
+from app.schemas import AlunoOut, TurmaBolsistasOut, TurmaComAlunosOut, TurmaOut
+from app.utils import Paginacao
 from pydantic import BaseModel
+from typing import List
+from app.services.exportacao_service import FormatoExportacao, resposta_exportacao
 from app.services.turmas_service import (
     criar_turma_service,
     listar_turmas_service,
@@ -16,21 +22,34 @@ class TurmaCreate(BaseModel):
     nome: str
 
 
-@router.post("")
-def criar_turma(turma: TurmaCreate, db: Session = Depends(get_db)):
-    return criar_turma_service(turma, db)
+@router.post("", response_model=TurmaOut)
+async def criar_turma(turma: TurmaCreate, db: AsyncSession = Depends(get_async_db)):
+    return await executar(db, criar_turma_service, turma)
 
 
-@router.get("")
-def listar_turmas(db: Session = Depends(get_db)):
-    return listar_turmas_service(db)
+@router.get("", response_model=List[TurmaComAlunosOut])
+async def listar_turmas(
+    response: Response, pagina: Paginacao = Depends(), db: AsyncSession = Depends(get_async_db)
+):
+    turmas = await executar(db, listar_turmas_service, after_id=pagina.after_id, limit=pagina.limit)
+    return pagina.responder(response, turmas)
 
 
-@router.get("/{id}/alunos")
-def listar_alunos_da_turma(id: int, db: Session = Depends(get_db)):
-    return listar_alunos_da_turma_service(id, db)
+@router.get("/export", response_class=StreamingResponse)
+async def exportar_turmas(formato: FormatoExportacao = "ndjson", db: AsyncSession = Depends(get_async_db)):
+    return resposta_exportacao(AsyncTurmaRepository(db), formato)
 
 
-@router.get("/mais-bolsistas")
-def turmas_com_mais_bolsistas(db: Session = Depends(get_db)):
-    return turmas_com_mais_bolsistas_service(db)
+@router.get("/{id}/alunos", response_model=List[AlunoOut])
+async def listar_alunos_da_turma(
+    id: int, response: Response, pagina: Paginacao = Depends(), db: AsyncSession = Depends(get_async_db)
+):
+    alunos = await executar(
+        db, listar_alunos_da_turma_service, id, after_id=pagina.after_id, limit=pagina.limit
+    )
+    return pagina.responder(response, alunos)
+
+
+@router.get("/mais-bolsistas", response_model=List[TurmaBolsistasOut])
+async def turmas_com_mais_bolsistas(db: AsyncSession = Depends(get_async_db)):
+    return await executar(db, turmas_com_mais_bolsistas_service)
@@ -0,0 +1,122 @@
+"""
+Esquemas de resposta da API.
+
+Cada rota declara o seu `response_model`: o FastAPI valida e serializa o
+retorno do serviço pelo caminho compilado do pydantic-core (em vez da
+recursão genérica do `jsonable_encoder`) e só os campos declarados chegam ao
+cliente. Com `from_attributes`, os mesmos esquemas aceitam objetos ORM,
+`Row`s das projeções de colunas e dicionários.
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class Esquema(BaseModel):
+    """Base dos esquemas de resposta (leitura por atributo ou por chave)."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MensagemOut(Esquema):
+    mensagem: str
+
+
+# Alunos
+
+class AlunoOut(Esquema):
+    id: int
+    nome: str
+    idade: int
+    turma_id: Optional[int]
+    bolsista: bool
+    tarefas_pendentes: int
+
+
+class AlunoDaTurmaOut(Esquema):
+    id: int
+    nome: str
+    idade: int
+    bolsista: bool
+
+
+class AlunoPendentesOut(Esquema):
+    id: int
+    nome: str
+    pendentes: int
+
+
+class ErroImportacaoOut(Esquema):
+    linha: int
+    erro: str
+
+
+class ImportacaoOut(Esquema):
+    linhas: int
+    criados: int
+    com_erro: int
+    lotes: int
+    erros: List[ErroImportacaoOut]
+    duracao_s: float
+    linhas_por_segundo: float
+
+
+# Turmas
+
+class TurmaOut(Esquema):
+    id: int
+    nome: str
+
+
+class TurmaComAlunosOut(TurmaOut):
+    alunos: List[AlunoDaTurmaOut]
+
+
+class TurmaBolsistasOut(TurmaOut):
+    total_bolsistas: int
+
+
+# Matérias
+
+class MateriaOut(Esquema):
+    id: int
+    nome: str
+
+
+class MateriaPopularOut(MateriaOut):
+    total_alunos: int
+
+
+class MatriculaTurmaOut(MensagemOut):
+    novas_matriculas: int
+
+
+# Tarefas
+
+class TarefaOut(Esquema):
+    id: int
+    nome: str
+    concluido: bool
+    materia_id: Optional[int]
+    aluno_id: Optional[int]
+
+
+class TarefaDoAlunoOut(Esquema):
+    id: int
+    nome: str
+    concluido: bool
+    materia: Optional[str]
+
+
+class TarefasDaTurmaOut(MensagemOut):
+    tarefas: List[TarefaOut]
+
+
+class TarefaParaAlunoOut(MensagemOut):
+    tarefa: TarefaDoAlunoOut
+
+
+class ConclusaoTarefasOut(MensagemOut):
+    concluidas: List[int]
+    nao_encontradas: List[int]
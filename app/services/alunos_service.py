@@ -1,79 +1,79 @@
+import logging
+from typing import Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models import Aluno, Turma, Tarefa
+from app.models import Aluno
 from app.repositories import AlunoRepository, TurmaRepository
 from app.exceptions import AlunoNotFoundException, TurmaNotFoundException
-from app.utils import setup_logger
+from app.utils import setup_logger_estruturado, em_cache, invalidar_cache
 
-logger = setup_logger(__name__, log_level="INFO", log_file="logs/alunos_service.log")
+logger = setup_logger_estruturado(__name__, log_level="INFO", log_file="logs/alunos_service.log")
 
 
 def criar_aluno_service(aluno, db: Session):
-    logger.info(f"Criando novo aluno: {aluno.nome}")
+    logger.info("Criando novo aluno", nome=aluno.nome)
     turma_repo = TurmaRepository(db)
     turma = turma_repo.get_by_id(aluno.turma_id)
     if not turma:
-        logger.error(f"Turma {aluno.turma_id} não encontrada ao criar aluno")
+        logger.error("Turma não encontrada ao criar aluno", turma_id=aluno.turma_id)
         raise TurmaNotFoundException(f"Turma com ID {aluno.turma_id} não encontrada")
 
     aluno_repo = AlunoRepository(db)
     novo = Aluno(**aluno.dict())
     resultado = aluno_repo.create(novo)
-    logger.info(f"Aluno criado com sucesso: ID {resultado.id}, Nome: {resultado.nome}")
+    invalidar_cache("alunos", "turmas")
+    logger.info("Aluno criado com sucesso", aluno_id=resultado.id, nome=resultado.nome)
     return resultado
 
 
-def listar_alunos_service(db: Session):
-    logger.debug("Listando todos os alunos")
+def listar_alunos_service(db: Session, after_id: Optional[int] = None, limit: Optional[int] = None):
+    logger.debug("Listando alunos")
     aluno_repo = AlunoRepository(db)
-    alunos = aluno_repo.get_all()
-    logger.info(f"Listados {len(alunos)} alunos")
+    alunos = aluno_repo.listar_resumo(after_id, limit)
+    logger.info("Alunos listados", total=len(alunos))
     return alunos
 
 
 def obter_aluno_service(id: int, db: Session):
-    logger.debug(f"Buscando aluno com ID {id}")
+    logger.debug("Buscando aluno", aluno_id=id)
     aluno_repo = AlunoRepository(db)
     aluno = aluno_repo.get_by_id(id)
     if not aluno:
-        logger.warning(f"Aluno com ID {id} não encontrado")
+        logger.warning("Aluno não encontrado", aluno_id=id)
         raise AlunoNotFoundException(f"Aluno com ID {id} não encontrado")
-    logger.info(f"Aluno encontrado: {aluno.nome}")
+    logger.info("Aluno encontrado", aluno_id=id, nome=aluno.nome)
     return aluno
 
 
 def atualizar_aluno_service(id: int, dados, db: Session):
-    logger.info(f"Atualizando aluno ID {id}")
+    logger.info("Atualizando aluno", aluno_id=id)
     aluno_repo = AlunoRepository(db)
     aluno = aluno_repo.update(id, **dados.dict())
     if not aluno:
-        logger.error(f"Falha ao atualizar: Aluno ID {id} não encontrado")
+        logger.error("Falha ao atualizar: aluno não encontrado", aluno_id=id)
         raise AlunoNotFoundException(f"Aluno com ID {id} não encontrado")
-    logger.info(f"Aluno ID {id} atualizado com sucesso")
+    invalidar_cache("alunos", "turmas")
+    logger.info("Aluno atualizado com sucesso", aluno_id=id)
     return aluno
 
 
 def deletar_aluno_service(id: int, db: Session):
-    logger.warning(f"Deletando aluno ID {id}")
+    logger.warning("Deletando aluno", aluno_id=id)
     aluno_repo = AlunoRepository(db)
     if not aluno_repo.delete(id):
-        logger.error(f"Falha ao deletar: Aluno ID {id} não encontrado")
+        logger.error("Falha ao deletar: aluno não encontrado", aluno_id=id)
         raise AlunoNotFoundException(f"Aluno com ID {id} não encontrado")
-    logger.info(f"Aluno ID {id} removido com sucesso")
+    invalidar_cache("alunos", "turmas", "matriculas", "tarefas")
+    logger.info("Aluno removido com sucesso", aluno_id=id)
     return {"mensagem": "Aluno removido com sucesso"}
 
 
+@em_cache("GET /alunos/mais-pendentes", depende_de=("alunos", "tarefas"))
 def alunos_com_mais_tarefas_pendentes_service(db: Session):
+    # Lê o contador materializado mantido pelas escritas em TarefaRepository
     resultados = (
-        db.query(
-            Aluno.id,
-            Aluno.nome,
-            func.count(Tarefa.id).label("pendentes")
-        )
-        .outerjoin(Aluno.tarefas)
-        .filter(Tarefa.concluido == False)
-        .group_by(Aluno.id, Aluno.nome)
-        .order_by(func.count(Tarefa.id).desc())
+        db.query(Aluno.id, Aluno.nome, Aluno.tarefas_pendentes)
+        .filter(Aluno.tarefas_pendentes > 0)
+        .order_by(Aluno.tarefas_pendentes.desc())
         .all()
     )
     return [
@@ -83,21 +83,28 @@ def alunos_com_mais_tarefas_pendentes_service(db: Session):
 
 
 def criar_alunos_em_lote_service(alunos, db: Session):
-    logger.info(f"Criando {len(alunos)} alunos em lote")
+    logger.info("Criando alunos em lote", total=len(alunos))
     turma_repo = TurmaRepository(db)
     aluno_repo = AlunoRepository(db)
-    criados = []
 
+    dados = []
+    total = len(alunos)
+    # Guarda de nível fora do laço: com DEBUG desativado o laço não chama o logger
+    depurar = logger.isEnabledFor(logging.DEBUG)
     for i, aluno_data in enumerate(alunos, 1):
-        logger.debug(f"Processando aluno {i}/{len(alunos)}: {aluno_data.nome}")
-        turma = turma_repo.get_by_id(aluno_data.turma_id)
-        if not turma:
-            logger.error(f"Turma {aluno_data.turma_id} não encontrada durante criação em lote")
-            raise TurmaNotFoundException(f"Turma com ID {aluno_data.turma_id} não encontrada")
-
-        novo = Aluno(**aluno_data.dict())
-        criado = aluno_repo.create(novo)
-        criados.append(criado)
+        if depurar:
+            logger.debug("Processando aluno do lote", posicao=i, total=total, nome=aluno_data.nome)
+        dados.append(aluno_data.dict())
+
+    turma_ids = {d["turma_id"] for d in dados}
+    faltantes = sorted(turma_ids - turma_repo.get_ids_existentes(turma_ids))
+    if faltantes:
+        logger.error("Turmas não encontradas durante criação em lote", turma_ids=faltantes)
+        raise TurmaNotFoundException(
+            f"Turma com ID {faltantes[0]} não encontrada", {"turma_ids": faltantes}
+        )
 
-    logger.info(f"Criação em lote concluída: {len(criados)} alunos criados com sucesso")
+    criados = aluno_repo.create_many(dados)
+    invalidar_cache("alunos", "turmas")
+    logger.info("Criação em lote concluída", criados=len(criados))
     return criados
@@ -0,0 +1,22 @@
+from sqlalchemy.orm import Session
+from app.repositories import AlunoRepository, TurmaRepository, MateriaRepository
+from app.utils import setup_logger_estruturado, invalidar_cache
+
+logger = setup_logger_estruturado(__name__, log_level="INFO", log_file="logs/app.log")
+
+
+def reconciliar_contadores_service(db: Session):
+    """
+    Reconstrói do zero os contadores usados pelos rankings.
+
+    Os contadores (tarefas pendentes por aluno, alunos por matéria e bolsistas
+    por turma) são mantidos incrementalmente pelos repositórios; esta rotina
+    corrige qualquer divergência causada por escritas feitas fora deles.
+    """
+    logger.info("Reconciliando contadores materializados")
+    alunos = AlunoRepository(db).recalcular_tarefas_pendentes()
+    materias = MateriaRepository(db).recalcular_total_alunos()
+    turmas = TurmaRepository(db).recalcular_total_bolsistas()
+    invalidar_cache("alunos", "turmas", "materias", "matriculas", "tarefas")
+    logger.info("Contadores reconciliados", alunos=alunos, materias=materias, turmas=turmas)
+    return {"alunos": alunos, "materias": materias, "turmas": turmas}
@@ -0,0 +1,55 @@
+import csv
+import io
+import os
+from typing import AsyncIterator, Literal
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+from app.repositories import AsyncBaseRepository
+from app.utils import setup_logger_estruturado
+
+logger = setup_logger_estruturado(__name__, log_level="INFO", log_file="logs/exportacao_service.log")
+
+FormatoExportacao = Literal["ndjson", "csv"]
+TIPOS_EXPORTACAO = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+# Linhas buscadas do cursor (e escritas na resposta) por vez
+EXPORTACAO_LOTE = int(os.getenv("EXPORTACAO_LOTE", "1000"))
+
+
+def _csv(linhas) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(linhas)
+    return buffer.getvalue().encode()
+
+
+async def exportar_service(repo: AsyncBaseRepository, formato: FormatoExportacao,
+                           lote: int = EXPORTACAO_LOTE) -> AsyncIterator[bytes]:
+    """
+    Gera a tabela do repositório em NDJSON (um objeto por linha) ou CSV (com cabeçalho).
+
+    Cada lote lido do cursor vira um único bloco de bytes, então a memória
+    usada não depende do tamanho da tabela.
+    """
+    tabela = repo.modelo.__tablename__
+    logger.info("Exportando tabela", tabela=tabela, formato=formato, lote=lote)
+    total = 0
+    if formato == "csv":
+        yield _csv([repo.modelo.__table__.c.keys()])
+    async for linhas in repo.exportar(lote):
+        if formato == "csv":
+            yield _csv(linhas)
+        else:
+            yield b"".join(orjson.dumps(linha._asdict()) + b"\n" for linha in linhas)
+        total += len(linhas)
+    logger.info("Exportação concluída", tabela=tabela, formato=formato, linhas=total)
+
+
+def resposta_exportacao(repo: AsyncBaseRepository, formato: FormatoExportacao) -> StreamingResponse:
+    """Envia `exportar_service` em fluxo, como anexo `<tabela>.<formato>`."""
+    nome_arquivo = f"{repo.modelo.__tablename__}.{formato}"
+    return StreamingResponse(
+        exportar_service(repo, formato),
+        media_type=TIPOS_EXPORTACAO[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nome_arquivo}"'},
+    )
@@ -0,0 +1,184 @@
+import codecs
+import csv
+import os
+import time
+from typing import AsyncIterator, List, Literal, Optional, Tuple, Type, Union
+
+import orjson
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database import executar, unidade_de_trabalho
+from app.repositories import AlunoRepository, TurmaRepository
+from app.utils import setup_logger_estruturado, invalidar_cache
+
+logger = setup_logger_estruturado(__name__, log_level="INFO", log_file="logs/importacao_service.log")
+
+FormatoImportacao = Literal["ndjson", "csv"]
+# Linhas validadas acumuladas antes de cada gravação (e commit)
+IMPORTACAO_LOTE = int(os.getenv("IMPORTACAO_LOTE", "1000"))
+IMPORTACAO_LOTE_MAXIMO = 10000
+# Erros detalhados no resumo; os demais são apenas contados
+IMPORTACAO_MAX_ERROS = int(os.getenv("IMPORTACAO_MAX_ERROS", "1000"))
+# Caracteres por linha; linhas maiores viram erro sem serem mantidas em memória
+IMPORTACAO_MAX_LINHA = int(os.getenv("IMPORTACAO_MAX_LINHA", "65536"))
+
+
+async def _linhas(corpo: AsyncIterator[bytes]) -> AsyncIterator[Optional[str]]:
+    """
+    Quebra o corpo em linhas de texto à medida que os blocos chegam.
+
+    Linhas com mais de IMPORTACAO_MAX_LINHA caracteres são descartadas à
+    medida que chegam e geram None: um corpo sem quebras de linha (um array
+    JSON numa linha só, CSV com fim de linha `\r`) não fica acumulado em memória.
+    """
+    decodificador = codecs.getincrementaldecoder("utf-8-sig")()
+    resto = ""
+    descartando = False
+    async for bloco in corpo:
+        *linhas, resto = (resto + decodificador.decode(bloco)).split("\n")
+        for linha in linhas:
+            linha = linha.rstrip("\r")
+            if descartando or len(linha) > IMPORTACAO_MAX_LINHA:
+                descartando = False
+                yield None
+            else:
+                yield linha
+        if len(resto) > IMPORTACAO_MAX_LINHA:
+            # O restante da linha longa é ignorado até o próximo "\n"
+            descartando, resto = True, ""
+    resto = (resto + decodificador.decode(b"", final=True)).rstrip("\r")
+    if descartando or len(resto) > IMPORTACAO_MAX_LINHA:
+        yield None
+    elif resto:
+        yield resto
+
+
+async def _registros(corpo: AsyncIterator[bytes],
+                     formato: FormatoImportacao) -> AsyncIterator[Tuple[int, Union[dict, str]]]:
+    """
+    Gera (número da linha, dados) para cada registro do corpo, ou (número, erro).
+
+    NDJSON: um objeto JSON por linha. CSV: a primeira linha é o cabeçalho e
+    cada registro ocupa uma linha; campos vazios são omitidos (valem os
+    padrões do modelo). Linhas em branco são ignoradas; linhas acima de
+    IMPORTACAO_MAX_LINHA caracteres viram erro.
+    """
+    cabecalho = None
+    numero = 0
+    async for linha in _linhas(corpo):
+        numero += 1
+        if linha is None:
+            yield numero, f"Linha com mais de {IMPORTACAO_MAX_LINHA} caracteres"
+            continue
+        if not linha.strip():
+            continue
+        if formato == "ndjson":
+            try:
+                yield numero, orjson.loads(linha)
+            except orjson.JSONDecodeError as erro:
+                yield numero, f"JSON inválido: {erro}"
+            continue
+        valores = next(csv.reader([linha]))
+        if cabecalho is None:
+            cabecalho = [coluna.strip() for coluna in valores]
+        elif len(valores) != len(cabecalho):
+            yield numero, f"Esperadas {len(cabecalho)} colunas, encontradas {len(valores)}"
+        else:
+            yield numero, {coluna: valor for coluna, valor in zip(cabecalho, valores) if valor != ""}
+
+
+def _mensagem_validacao(erro: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in erro.errors())
+
+
+def gravar_lote_alunos_service(registros: List[Tuple[int, dict]], db: Session) -> Tuple[int, List[dict]]:
+    """
+    Grava um lote de alunos já validados; retorna (criados, erros por linha).
+
+    Linhas com turma inexistente viram erro. As demais são inseridas com um
+    único INSERT em lote dentro de um SAVEPOINT; se ele falhar, as linhas são
+    regravadas uma a uma, cada uma no seu SAVEPOINT, para isolar as que falham.
+    """
+    turma_ids = TurmaRepository(db).get_ids_existentes({dados["turma_id"] for _, dados in registros})
+    erros, validos = [], []
+    for linha, dados in registros:
+        if dados["turma_id"] in turma_ids:
+            validos.append((linha, dados))
+        else:
+            erros.append({"linha": linha, "erro": f"Turma com ID {dados['turma_id']} não encontrada"})
+
+    aluno_repo = AlunoRepository(db)
+    try:
+        with unidade_de_trabalho(db):
+            criados = aluno_repo.inserir_em_lote([dados for _, dados in validos])
+    except SQLAlchemyError:
+        logger.warning("Falha ao gravar lote da importação; gravando linha a linha", linhas=len(validos))
+        criados = 0
+        for linha, dados in validos:
+            try:
+                with unidade_de_trabalho(db):
+                    aluno_repo.inserir_em_lote([dados])
+                criados += 1
+            except SQLAlchemyError as erro:
+                erros.append({"linha": linha, "erro": str(getattr(erro, "orig", None) or erro)})
+
+    if criados:
+        invalidar_cache("alunos", "turmas")
+    return criados, erros
+
+
+async def importar_alunos_service(db: AsyncSession, corpo: AsyncIterator[bytes], formato: FormatoImportacao,
+                                  modelo: Type[BaseModel], lote: int = IMPORTACAO_LOTE) -> dict:
+    """
+    Importa alunos de um corpo NDJSON/CSV lido em fluxo, em lotes de `lote` linhas.
+
+    Cada linha é validada com `modelo` (ex.: AlunoCreate). Linhas inválidas
+    são reportadas sem interromper a importação. Cada lote é gravado e
+    confirmado por `gravar_lote_alunos_service` na sua própria unidade de
+    trabalho: um lote com erro não desfaz os anteriores, e o banco não fica
+    bloqueado durante o upload inteiro. A memória usada é limitada pelo lote,
+    por IMPORTACAO_MAX_LINHA e por IMPORTACAO_MAX_ERROS, e não depende do
+    tamanho do arquivo.
+    """
+    logger.info("Importando alunos", formato=formato, lote=lote)
+    inicio = time.perf_counter()
+    resumo = {"linhas": 0, "criados": 0, "com_erro": 0, "lotes": 0, "erros": []}
+    pendentes: List[Tuple[int, dict]] = []
+
+    def registrar_erros(erros: List[dict]) -> None:
+        resumo["com_erro"] += len(erros)
+        resumo["erros"].extend(erros[:IMPORTACAO_MAX_ERROS - len(resumo["erros"])])
+
+    async def gravar() -> None:
+        criados, erros = await executar(db, gravar_lote_alunos_service, list(pendentes))
+        resumo["criados"] += criados
+        resumo["lotes"] += 1
+        registrar_erros(erros)
+        pendentes.clear()
+
+    async for linha, dados in _registros(corpo, formato):
+        resumo["linhas"] += 1
+        if isinstance(dados, str):
+            registrar_erros([{"linha": linha, "erro": dados}])
+            continue
+        try:
+            pendentes.append((linha, modelo.model_validate(dados).model_dump()))
+        except ValidationError as erro:
+            registrar_erros([{"linha": linha, "erro": _mensagem_validacao(erro)}])
+            continue
+        if len(pendentes) >= lote:
+            await gravar()
+    if pendentes:
+        await gravar()
+
+    duracao = time.perf_counter() - inicio
+    resumo["duracao_s"] = round(duracao, 3)
+    resumo["linhas_por_segundo"] = round(resumo["linhas"] / duracao, 1) if duracao else 0.0
+    logger.info(
+        "Importação concluída", linhas=resumo["linhas"], criados=resumo["criados"],
+        com_erro=resumo["com_erro"], lotes=resumo["lotes"], duracao_s=resumo["duracao_s"],
+    )
+    return resumo
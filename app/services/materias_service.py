@@ -1,55 +1,56 @@
+from typing import Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models import Materia, aluno_materia
-from app.repositories import MateriaRepository, TurmaRepository
+from app.models import Materia
+from app.repositories import MateriaRepository, TurmaRepository, AlunoRepository
 from app.exceptions import MateriaNotFoundException, TurmaNotFoundException, AlunoNotFoundException
-from app.utils import setup_logger
+from app.utils import setup_logger_estruturado, em_cache, invalidar_cache
 
-logger = setup_logger(__name__, log_level="INFO", log_file="logs/materias_service.log")
+logger = setup_logger_estruturado(__name__, log_level="INFO", log_file="logs/materias_service.log")
 
 
 def criar_materia_service(materia, db: Session):
-    logger.info(f"Criando nova matéria: {materia.nome}")
+    logger.info("Criando nova matéria", nome=materia.nome)
     materia_repo = MateriaRepository(db)
     nova = Materia(nome=materia.nome)
     resultado = materia_repo.create(nova)
-    logger.info(f"Matéria criada com sucesso: ID {resultado.id}, Nome: {resultado.nome}")
+    invalidar_cache("materias")
+    logger.info("Matéria criada com sucesso", materia_id=resultado.id, nome=resultado.nome)
     return resultado
 
 
-def listar_materias_service(db: Session):
-    logger.debug("Listando todas as matérias")
+@em_cache("GET /materias", depende_de=("materias",))
+def listar_materias_service(db: Session, after_id: Optional[int] = None, limit: Optional[int] = None):
+    logger.debug("Listando matérias")
     materia_repo = MateriaRepository(db)
-    materias = materia_repo.get_all()
-    logger.info(f"Listadas {len(materias)} matérias")
-    return materias
+    materias = materia_repo.listar_resumo(after_id, limit)
+    logger.info("Matérias listadas", total=len(materias))
+    return [linha._asdict() for linha in materias]
 
 
-def listar_alunos_por_materia_service(id: int, db: Session):
-    logger.debug(f"Listando alunos da matéria ID {id}")
+def listar_alunos_por_materia_service(id: int, db: Session, after_id: Optional[int] = None,
+                                      limit: Optional[int] = None):
+    logger.debug("Listando alunos da matéria", materia_id=id)
     materia_repo = MateriaRepository(db)
     materia = materia_repo.get_by_id(id)
     if not materia:
-        logger.warning(f"Matéria com ID {id} não encontrada ao listar alunos")
+        logger.warning("Matéria não encontrada ao listar alunos", materia_id=id)
         raise MateriaNotFoundException(f"Matéria com ID {id} não encontrada")
-    logger.info(f"Listados {len(materia.alunos)} alunos da matéria {materia.nome}")
-    return materia.alunos
+    alunos = AlunoRepository(db).listar_resumo_por_materia(id, after_id, limit)
+    logger.info("Alunos da matéria listados", materia=materia.nome, total=len(alunos))
+    return alunos
 
 
+@em_cache("GET /materias/mais-alunos", depende_de=("materias", "matriculas"))
 def listar_materias_mais_populares_service(db: Session):
     logger.debug("Consultando matérias mais populares")
+    # Lê o contador materializado mantido pelas escritas em AlunoRepository/MateriaRepository
     resultados = (
-        db.query(
-            Materia.id,
-            Materia.nome,
-            func.count(aluno_materia.c.aluno_id).label("total_alunos"),
-        )
-        .join(aluno_materia, Materia.id == aluno_materia.c.materia_id)
-        .group_by(Materia.id)
-        .order_by(func.count(aluno_materia.c.aluno_id).desc())
+        db.query(Materia.id, Materia.nome, Materia.total_alunos)
+        .filter(Materia.total_alunos > 0)
+        .order_by(Materia.total_alunos.desc())
         .all()
     )
-    logger.info(f"Consultadas {len(resultados)} matérias populares")
+    logger.info("Matérias populares consultadas", total=len(resultados))
 
     return [
         {"id": id, "nome": nome, "total_alunos": total}
@@ -58,34 +59,32 @@ def listar_materias_mais_populares_service(db: Session):
 
 
 def atribuir_materias_para_turma_service(turma_id: int, dados, db: Session):
-    logger.info(f"Atribuindo matérias para turma ID {turma_id}")
+    logger.info("Atribuindo matérias para turma", turma_id=turma_id)
     turma_repo = TurmaRepository(db)
     materia_repo = MateriaRepository(db)
 
     turma = turma_repo.get_by_id(turma_id)
     if not turma:
-        logger.error(f"Turma {turma_id} não encontrada ao atribuir matérias")
+        logger.error("Turma não encontrada ao atribuir matérias", turma_id=turma_id)
         raise TurmaNotFoundException(f"Turma com ID {turma_id} não encontrada")
 
-    alunos = turma.alunos
-    if not alunos:
-        logger.warning(f"Nenhum aluno encontrado na turma {turma_id}")
+    total_alunos = AlunoRepository(db).count_by_turma_id(turma_id)
+    if not total_alunos:
+        logger.warning("Nenhum aluno encontrado na turma", turma_id=turma_id)
         raise AlunoNotFoundException(f"Nenhum aluno encontrado para a turma {turma_id}")
 
-    materias = [materia_repo.get_by_id(mid) for mid in dados.materias_ids]
-    materias = [m for m in materias if m is not None]
-
-    if not materias:
+    materia_ids = materia_repo.get_ids_existentes(dados.materias_ids)
+    if not materia_ids:
         logger.error("Nenhuma matéria válida encontrada para atribuição")
         raise MateriaNotFoundException("Nenhuma matéria válida encontrada")
 
-    for aluno in alunos:
-        for materia in materias:
-            if materia not in aluno.materias:
-                aluno.materias.append(materia)
-
-    db.commit()
-    logger.info(f"{len(materias)} matérias atribuídas a {len(alunos)} alunos da turma {turma_id}")
+    novas = materia_repo.matricular_turma(turma_id, materia_ids)
+    invalidar_cache("matriculas")
+    logger.info(
+        "Matérias atribuídas à turma", turma_id=turma_id, materias=len(materia_ids),
+        alunos=total_alunos, novas_matriculas=novas,
+    )
     return {
-        "mensagem": f"{len(materias)} matérias atribuídas a {len(alunos)} alunos da turma {turma_id}"
+        "mensagem": f"{len(materia_ids)} matérias atribuídas a {total_alunos} alunos da turma {turma_id}",
+        "novas_matriculas": novas,
     }
@@ -1,3 +1,4 @@
+from typing import Optional
 from sqlalchemy.orm import Session
 from app.models import Tarefa
 from app.repositories import TarefaRepository, MateriaRepository, AlunoRepository, TurmaRepository
@@ -7,108 +8,108 @@ from app.exceptions import (
     AlunoNotFoundException,
     TurmaNotFoundException
 )
-from app.utils import setup_logger
+from app.utils import setup_logger_estruturado, em_cache, invalidar_cache
 
-logger = setup_logger(__name__, log_level="INFO", log_file="logs/tarefas_service.log")
+logger = setup_logger_estruturado(__name__, log_level="INFO", log_file="logs/tarefas_service.log")
 
 
 def criar_tarefa_service(tarefa, db: Session):
-    logger.info(f"Criando nova tarefa: {tarefa.nome}")
+    logger.info("Criando nova tarefa", nome=tarefa.nome)
     tarefa_repo = TarefaRepository(db)
     nova = Tarefa(**tarefa.dict())
     resultado = tarefa_repo.create(nova)
-    logger.info(f"Tarefa criada com sucesso: ID {resultado.id}")
+    invalidar_cache("tarefas")
+    logger.info("Tarefa criada com sucesso", tarefa_id=resultado.id)
     return resultado
 
 
 def concluir_tarefa_service(id: int, db: Session):
-    logger.info(f"Marcando tarefa ID {id} como concluída")
-    tarefa_repo = TarefaRepository(db)
-    tarefa = tarefa_repo.get_by_id(id)
-    if not tarefa:
-        logger.warning(f"Tarefa com ID {id} não encontrada ao tentar concluir")
+    logger.info("Marcando tarefa como concluída", tarefa_id=id)
+    _, inexistentes = TarefaRepository(db).concluir([id])
+    if inexistentes:
+        logger.warning("Tarefa não encontrada ao tentar concluir", tarefa_id=id)
         raise TarefaNotFoundException(f"Tarefa com ID {id} não encontrada")
 
-    tarefa_repo.update(id, concluido=True)
-    logger.info(f"Tarefa ID {id} concluída com sucesso")
+    invalidar_cache("tarefas")
+    logger.info("Tarefa concluída com sucesso", tarefa_id=id)
     return {"mensagem": "Tarefa concluída com sucesso"}
 
 
+def concluir_tarefas_service(dados, db: Session):
+    logger.info("Concluindo tarefas em lote", total=len(dados.tarefas_ids))
+    concluidas, inexistentes = TarefaRepository(db).concluir(dados.tarefas_ids)
+    if concluidas:
+        invalidar_cache("tarefas")
+    if inexistentes:
+        logger.warning("Tarefas não encontradas ao concluir em lote", tarefas_ids=sorted(inexistentes))
+    logger.info("Tarefas concluídas em lote", concluidas=len(concluidas), inexistentes=len(inexistentes))
+    return {
+        "mensagem": f"{len(concluidas)} tarefas concluídas",
+        "concluidas": concluidas,
+        "nao_encontradas": sorted(inexistentes),
+    }
+
+
 def atribuir_tarefa_para_turma_service(turma_id: int, tarefa_data, db: Session):
-    logger.info(f"Atribuindo tarefa '{tarefa_data.nome}' para turma ID {turma_id}")
+    logger.info("Atribuindo tarefa para turma", nome=tarefa_data.nome, turma_id=turma_id)
     materia_repo = MateriaRepository(db)
     turma_repo = TurmaRepository(db)
     tarefa_repo = TarefaRepository(db)
 
     materia = materia_repo.get_by_id(tarefa_data.materia_id)
     if not materia:
-        logger.error(f"Matéria {tarefa_data.materia_id} não encontrada ao atribuir tarefa para turma")
+        logger.error("Matéria não encontrada ao atribuir tarefa para turma", materia_id=tarefa_data.materia_id)
         raise MateriaNotFoundException(f"Matéria com ID {tarefa_data.materia_id} não encontrada")
 
     turma = turma_repo.get_by_id(turma_id)
     if not turma:
-        logger.error(f"Turma {turma_id} não encontrada ao atribuir tarefa")
+        logger.error("Turma não encontrada ao atribuir tarefa", turma_id=turma_id)
         raise TurmaNotFoundException(f"Turma com ID {turma_id} não encontrada")
 
-    alunos = turma.alunos
-    if not alunos:
-        logger.warning(f"Nenhum aluno encontrado na turma {turma_id}")
+    tarefas = tarefa_repo.create_para_turma(tarefa_data.nome, tarefa_data.materia_id, turma_id)
+    invalidar_cache("tarefas")
+    if not tarefas:
+        logger.warning("Nenhum aluno encontrado na turma", turma_id=turma_id)
         raise AlunoNotFoundException(f"Nenhum aluno encontrado para a turma {turma_id}")
 
-    tarefas = []
-    for aluno in alunos:
-        nova_tarefa = Tarefa(
-            nome=tarefa_data.nome,
-            materia_id=tarefa_data.materia_id,
-            aluno_id=aluno.id,
-            concluido=False,
-        )
-        tarefa_criada = tarefa_repo.create(nova_tarefa)
-        tarefas.append(tarefa_criada)
-
-    logger.info(f"Tarefa '{tarefa_data.nome}' atribuída com sucesso a {len(tarefas)} alunos da turma {turma_id}")
+    logger.info("Tarefa atribuída à turma", nome=tarefa_data.nome, turma_id=turma_id, alunos=len(tarefas))
     return {
         "mensagem": f"Tarefa '{tarefa_data.nome}' atribuída a {len(tarefas)} alunos da turma {turma_id}",
         "tarefas": tarefas,
     }
 
 
-def listar_tarefas_do_aluno_service(aluno_id: int, db: Session):
-    logger.debug(f"Listando tarefas do aluno ID {aluno_id}")
-    aluno_repo = AlunoRepository(db)
-    aluno = aluno_repo.get_by_id(aluno_id)
-    if not aluno:
-        logger.warning(f"Aluno com ID {aluno_id} não encontrado ao listar tarefas")
+@em_cache("GET /tarefas/aluno/{aluno_id}", depende_de=("alunos", "tarefas", "materias"))
+def listar_tarefas_do_aluno_service(aluno_id: int, db: Session, after_id: Optional[int] = None,
+                                    limit: Optional[int] = None, concluido: Optional[bool] = None):
+    logger.debug("Listando tarefas do aluno", aluno_id=aluno_id)
+    tarefas = TarefaRepository(db).listar_resumo_por_aluno(aluno_id, concluido, after_id, limit)
+    # Lista vazia: só então é preciso distinguir aluno sem tarefas de aluno inexistente
+    if not tarefas and not AlunoRepository(db).get_ids_existentes([aluno_id]):
+        logger.warning("Aluno não encontrado ao listar tarefas", aluno_id=aluno_id)
         raise AlunoNotFoundException(f"Aluno com ID {aluno_id} não encontrado")
 
-    tarefas = aluno.tarefas
-    logger.info(f"Listadas {len(tarefas)} tarefas do aluno {aluno.nome}")
-
+    logger.info("Tarefas do aluno listadas", aluno_id=aluno_id, total=len(tarefas))
     return [
-        {
-            "id": tarefa.id,
-            "nome": tarefa.nome,
-            "concluido": tarefa.concluido,
-            "materia": tarefa.materia.nome if tarefa.materia else None,
-        }
+        {"id": tarefa.id, "nome": tarefa.nome, "concluido": tarefa.concluido, "materia": tarefa.materia_nome}
         for tarefa in tarefas
     ]
 
 
 def atribuir_tarefa_para_aluno_service(aluno_id: int, dados, db: Session):
-    logger.info(f"Atribuindo tarefa '{dados.nome}' para aluno ID {aluno_id}")
+    logger.info("Atribuindo tarefa para aluno", nome=dados.nome, aluno_id=aluno_id)
     aluno_repo = AlunoRepository(db)
     materia_repo = MateriaRepository(db)
     tarefa_repo = TarefaRepository(db)
 
     aluno = aluno_repo.get_by_id(aluno_id)
     if not aluno:
-        logger.error(f"Aluno {aluno_id} não encontrado ao atribuir tarefa")
+        logger.error("Aluno não encontrado ao atribuir tarefa", aluno_id=aluno_id)
         raise AlunoNotFoundException(f"Aluno com ID {aluno_id} não encontrado")
 
     materia = materia_repo.get_by_id(dados.materia_id)
     if not materia:
-        logger.error(f"Matéria {dados.materia_id} não encontrada ao atribuir tarefa")
+        logger.error("Matéria não encontrada ao atribuir tarefa", materia_id=dados.materia_id)
         raise MateriaNotFoundException(f"Matéria com ID {dados.materia_id} não encontrada")
 
     tarefa = Tarefa(
@@ -118,7 +119,8 @@ def atribuir_tarefa_para_aluno_service(aluno_id: int, dados, db: Session):
         concluido=False,
     )
     tarefa_criada = tarefa_repo.create(tarefa)
-    logger.info(f"Tarefa '{dados.nome}' atribuída com sucesso ao aluno {aluno.nome}")
+    invalidar_cache("tarefas")
+    logger.info("Tarefa atribuída ao aluno", nome=dados.nome, aluno=aluno.nome)
 
     return {
         "mensagem": f"Tarefa '{dados.nome}' atribuída ao aluno {aluno.nome}",
@@ -1,71 +1,56 @@
+from typing import Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models import Turma, Aluno
-from app.repositories import TurmaRepository
+from app.models import Turma
+from app.repositories import TurmaRepository, AlunoRepository
 from app.exceptions import TurmaNotFoundException
-from app.utils import setup_logger
+from app.utils import setup_logger_estruturado, em_cache, invalidar_cache
 
-logger = setup_logger(__name__, log_level="INFO", log_file="logs/turmas_service.log")
+logger = setup_logger_estruturado(__name__, log_level="INFO", log_file="logs/turmas_service.log")
 
 
 def criar_turma_service(turma, db: Session):
-    logger.info(f"Criando nova turma: {turma.nome}")
+    logger.info("Criando nova turma", nome=turma.nome)
     turma_repo = TurmaRepository(db)
     nova = Turma(nome=turma.nome)
     resultado = turma_repo.create(nova)
-    logger.info(f"Turma criada com sucesso: ID {resultado.id}, Nome: {resultado.nome}")
+    invalidar_cache("turmas")
+    logger.info("Turma criada com sucesso", turma_id=resultado.id, nome=resultado.nome)
     return resultado
 
 
-def listar_turmas_service(db: Session):
-    logger.debug("Listando todas as turmas")
+@em_cache("GET /turmas", depende_de=("turmas", "alunos"))
+def listar_turmas_service(db: Session, after_id: Optional[int] = None, limit: Optional[int] = None):
+    logger.debug("Listando turmas")
     turma_repo = TurmaRepository(db)
-    turmas = turma_repo.get_all()
-    logger.info(f"Listadas {len(turmas)} turmas")
-    return [
-        {
-            "id": turma.id,
-            "nome": turma.nome,
-            "alunos": [
-                {
-                    "id": aluno.id,
-                    "nome": aluno.nome,
-                    "idade": aluno.idade,
-                    "bolsista": aluno.bolsista,
-                }
-                for aluno in turma.alunos
-            ],
-        }
-        for turma in turmas
-    ]
+    turmas = turma_repo.listar_resumo_com_alunos(after_id, limit)
+    logger.info("Turmas listadas", total=len(turmas))
+    return turmas
 
 
-def listar_alunos_da_turma_service(id: int, db: Session):
-    logger.debug(f"Listando alunos da turma ID {id}")
+def listar_alunos_da_turma_service(id: int, db: Session, after_id: Optional[int] = None,
+                                   limit: Optional[int] = None):
+    logger.debug("Listando alunos da turma", turma_id=id)
     turma_repo = TurmaRepository(db)
     turma = turma_repo.get_by_id(id)
     if not turma:
-        logger.warning(f"Turma com ID {id} não encontrada ao listar alunos")
+        logger.warning("Turma não encontrada ao listar alunos", turma_id=id)
         raise TurmaNotFoundException(f"Turma com ID {id} não encontrada")
-    logger.info(f"Listados {len(turma.alunos)} alunos da turma {turma.nome}")
-    return turma.alunos
+    alunos = AlunoRepository(db).listar_resumo_por_turma(id, after_id, limit)
+    logger.info("Alunos da turma listados", turma=turma.nome, total=len(alunos))
+    return alunos
 
 
+@em_cache("GET /turmas/mais-bolsistas", depende_de=("turmas", "alunos"))
 def turmas_com_mais_bolsistas_service(db: Session):
     logger.debug("Consultando turmas com mais bolsistas")
+    # Lê o contador materializado mantido pelas escritas em AlunoRepository
     resultados = (
-        db.query(
-            Turma.id,
-            Turma.nome,
-            func.count(Aluno.id).label("total_bolsistas"),
-        )
-        .join(Turma.alunos)
-        .filter(Aluno.bolsista == True)
-        .group_by(Turma.id)
-        .order_by(func.count(Aluno.id).desc())
+        db.query(Turma.id, Turma.nome, Turma.total_bolsistas)
+        .filter(Turma.total_bolsistas > 0)
+        .order_by(Turma.total_bolsistas.desc())
         .all()
     )
-    logger.info(f"Consultadas {len(resultados)} turmas com bolsistas")
+    logger.info("Turmas com bolsistas consultadas", total=len(resultados))
 
     return [
         {"id": id, "nome": nome, "total_bolsistas": total}
@@ -2,6 +2,33 @@
 Módulo de utilitários da aplicação.
 """
 
-from .logger import setup_logger, get_logger, app_logger
+from .logger import (
+    setup_logger,
+    setup_logger_estruturado,
+    LoggerEstruturado,
+    get_logger,
+    app_logger,
+    iniciar_logs,
+    parar_logs,
+    estatisticas_logs,
+)
+from .pagination import Paginacao, encode_cursor, decode_cursor
+from .cache import cache_respostas, em_cache, invalidar_cache, invalidacoes_adiadas
 
-__all__ = ["setup_logger", "get_logger", "app_logger"]
+__all__ = [
+    "setup_logger",
+    "setup_logger_estruturado",
+    "LoggerEstruturado",
+    "get_logger",
+    "app_logger",
+    "iniciar_logs",
+    "parar_logs",
+    "estatisticas_logs",
+    "Paginacao",
+    "encode_cursor",
+    "decode_cursor",
+    "cache_respostas",
+    "em_cache",
+    "invalidar_cache",
+    "invalidacoes_adiadas",
+]
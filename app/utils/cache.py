@@ -0,0 +1,204 @@
+"""
+Cache em memória (LRU com TTL) para respostas de serviços de leitura.
+
+Cada entrada é identificada pelo nome da rota e pelos parâmetros do serviço
+e declara de quais tabelas depende. Os serviços de escrita chamam
+`invalidar_cache(...)` com as tabelas que alteraram, removendo apenas as
+entradas afetadas. Dentro de `invalidacoes_adiadas()` (aberto pela unidade
+de trabalho) a invalidação só é aplicada depois do commit.
+
+Configuração por variáveis de ambiente:
+- CACHE_ATIVO: "0" desativa o cache por completo (padrão: "1")
+- CACHE_MAX_ITENS: número máximo de entradas (padrão: 1024)
+- CACHE_TTL_SEGUNDOS: validade de cada entrada (padrão: 30)
+- CACHE_ROTAS_DESATIVADAS: rotas sem cache, separadas por vírgula
+  (ex.: "GET /turmas,GET /materias")
+"""
+
+import functools
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+
+class CacheRespostas:
+    """
+    Cache LRU com TTL, invalidação por tabela e métricas de acerto.
+
+    Os valores armazenados são compartilhados entre requisições e devem ser
+    tratados como somente leitura (listas/dicionários simples, nunca objetos ORM).
+    """
+
+    def __init__(
+        self,
+        max_itens: int = 1024,
+        ttl_segundos: float = 30.0,
+        ativo: bool = True,
+        rotas_desativadas: Iterable[str] = (),
+    ):
+        self.max_itens = max_itens
+        self.ttl_segundos = ttl_segundos
+        self.ativo = ativo
+        self.rotas_desativadas = set(rotas_desativadas)
+        self._itens: "OrderedDict[Tuple, Tuple[float, Any, frozenset]]" = OrderedDict()
+        self._geracoes: Dict[str, int] = defaultdict(int)
+        self._metricas: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0}
+        )
+        self._remocoes = 0
+        self._trava = threading.Lock()
+
+    @classmethod
+    def do_ambiente(cls) -> "CacheRespostas":
+        """Cria o cache a partir das variáveis de ambiente."""
+        rotas = os.getenv("CACHE_ROTAS_DESATIVADAS", "")
+        return cls(
+            max_itens=int(os.getenv("CACHE_MAX_ITENS", "1024")),
+            ttl_segundos=float(os.getenv("CACHE_TTL_SEGUNDOS", "30")),
+            ativo=os.getenv("CACHE_ATIVO", "1") != "0",
+            rotas_desativadas=[r.strip() for r in rotas.split(",") if r.strip()],
+        )
+
+    def habilitado_para(self, rota: str) -> bool:
+        return self.ativo and rota not in self.rotas_desativadas
+
+    def obter_ou_calcular(self, rota: str, parametros: Tuple, dependencias: frozenset,
+                          calcular: Callable[[], Any]) -> Any:
+        """
+        Retorna o valor em cache ou o calcula e armazena.
+
+        O valor só é armazenado se nenhuma tabela de que ele depende tiver sido
+        invalidada durante o cálculo, evitando gravar no cache um resultado
+        lido antes de uma escrita concorrente.
+        """
+        if not self.habilitado_para(rota):
+            return calcular()
+
+        chave = (rota, parametros)
+        agora = time.monotonic()
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is not None and item[0] > agora:
+                self._itens.move_to_end(chave)
+                self._metricas[rota]["hits"] += 1
+                return item[1]
+            self._metricas[rota]["misses"] += 1
+            geracoes = {tabela: self._geracoes[tabela] for tabela in dependencias}
+
+        valor = calcular()
+
+        with self._trava:
+            if all(self._geracoes[t] == g for t, g in geracoes.items()):
+                self._itens[chave] = (time.monotonic() + self.ttl_segundos, valor, dependencias)
+                self._itens.move_to_end(chave)
+                while len(self._itens) > self.max_itens:
+                    self._itens.popitem(last=False)
+                    self._remocoes += 1
+        return valor
+
+    def invalidar(self, *tabelas: str) -> None:
+        """Remove as entradas que dependem de qualquer uma das tabelas informadas."""
+        alvo = set(tabelas)
+        with self._trava:
+            for tabela in alvo:
+                self._geracoes[tabela] += 1
+            for chave in [c for c, (_, _, deps) in self._itens.items() if deps & alvo]:
+                del self._itens[chave]
+
+    def limpar(self) -> None:
+        """Remove todas as entradas e zera as métricas."""
+        with self._trava:
+            self._itens.clear()
+            self._metricas.clear()
+            self._remocoes = 0
+
+    def estatisticas(self) -> dict:
+        """Retorna acertos/erros por rota e o estado atual do cache."""
+        with self._trava:
+            rotas = {rota: dict(m) for rota, m in self._metricas.items()}
+            return {
+                "ativo": self.ativo,
+                "itens": len(self._itens),
+                "max_itens": self.max_itens,
+                "ttl_segundos": self.ttl_segundos,
+                "remocoes_lru": self._remocoes,
+                "hits": sum(m["hits"] for m in rotas.values()),
+                "misses": sum(m["misses"] for m in rotas.values()),
+                "rotas": rotas,
+            }
+
+
+cache_respostas = CacheRespostas.do_ambiente()
+
+
+def em_cache(rota: str, depende_de: Iterable[str]):
+    """
+    Decorador para serviços de leitura: guarda o resultado por parâmetros.
+
+    O argumento `db` não faz parte da chave. O resultado deve ser composto
+    apenas de dados simples (dicionários, listas, tuplas).
+
+    Example:
+        >>> @em_cache("GET /turmas", depende_de=("turmas", "alunos"))
+        ... def listar_turmas_service(db, after_id=None, limit=None): ...
+    """
+    dependencias = frozenset(depende_de)
+
+    def decorador(servico: Callable) -> Callable:
+        assinatura = inspect.signature(servico)
+
+        @functools.wraps(servico)
+        def wrapper(*args, **kwargs):
+            argumentos = assinatura.bind(*args, **kwargs)
+            argumentos.apply_defaults()
+            parametros = tuple(
+                (nome, valor) for nome, valor in argumentos.arguments.items() if nome != "db"
+            )
+            return cache_respostas.obter_ou_calcular(
+                rota, parametros, dependencias, lambda: servico(*args, **kwargs)
+            )
+
+        return wrapper
+
+    return decorador
+
+
+# Tabelas a invalidar ao fim da transação corrente (None fora de uma transação)
+_invalidacoes_pendentes: ContextVar[Optional[Set[str]]] = ContextVar("invalidacoes_pendentes", default=None)
+
+
+def invalidar_cache(*tabelas: str) -> None:
+    """Invalida as entradas de cache que dependem das tabelas alteradas."""
+    pendentes = _invalidacoes_pendentes.get()
+    if pendentes is not None:
+        pendentes.update(tabelas)
+    else:
+        cache_respostas.invalidar(*tabelas)
+
+
+@contextmanager
+def invalidacoes_adiadas():
+    """
+    Acumula as invalidações feitas no bloco e as aplica ao sair sem erro.
+
+    Invalidar só depois do commit impede que uma leitura concorrente, feita
+    antes do commit, volte a guardar no cache os dados antigos. Se o bloco
+    falhar (transação desfeita), as invalidações são descartadas. Blocos
+    aninhados participam do bloco mais externo.
+    """
+    if _invalidacoes_pendentes.get() is not None:
+        yield
+        return
+    pendentes: Set[str] = set()
+    token = _invalidacoes_pendentes.set(pendentes)
+    try:
+        yield
+    finally:
+        _invalidacoes_pendentes.reset(token)
+    if pendentes:
+        cache_respostas.invalidar(*pendentes)
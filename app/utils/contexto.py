@@ -0,0 +1,37 @@
+"""
+Contexto da requisição HTTP em andamento.
+
+Os valores ficam em `ContextVar`s: cada requisição enxerga apenas os seus,
+inclusive dentro do greenlet usado por `AsyncSession.run_sync`.
+"""
+
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+
+class MetricasRequisicao:
+    """Consultas SQL executadas e tempo gasto no banco durante uma requisição."""
+
+    __slots__ = ("consultas", "tempo_db")
+
+    def __init__(self):
+        self.consultas = 0
+        self.tempo_db = 0.0
+
+
+request_id_atual: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+metricas_atuais: ContextVar[Optional[MetricasRequisicao]] = ContextVar("metricas_requisicao", default=None)
+
+
+def novo_request_id() -> str:
+    """Gera um identificador curto e único para a requisição."""
+    return uuid.uuid4().hex
+
+
+def registrar_consulta(duracao: float) -> None:
+    """Soma uma consulta SQL às métricas da requisição atual (se houver)."""
+    metricas = metricas_atuais.get()
+    if metricas is not None:
+        metricas.consultas += 1
+        metricas.tempo_db += duracao
@@ -6,13 +6,34 @@ Este módulo fornece configuração centralizada de logging com suporte a:
 - Saída para arquivo e console
 - Formatação padronizada
 - Rotação de arquivos de log
+- Escrita em segundo plano (fila + thread única), sem I/O na thread da requisição
+
+Configuração da fila por variáveis de ambiente:
+- LOG_FILA: "0" volta a escrever os logs de forma síncrona (padrão: "1")
+- LOG_FILA_TAMANHO: capacidade máxima da fila (padrão: 10000)
+- LOG_FILA_POLITICA: com a fila cheia, "descartar" descarta registros abaixo de
+  WARNING; "bloquear" aguarda espaço para todos (padrão: "descartar")
+- LOG_FILA_TIMEOUT: espera máxima, em segundos, ao bloquear (padrão: 1)
+
+Formato de saída:
+- LOG_FORMATO: "texto" (padrão) ou "json" (um objeto JSON por linha, com
+  request_id e os campos dos logs estruturados)
 """
 
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+from .contexto import request_id_atual
 
 
 # Níveis de log disponíveis
@@ -24,6 +45,186 @@ LOG_LEVELS = {
     "CRITICAL": logging.CRITICAL
 }
 
+LOG_FILA_ATIVA = os.getenv("LOG_FILA", "1") != "0"
+LOG_FILA_TAMANHO = int(os.getenv("LOG_FILA_TAMANHO", "10000"))
+LOG_FILA_POLITICA = os.getenv("LOG_FILA_POLITICA", "descartar")
+LOG_FILA_TIMEOUT = float(os.getenv("LOG_FILA_TIMEOUT", "1"))
+
+if LOG_FILA_POLITICA not in ("descartar", "bloquear"):
+    raise ValueError(f"Política de fila de logs desconhecida: {LOG_FILA_POLITICA}")
+
+LOG_FORMATO = os.getenv("LOG_FORMATO", "texto")
+# Formato de LOG_FORMATO=texto; request_id é None fora de uma requisição
+FORMATO_TEXTO = '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(message)s'
+
+
+class FiltroContexto(logging.Filter):
+    """
+    Copia o request_id da requisição atual para o registro.
+
+    Roda na thread que emitiu o log, antes do enfileiramento, pois a thread
+    de escrita não enxerga o contexto da requisição.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_atual.get()
+        return True
+
+
+class FormatadorJSON(logging.Formatter):
+    """Formata cada registro como um objeto JSON em uma linha."""
+
+    CAMPOS_FIXOS = ("timestamp", "nivel", "logger", "mensagem", "request_id")
+
+    def format(self, record: logging.LogRecord) -> str:
+        mensagem = record.msg
+        if isinstance(mensagem, MensagemEstruturada):
+            texto = mensagem.mensagem % record.args if record.args else mensagem.mensagem
+        else:
+            texto = record.getMessage()
+        dados = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensagem": texto,
+            "request_id": getattr(record, "request_id", None),
+        }
+        for chave, valor in (getattr(record, "campos", None) or {}).items():
+            if chave not in self.CAMPOS_FIXOS:
+                dados[chave] = valor
+        if record.exc_info:
+            dados["excecao"] = self.formatException(record.exc_info)
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+# Valores copiados ao enfileirar: o chamador pode alterá-los depois do log
+_MUTAVEIS = (list, dict, set, bytearray)
+
+
+def _copiar_valor(valor: Any) -> Any:
+    return copy.copy(valor) if isinstance(valor, _MUTAVEIS) else valor
+
+
+class QueueHandlerLimitado(QueueHandler):
+    """
+    Enfileira registros para os handlers de destino de um logger.
+
+    A formatação e a escrita ficam a cargo da thread do `DespachanteDeLogs`;
+    a thread chamadora apenas coloca o registro na fila. Se nenhum
+    despachante estiver ativo, os destinos são chamados diretamente.
+
+    Como a mensagem só é montada depois, `prepare` guarda uma cópia rasa dos
+    argumentos e dos campos estruturados: listas, dicionários e conjuntos
+    alterados pelo chamador após o log não mudam o que é escrito. A cópia é
+    de um nível só (alterações em objetos aninhados, ou em objetos com
+    `__str__` próprio, ainda aparecem no texto); copiar tudo em profundidade
+    ou formatar na hora custaria, em cada chamada e na thread da requisição,
+    justamente o trabalho que a fila tira dela.
+    """
+
+    def __init__(self, fila: queue.Queue, destinos: List[logging.Handler],
+                 politica: str = "descartar", timeout: float = 1.0):
+        super().__init__(fila)
+        self.destinos = destinos
+        self.politica = politica
+        self.timeout = timeout
+        self.descartados = 0
+
+    def prepare(self, record: logging.LogRecord):
+        # A mensagem é montada apenas na thread de escrita
+        record = copy.copy(record)
+        if isinstance(record.args, dict):
+            record.args = {chave: _copiar_valor(valor) for chave, valor in record.args.items()}
+        elif record.args:
+            record.args = tuple(_copiar_valor(valor) for valor in record.args)
+        campos = getattr(record, "campos", None)
+        if campos:
+            record.campos = {chave: _copiar_valor(valor) for chave, valor in campos.items()}
+            if isinstance(record.msg, MensagemEstruturada):
+                record.msg = MensagemEstruturada(record.msg.mensagem, record.campos)
+        return (self.destinos, record)
+
+    def enqueue(self, item) -> None:
+        try:
+            self.queue.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+        _, record = item
+        if self.politica == "bloquear" or record.levelno >= logging.WARNING:
+            try:
+                self.queue.put(item, timeout=self.timeout)
+                return
+            except queue.Full:
+                pass
+        self.descartados += 1
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if _despachante is None:
+            _escrever(self.destinos, record)
+        else:
+            super().emit(record)
+
+
+def _escrever(destinos: List[logging.Handler], record: logging.LogRecord) -> None:
+    for handler in destinos:
+        if record.levelno >= handler.level:
+            handler.handle(record)
+
+
+class DespachanteDeLogs(QueueListener):
+    """Thread única que consome a fila e escreve nos handlers de cada registro."""
+
+    def handle(self, item) -> None:
+        destinos, record = item
+        _escrever(destinos, record)
+
+    def enqueue_sentinel(self) -> None:
+        # Com a fila cheia, aguarda espaço em vez de falhar no desligamento
+        self.queue.put(self._sentinel)
+
+
+_fila: queue.Queue = queue.Queue(maxsize=LOG_FILA_TAMANHO)
+_despachante: Optional[DespachanteDeLogs] = None
+_handlers_fila: List[QueueHandlerLimitado] = []
+_trava = threading.Lock()
+
+
+def iniciar_logs() -> None:
+    """Inicia a thread de escrita dos logs (idempotente)."""
+    global _despachante
+    with _trava:
+        if _despachante is None and LOG_FILA_ATIVA:
+            _despachante = DespachanteDeLogs(_fila)
+            _despachante.start()
+
+
+def parar_logs() -> None:
+    """
+    Escreve todos os registros pendentes e encerra a thread de escrita.
+
+    Registros emitidos depois disso são escritos de forma síncrona.
+    """
+    global _despachante
+    with _trava:
+        despachante, _despachante = _despachante, None
+    if despachante is not None:
+        despachante.stop()
+
+
+def estatisticas_logs() -> dict:
+    """Retorna o estado da fila de logs."""
+    return {
+        "ativo": _despachante is not None,
+        "pendentes": _fila.qsize(),
+        "capacidade": _fila.maxsize,
+        "descartados": sum(handler.descartados for handler in _handlers_fila),
+    }
+
+
+atexit.register(parar_logs)
+
 
 def setup_logger(
     name: str,
@@ -60,16 +261,19 @@ def setup_logger(
     logger.setLevel(level)
 
     # Formato das mensagens de log
-    formatter = logging.Formatter(
-        fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    if LOG_FORMATO == "json":
+        formatter = FormatadorJSON()
+    else:
+        formatter = logging.Formatter(
+            fmt=FORMATO_TEXTO,
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
 
     # Handler para console (stdout)
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # Handler para arquivo (se especificado)
     if log_file:
@@ -85,11 +289,125 @@ def setup_logger(
         )
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    if LOG_FILA_ATIVA:
+        # A thread da requisição só enfileira; a escrita ocorre em segundo plano
+        queue_handler = QueueHandlerLimitado(
+            _fila, handlers, politica=LOG_FILA_POLITICA, timeout=LOG_FILA_TIMEOUT
+        )
+        queue_handler.setLevel(level)
+        queue_handler.addFilter(FiltroContexto())
+        _handlers_fila.append(queue_handler)
+        logger.addHandler(queue_handler)
+        iniciar_logs()
+    else:
+        for handler in handlers:
+            handler.addFilter(FiltroContexto())
+            logger.addHandler(handler)
 
     return logger
 
 
+class MensagemEstruturada:
+    """
+    Mensagem com campos chave=valor montada apenas quando o registro é formatado.
+
+    Com a fila de logs ativa, a montagem acontece na thread de escrita.
+    """
+
+    __slots__ = ("mensagem", "campos")
+
+    def __init__(self, mensagem: str, campos: Dict[str, Any]):
+        self.mensagem = mensagem
+        self.campos = campos
+
+    def __str__(self) -> str:
+        if not self.campos:
+            return self.mensagem
+        pares = " ".join(f"{chave}={valor}" for chave, valor in self.campos.items())
+        return f"{self.mensagem} {pares}"
+
+
+# Argumentos aceitos por Logger._log; os demais viram campos da mensagem
+_ARGUMENTOS_LOGGING = ("exc_info", "stack_info", "stacklevel", "extra")
+
+
+class LoggerEstruturado(logging.LoggerAdapter):
+    """
+    Logger com campos chave=valor e formatação adiada.
+
+    O nível é verificado antes de montar a mensagem ou o registro. Ainda
+    assim, uma chamada desativada paga a chamada de método e o empacotamento
+    dos argumentos e campos (feitos pelo Python antes da verificação), o que
+    custa mais que `logger.debug("... %s", x)`. Em laços quentes, verifique
+    o nível uma vez fora do laço (`depurar = logger.isEnabledFor(DEBUG)`) e
+    só chame o log sob essa guarda.
+
+    Example:
+        >>> logger = setup_logger_estruturado(__name__)
+        >>> logger.info("Aluno criado", aluno_id=1, nome="Ana")
+        # ... - INFO - Aluno criado aluno_id=1 nome=Ana
+    """
+
+    def __init__(self, logger: logging.Logger):
+        super().__init__(logger, {})
+
+    # Cada método verifica o nível antes de chamar `_registrar`, para que a
+    # chamada desativada não pague nenhuma chamada de função extra.
+
+    def _registrar(self, level: int, msg: str, args, kwargs) -> None:
+        opcoes = {chave: kwargs.pop(chave) for chave in _ARGUMENTOS_LOGGING if chave in kwargs}
+        extra = dict(opcoes.pop("extra", None) or {})
+        extra["campos"] = kwargs
+        # Aponta filename/lineno para quem chamou o método público
+        opcoes.setdefault("stacklevel", 3)
+        self.logger._log(level, MensagemEstruturada(msg, kwargs), args, extra=extra, **opcoes)
+
+    def log(self, level: int, msg: str, *args, **kwargs) -> None:
+        if self.logger.isEnabledFor(level):
+            self._registrar(level, msg, args, kwargs)
+
+    def debug(self, msg: str, *args, **kwargs) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._registrar(logging.DEBUG, msg, args, kwargs)
+
+    def info(self, msg: str, *args, **kwargs) -> None:
+        if self.logger.isEnabledFor(logging.INFO):
+            self._registrar(logging.INFO, msg, args, kwargs)
+
+    def warning(self, msg: str, *args, **kwargs) -> None:
+        if self.logger.isEnabledFor(logging.WARNING):
+            self._registrar(logging.WARNING, msg, args, kwargs)
+
+    def error(self, msg: str, *args, **kwargs) -> None:
+        if self.logger.isEnabledFor(logging.ERROR):
+            self._registrar(logging.ERROR, msg, args, kwargs)
+
+    def exception(self, msg: str, *args, exc_info=True, **kwargs) -> None:
+        if self.logger.isEnabledFor(logging.ERROR):
+            kwargs["exc_info"] = exc_info
+            self._registrar(logging.ERROR, msg, args, kwargs)
+
+    def critical(self, msg: str, *args, **kwargs) -> None:
+        if self.logger.isEnabledFor(logging.CRITICAL):
+            self._registrar(logging.CRITICAL, msg, args, kwargs)
+
+
+def setup_logger_estruturado(name: str, **kwargs) -> LoggerEstruturado:
+    """
+    Configura um logger com `setup_logger` e o envolve em um `LoggerEstruturado`.
+
+    Args:
+        name: Nome do logger
+        **kwargs: Mesmos parâmetros de `setup_logger`
+
+    Returns:
+        LoggerEstruturado: Logger com campos chave=valor
+    """
+    return LoggerEstruturado(setup_logger(name, **kwargs))
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Retorna um logger existente ou cria um novo com configuração padrão.
@@ -0,0 +1,208 @@
+"""
+Métricas em memória no formato de exposição do Prometheus.
+
+Os valores são mantidos no próprio processo e lidos sob demanda pelo
+endpoint /metrics; nenhum coletor externo precisa estar em execução.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+from .cache import cache_respostas
+from .logger import estatisticas_logs
+
+# Limites (em segundos) dos buckets dos histogramas
+BUCKETS_REQUISICAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_BANCO = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+Rotulos = Tuple[Tuple[str, str], ...]
+
+
+def _rotulos(rotulos: Rotulos, extra: str = "") -> str:
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in rotulos]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrica(ABC):
+    """Base das métricas: nome, descrição e trava compartilhada."""
+
+    tipo = ""
+
+    def __init__(self, nome: str, descricao: str):
+        self.nome = nome
+        self.descricao = descricao
+        self._trava = threading.Lock()
+
+    def cabecalho(self) -> List[str]:
+        return [f"# HELP {self.nome} {self.descricao}", f"# TYPE {self.nome} {self.tipo}"]
+
+    @abstractmethod
+    def exportar(self) -> List[str]:
+        """Linhas com os valores atuais, sem o cabeçalho"""
+        pass
+
+
+class Contador(Metrica):
+    """Valor que só cresce, separado por rótulos."""
+
+    tipo = "counter"
+
+    def __init__(self, nome: str, descricao: str):
+        super().__init__(nome, descricao)
+        self._valores: Dict[Rotulos, float] = {}
+
+    def incrementar(self, valor: float = 1, **rotulos) -> None:
+        chave = tuple(sorted(rotulos.items()))
+        with self._trava:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def exportar(self) -> List[str]:
+        with self._trava:
+            return [f"{self.nome}{_rotulos(r)} {v}" for r, v in self._valores.items()]
+
+
+class Medidor(Metrica):
+    """Valor que sobe e desce (gauge)."""
+
+    tipo = "gauge"
+
+    def __init__(self, nome: str, descricao: str):
+        super().__init__(nome, descricao)
+        self._valor = 0.0
+
+    def somar(self, valor: float) -> None:
+        with self._trava:
+            self._valor += valor
+
+    def exportar(self) -> List[str]:
+        with self._trava:
+            return [f"{self.nome} {self._valor}"]
+
+
+class Histograma(Metrica):
+    """Distribuição de valores em buckets cumulativos, separada por rótulos."""
+
+    tipo = "histogram"
+
+    def __init__(self, nome: str, descricao: str, buckets: Iterable[float]):
+        super().__init__(nome, descricao)
+        self.buckets = tuple(buckets)
+        # rótulos -> [contagem por bucket (+Inf no fim), soma]
+        self._series: Dict[Rotulos, list] = {}
+
+    def observar(self, valor: float, **rotulos) -> None:
+        chave = tuple(sorted(rotulos.items()))
+        indice = bisect_left(self.buckets, valor)
+        with self._trava:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = [[0] * (len(self.buckets) + 1), 0.0]
+            serie[0][indice] += 1
+            serie[1] += valor
+
+    def exportar(self) -> List[str]:
+        linhas = []
+        with self._trava:
+            for rotulos, (contagens, soma) in self._series.items():
+                acumulado = 0
+                for limite, contagem in zip(self.buckets + ("+Inf",), contagens):
+                    acumulado += contagem
+                    rotulos_bucket = _rotulos(rotulos, f'le="{limite}"')
+                    linhas.append(f"{self.nome}_bucket{rotulos_bucket} {acumulado}")
+                linhas.append(f"{self.nome}_sum{_rotulos(rotulos)} {soma}")
+                linhas.append(f"{self.nome}_count{_rotulos(rotulos)} {acumulado}")
+        return linhas
+
+
+class RegistroMetricas:
+    """Conjunto das métricas da aplicação."""
+
+    def __init__(self):
+        self.duracao_requisicoes = Histograma(
+            "http_request_duration_seconds", "Latência das requisições HTTP por rota", BUCKETS_REQUISICAO
+        )
+        self.requisicoes = Contador("http_requests_total", "Requisições HTTP por rota e status")
+        self.requisicoes_em_andamento = Medidor(
+            "http_requests_in_flight", "Requisições HTTP sendo processadas"
+        )
+        self.espera_pool = Histograma(
+            "db_pool_checkout_wait_seconds", "Tempo para obter uma conexão do pool", BUCKETS_BANCO
+        )
+        self.duracao_consultas = Histograma(
+            "db_statement_duration_seconds", "Latência dos comandos SQL por operação", BUCKETS_BANCO
+        )
+
+    def metricas(self) -> List[Metrica]:
+        return [
+            self.duracao_requisicoes,
+            self.requisicoes,
+            self.requisicoes_em_andamento,
+            self.espera_pool,
+            self.duracao_consultas,
+        ]
+
+    def observar_consulta(self, comando: str, duracao: float) -> None:
+        """Registra a latência de um comando SQL, rotulado pela operação (SELECT, INSERT...)."""
+        operacao = comando.lstrip().split(None, 1)[0].upper() if comando.strip() else "OUTRO"
+        self.duracao_consultas.observar(duracao, operacao=operacao)
+
+    def exportar(self) -> str:
+        """Gera o texto no formato de exposição do Prometheus."""
+        linhas = []
+        for metrica in self.metricas():
+            linhas += metrica.cabecalho() + metrica.exportar()
+        linhas += _exportar_cache() + _exportar_fila_de_logs()
+        return "\n".join(linhas) + "\n"
+
+
+def _exportar_cache() -> List[str]:
+    estatisticas = cache_respostas.estatisticas()
+    linhas = [
+        "# HELP cache_hits_total Leituras servidas pelo cache de respostas",
+        "# TYPE cache_hits_total counter",
+    ]
+    linhas += [
+        f"cache_hits_total{_rotulos((('rota', rota),))} {m['hits']}" for rota, m in estatisticas["rotas"].items()
+    ]
+    linhas += [
+        "# HELP cache_misses_total Leituras que precisaram consultar o banco",
+        "# TYPE cache_misses_total counter",
+    ]
+    linhas += [
+        f"cache_misses_total{_rotulos((('rota', rota),))} {m['misses']}" for rota, m in estatisticas["rotas"].items()
+    ]
+    linhas += [
+        "# HELP cache_entries Entradas atualmente no cache de respostas",
+        "# TYPE cache_entries gauge",
+        f"cache_entries {estatisticas['itens']}",
+        "# HELP cache_evictions_total Entradas removidas por limite de tamanho (LRU)",
+        "# TYPE cache_evictions_total counter",
+        f"cache_evictions_total {estatisticas['remocoes_lru']}",
+    ]
+    return linhas
+
+
+def _exportar_fila_de_logs() -> List[str]:
+    estatisticas = estatisticas_logs()
+    return [
+        "# HELP log_queue_size Registros de log aguardando escrita",
+        "# TYPE log_queue_size gauge",
+        f"log_queue_size {estatisticas['pendentes']}",
+        "# HELP log_queue_capacity Capacidade máxima da fila de logs",
+        "# TYPE log_queue_capacity gauge",
+        f"log_queue_capacity {estatisticas['capacidade']}",
+        "# HELP log_queue_dropped_total Registros de log descartados com a fila cheia",
+        "# TYPE log_queue_dropped_total counter",
+        f"log_queue_dropped_total {estatisticas['descartados']}",
+    ]
+
+
+metricas = RegistroMetricas()
@@ -0,0 +1,75 @@
+"""
+Utilitários de paginação por cursor (keyset).
+
+As listagens são ordenadas por ID e cada página começa logo após o último
+ID da página anterior, de modo que o custo de buscar páginas profundas é
+proporcional apenas ao tamanho da página (sem varredura de OFFSET).
+
+O cursor exposto aos clientes é opaco: apenas o ID codificado em base64.
+"""
+
+import base64
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, Query, Response
+
+from app.exceptions import ValidationException
+
+
+LIMITE_PADRAO = 100
+LIMITE_MAXIMO = 1000
+CABECALHO_PROXIMO_CURSOR = "X-Next-Cursor"
+
+
+def encode_cursor(ultimo_id: int) -> str:
+    """Codifica o último ID de uma página em um cursor opaco."""
+    return base64.urlsafe_b64encode(f"id:{ultimo_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """
+    Decodifica um cursor opaco no ID a partir do qual a próxima página começa.
+
+    Raises:
+        ValidationException: Se o cursor estiver malformado
+    """
+    if not cursor:
+        return None
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        prefixo, valor = base64.urlsafe_b64decode(cursor + padding).decode().split(":", 1)
+        if prefixo != "id":
+            raise ValueError(prefixo)
+        return int(valor)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValidationException("Cursor de paginação inválido", {"cursor": cursor}) from exc
+
+
+class Paginacao:
+    """
+    Dependência FastAPI com os parâmetros de paginação (`cursor`, `limit`).
+
+    Example:
+        >>> @router.get("")
+        ... def listar(pagina: Paginacao = Depends(), ...):
+        ...     return pagina.responder(response, servico(db, pagina.after_id, pagina.limit))
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Cursor opaco retornado em X-Next-Cursor"),
+        limit: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+    ):
+        try:
+            self.after_id = decode_cursor(cursor)
+        except ValidationException as exc:
+            raise HTTPException(status_code=400, detail=exc.to_dict())
+        self.limit = limit
+
+    def responder(self, response: Response, itens: Sequence[Any]) -> Sequence[Any]:
+        """Define o cabeçalho X-Next-Cursor quando pode haver uma próxima página."""
+        if itens and len(itens) >= self.limit:
+            ultimo = itens[-1]
+            ultimo_id = ultimo["id"] if isinstance(ultimo, dict) else ultimo.id
+            response.headers[CABECALHO_PROXIMO_CURSOR] = encode_cursor(ultimo_id)
+        return itens
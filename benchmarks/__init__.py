@@ -0,0 +1 @@
+# Benchmarks de desempenho (executados manualmente, fora da suíte do pytest)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Executa o teste de carga completo e grava um relatório JSON comparável.
+
+Passos: gera um banco determinístico (`benchmarks.dados`), sobe a API com
+uvicorn apontando para ele, roda o Locust em modo headless e converte as
+estatísticas em JSON (vazão, falhas e percentis por endpoint). O relatório
+tem chaves ordenadas para que execuções em commits diferentes possam ser
+comparadas com `diff` ou com a opção `--comparar`.
+
+Uso:
+    python -m benchmarks.carga [--usuarios 50] [--taxa 10] [--duracao 60s]
+        [--saida carga.json] [--comparar relatorio_anterior.json]
+"""
+
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from benchmarks.dados import caminho_manifesto, gerar_dados
+
+LOCUSTFILE = Path(__file__).with_name("locustfile.py")
+PERCENTIS = {"p50_ms": "50%", "p95_ms": "95%", "p99_ms": "99%"}
+
+
+def _commit_atual() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecido"
+
+
+def _aguardar_servidor(url: str, limite: float = 30.0) -> None:
+    fim = time.monotonic() + limite
+    while time.monotonic() < fim:
+        try:
+            urllib.request.urlopen(f"{url}/metrics", timeout=1)
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Servidor não respondeu em {url} após {limite:.0f}s")
+
+
+def ler_estatisticas(arquivo_csv: Path) -> dict:
+    """Converte o `<prefixo>_stats.csv` do Locust em métricas por endpoint."""
+    endpoints = {}
+    with open(arquivo_csv, encoding="utf-8") as arquivo:
+        for linha in csv.DictReader(arquivo):
+            nome = f"{linha['Type']} {linha['Name']}".strip() if linha["Type"] else "total"
+            endpoints[nome] = {
+                "requisicoes": int(linha["Request Count"]),
+                "falhas": int(linha["Failure Count"]),
+                "rps": round(float(linha["Requests/s"]), 2),
+                "media_ms": round(float(linha["Average Response Time"]), 2),
+                **{chave: float(linha[coluna] or 0) for chave, coluna in PERCENTIS.items()},
+            }
+    return endpoints
+
+
+def executar_carga(args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        banco = Path(tmp) / "carga.db"
+        manifesto = gerar_dados(
+            f"sqlite:///{banco}", args.turmas, args.alunos, args.materias, args.tarefas, args.semente
+        )
+        caminho_manifesto(banco).write_text(json.dumps(manifesto), encoding="utf-8")
+
+        url = f"http://127.0.0.1:{args.porta}"
+        ambiente = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{banco}",
+            "DB_PERFIL": args.perfil,
+            "CARGA_MANIFESTO": str(caminho_manifesto(banco)),
+        }
+        servidor = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.porta), "--log-level", "warning"],
+            env=ambiente,
+        )
+        try:
+            _aguardar_servidor(url)
+            prefixo = Path(tmp) / "locust"
+            subprocess.run(
+                [
+                    sys.executable, "-m", "locust", "-f", str(LOCUSTFILE), "--headless",
+                    "--users", str(args.usuarios), "--spawn-rate", str(args.taxa),
+                    "--run-time", args.duracao, "--host", url,
+                    "--csv", str(prefixo), "--only-summary",
+                ],
+                env=ambiente,
+                check=False,
+            )
+            endpoints = ler_estatisticas(Path(f"{prefixo}_stats.csv"))
+        finally:
+            servidor.terminate()
+            servidor.wait(timeout=30)
+
+    return {
+        "commit": _commit_atual(),
+        "parametros": {
+            "usuarios": args.usuarios,
+            "taxa": args.taxa,
+            "duracao": args.duracao,
+            "perfil": args.perfil,
+        },
+        "dados": manifesto,
+        "endpoints": endpoints,
+    }
+
+
+def comparar(anterior: dict, atual: dict) -> None:
+    """Imprime a variação de vazão e de p99 por endpoint entre dois relatórios."""
+    print(f"{'endpoint':<40}{'rps':>18}{'p99 (ms)':>22}")
+    for nome, metricas in sorted(atual["endpoints"].items()):
+        antes = anterior["endpoints"].get(nome)
+        if antes is None:
+            print(f"{nome:<40}{'(novo)':>18}")
+            continue
+        rps = f"{antes['rps']:.1f} -> {metricas['rps']:.1f}"
+        p99 = f"{antes['p99_ms']:.0f} -> {metricas['p99_ms']:.0f}"
+        print(f"{nome:<40}{rps:>18}{p99:>22}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--usuarios", type=int, default=50)
+    parser.add_argument("--taxa", type=float, default=10, help="usuários iniciados por segundo")
+    parser.add_argument("--duracao", default="60s", help="tempo de execução do Locust (ex.: 60s, 5m)")
+    parser.add_argument("--perfil", default="producao", help="perfil do SQLite (DB_PERFIL)")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--turmas", type=int, default=20)
+    parser.add_argument("--alunos", type=int, default=2000)
+    parser.add_argument("--materias", type=int, default=30)
+    parser.add_argument("--tarefas", type=int, default=20000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", type=Path, default=Path("carga.json"))
+    parser.add_argument("--comparar", type=Path, help="relatório anterior para comparação")
+    args = parser.parse_args()
+
+    relatorio = executar_carga(args)
+    args.saida.write_text(json.dumps(relatorio, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"Relatório gravado em {args.saida}")
+    if args.comparar:
+        comparar(json.loads(args.comparar.read_text(encoding="utf-8")), relatorio)
+
+
+if __name__ == "__main__":
+    main()
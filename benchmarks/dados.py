@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Gerador determinístico de dados para os testes de carga.
+
+Com a mesma semente e os mesmos tamanhos, gera sempre o mesmo banco: nomes,
+idades, bolsistas, matrículas e tarefas são sorteados por um `random.Random`
+próprio. Ao lado do banco é gravado um manifesto JSON com os tamanhos e os
+intervalos de IDs, lido pelo locustfile.
+
+Uso:
+    python -m benchmarks.dados carga.db [--turmas 20] [--alunos 2000]
+        [--materias 30] [--tarefas 20000] [--semente 42]
+"""
+
+import argparse
+import json
+import random
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.database import Base, unidade_de_trabalho
+from app.models import Aluno, Materia, Tarefa, Turma, aluno_materia
+from app.services.contadores_service import reconciliar_contadores_service
+
+NOMES = ["Ana", "Bruno", "Carla", "Diego", "Elisa", "Fábio", "Gabi", "Hugo", "Iara", "João"]
+SOBRENOMES = ["Silva", "Souza", "Costa", "Santos", "Oliveira", "Pereira", "Lima", "Gomes"]
+MATERIAS_POR_TURMA = 5
+LOTE = 5000
+
+
+def _em_lotes(conn, tabela, linhas):
+    for inicio in range(0, len(linhas), LOTE):
+        conn.execute(insert(tabela), linhas[inicio:inicio + LOTE])
+
+
+def gerar_dados(url: str, turmas: int, alunos: int, materias: int, tarefas: int,
+                semente: int = 42) -> dict:
+    """
+    Cria as tabelas e popula um banco vazio; retorna o manifesto gerado.
+
+    Os IDs são sequenciais a partir de 1, na ordem de inserção.
+    """
+    engine = create_engine(url)
+    try:
+        return popular_banco(engine, turmas, alunos, materias, tarefas, semente)
+    finally:
+        engine.dispose()
+
+
+def popular_banco(engine: Engine, turmas: int, alunos: int, materias: int, tarefas: int,
+                  semente: int = 42) -> dict:
+    """Mesmo que `gerar_dados`, sobre uma engine já criada (ex.: SQLite em memória)."""
+    sorteio = random.Random(semente)
+    Base.metadata.create_all(engine)
+
+    linhas_turmas = [{"nome": f"Turma {i:04d}"} for i in range(1, turmas + 1)]
+    linhas_materias = [{"nome": f"Matéria {i:03d}"} for i in range(1, materias + 1)]
+    linhas_alunos = [
+        {
+            "nome": f"{sorteio.choice(NOMES)} {sorteio.choice(SOBRENOMES)} {i}",
+            "idade": sorteio.randint(15, 25),
+            "bolsista": sorteio.random() < 0.3,
+            "turma_id": (i - 1) % turmas + 1,
+        }
+        for i in range(1, alunos + 1)
+    ]
+    # Cada turma cursa um subconjunto fixo de matérias; todos os seus alunos são matriculados
+    materias_da_turma = {
+        turma: sorteio.sample(range(1, materias + 1), min(MATERIAS_POR_TURMA, materias))
+        for turma in range(1, turmas + 1)
+    }
+    linhas_matriculas = [
+        {"aluno_id": aluno_id, "materia_id": materia_id}
+        for aluno_id, aluno in enumerate(linhas_alunos, 1)
+        for materia_id in materias_da_turma[aluno["turma_id"]]
+    ]
+    linhas_tarefas = []
+    for i in range(1, tarefas + 1):
+        aluno_id = sorteio.randint(1, alunos)
+        linhas_tarefas.append({
+            "nome": f"Tarefa {i}",
+            "concluido": sorteio.random() < 0.5,
+            "materia_id": sorteio.choice(materias_da_turma[linhas_alunos[aluno_id - 1]["turma_id"]]),
+            "aluno_id": aluno_id,
+        })
+
+    with engine.begin() as conn:
+        _em_lotes(conn, Turma.__table__, linhas_turmas)
+        _em_lotes(conn, Materia.__table__, linhas_materias)
+        _em_lotes(conn, Aluno.__table__, linhas_alunos)
+        _em_lotes(conn, aluno_materia, linhas_matriculas)
+        _em_lotes(conn, Tarefa.__table__, linhas_tarefas)
+    with Session(engine) as db, unidade_de_trabalho(db):
+        reconciliar_contadores_service(db)
+
+    return {
+        "semente": semente,
+        "turmas": turmas,
+        "alunos": alunos,
+        "materias": materias,
+        "tarefas": tarefas,
+        "matriculas": len(linhas_matriculas),
+    }
+
+
+def caminho_manifesto(banco: Path) -> Path:
+    """Manifesto gravado ao lado do banco (carga.db -> carga.json)."""
+    return banco.with_suffix(".json")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("banco", type=Path, help="arquivo SQLite a criar (não pode existir)")
+    parser.add_argument("--turmas", type=int, default=20)
+    parser.add_argument("--alunos", type=int, default=2000)
+    parser.add_argument("--materias", type=int, default=30)
+    parser.add_argument("--tarefas", type=int, default=20000)
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.banco.exists():
+        parser.error(f"{args.banco} já existe; o gerador só popula bancos novos")
+    manifesto = gerar_dados(
+        f"sqlite:///{args.banco}", args.turmas, args.alunos, args.materias, args.tarefas, args.semente
+    )
+    caminho_manifesto(args.banco).write_text(json.dumps(manifesto, indent=2) + "\n", encoding="utf-8")
+    print(json.dumps(manifesto))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Cenários de carga do Locust sobre um banco gerado por `benchmarks.dados`.
+
+Os IDs usados nas requisições são sorteados dentro dos intervalos do
+manifesto (variável CARGA_MANIFESTO), com semente fixa por usuário, para que
+execuções repetidas sobre o mesmo banco façam a mesma sequência de chamadas.
+
+Uso (o servidor já deve estar rodando sobre o banco gerado):
+    CARGA_MANIFESTO=carga.json locust -f benchmarks/locustfile.py --host http://127.0.0.1:8000
+
+Para uma execução headless com relatório JSON, use `python -m benchmarks.carga`.
+"""
+
+import itertools
+import json
+import os
+import random
+
+from locust import HttpUser, between, task
+
+with open(os.getenv("CARGA_MANIFESTO", "carga.json"), encoding="utf-8") as arquivo:
+    MANIFESTO = json.load(arquivo)
+
+_sementes = itertools.count(MANIFESTO["semente"])
+
+
+class UsuarioBase(HttpUser):
+    """Base dos perfis: sorteio determinístico de IDs existentes."""
+
+    abstract = True
+    wait_time = between(0.05, 0.2)
+
+    def on_start(self):
+        self.sorteio = random.Random(next(_sementes))
+
+    def _id(self, entidade: str) -> int:
+        return self.sorteio.randint(1, MANIFESTO[entidade])
+
+
+class Secretaria(UsuarioBase):
+    """Equipe da secretaria: navega por turmas e rankings e faz matrículas em lote."""
+
+    weight = 1
+
+    @task(5)
+    def listar_turmas(self):
+        self.client.get("/turmas?limit=20", name="/turmas")
+
+    @task(3)
+    def consultar_aluno(self):
+        self.client.get(f"/alunos/{self._id('alunos')}", name="/alunos/{id}")
+
+    @task(2)
+    def rankings(self):
+        self.client.get("/turmas/mais-bolsistas")
+        self.client.get("/materias/mais-alunos")
+
+    @task(1)
+    def matricular_turma(self):
+        materias = self.sorteio.sample(range(1, MANIFESTO["materias"] + 1), min(3, MANIFESTO["materias"]))
+        self.client.post(
+            f"/materias/turma/{self._id('turmas')}",
+            json={"materias_ids": materias},
+            name="/materias/turma/{turma_id}",
+        )
+
+
+class Estudante(UsuarioBase):
+    """Estudante: consulta o próprio cadastro e tarefas e conclui tarefas."""
+
+    weight = 4
+
+    def on_start(self):
+        super().on_start()
+        self.aluno_id = self._id("alunos")
+
+    @task(4)
+    def consultar_cadastro(self):
+        self.client.get(f"/alunos/{self.aluno_id}", name="/alunos/{id}")
+
+    @task(4)
+    def listar_tarefas(self):
+        self.client.get(f"/tarefas/aluno/{self.aluno_id}", name="/tarefas/aluno/{aluno_id}")
+
+    @task(2)
+    def concluir_tarefa(self):
+        self.client.put(f"/tarefas/{self._id('tarefas')}/concluir", name="/tarefas/{id}/concluir")
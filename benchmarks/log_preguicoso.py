@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark do custo de logs DEBUG desativados em laços quentes.
+
+Compara, por chamada, o f-string montado antes da chamada (padrão antigo dos
+serviços), o estilo %-args do logging, o `LoggerEstruturado` e a guarda de
+nível calculada fora do laço (usada em `criar_alunos_em_lote_service`), todos
+com o nível em INFO. O laço vazio serve de referência, e um método vazio com
+os mesmos campos mostra o piso de qualquer chamada com chave=valor: o
+empacotamento dos argumentos acontece antes de o nível ser verificado, então
+só a guarda fora do laço fica perto de zero.
+
+Uso:
+    python -m benchmarks.log_preguicoso [--iteracoes 1000000]
+"""
+
+import argparse
+import logging
+import timeit
+
+from app.utils import LoggerEstruturado
+
+
+class Vazio:
+    """Método que não faz nada: custo da chamada e dos campos, sem o log."""
+
+    def debug(self, msg, *args, **kwargs) -> None:
+        pass
+
+
+class Item:
+    """Simula o payload de AlunoCreate dentro do laço do lote."""
+
+    nome = "Aluno Benchmark"
+
+
+def medir(iteracoes: int) -> dict:
+    """Retorna o custo médio por chamada (ns) de cada estilo de log."""
+    base = logging.getLogger("benchmarks.log_preguicoso")
+    base.setLevel(logging.INFO)
+    base.propagate = False
+    estruturado = LoggerEstruturado(base)
+    item, vazio, total = Item(), Vazio(), iteracoes
+    depurar = estruturado.isEnabledFor(logging.DEBUG)
+
+    cenarios = {
+        "laço vazio": lambda: None,
+        "f-string": lambda: base.debug(f"Processando aluno {1}/{total}: {item.nome}"),
+        "%-args": lambda: base.debug("Processando aluno %d/%d: %s", 1, total, item.nome),
+        "método vazio": lambda: vazio.debug(
+            "Processando aluno do lote", posicao=1, total=total, nome=item.nome
+        ),
+        "estruturado": lambda: estruturado.debug(
+            "Processando aluno do lote", posicao=1, total=total, nome=item.nome
+        ),
+        "guarda de nível": lambda: depurar and estruturado.debug(
+            "Processando aluno do lote", posicao=1, total=total, nome=item.nome
+        ),
+    }
+    return {
+        nome: min(timeit.repeat(funcao, number=iteracoes, repeat=3)) / iteracoes * 1e9
+        for nome, funcao in cenarios.items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iteracoes", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    resultados = medir(args.iteracoes)
+    referencia = resultados["laço vazio"]
+    print(f"{'estilo':<16}{'ns/chamada':>12}{'acima do laço':>16}")
+    for nome, ns in resultados.items():
+        print(f"{nome:<16}{ns:>12.1f}{ns - referencia:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark da leitura de alunos: objetos ORM contra projeção de colunas.
+
+Mede linhas por segundo de `AlunoRepository.get_all()` (objetos ORM no
+identity map) e de `AlunoRepository.listar_resumo()` (`Row`s sem hidratação),
+em páginas de `--pagina` linhas sobre um SQLite em memória com `--alunos`
+alunos. Cada caminho é medido só na leitura e na leitura seguida da
+serialização: `jsonable_encoder` (rotas sem `response_model`) ou validação
+por `AlunoOut` + orjson, como as rotas fazem hoje.
+
+Uso:
+    python -m benchmarks.projecao [--alunos 100000] [--pagina 1000]
+"""
+
+import argparse
+import time
+from typing import List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.repositories import AlunoRepository
+from app.schemas import AlunoOut
+from benchmarks.dados import popular_banco
+
+ALUNOS_OUT = TypeAdapter(List[AlunoOut])
+
+
+def _via_response_model(linhas) -> bytes:
+    """Mesmo caminho de uma rota com response_model e ORJSONResponse."""
+    return orjson.dumps(ALUNOS_OUT.dump_python(ALUNOS_OUT.validate_python(linhas), mode="json"))
+
+
+def _ler_tudo(db: Session, ler, pagina: int, serializar) -> int:
+    """Percorre a tabela inteira página a página; retorna o total de linhas lidas."""
+    total, after_id = 0, None
+    while True:
+        linhas = ler(AlunoRepository(db), after_id, pagina)
+        if not linhas:
+            return total
+        if serializar:
+            serializar(linhas)
+        total += len(linhas)
+        after_id = linhas[-1].id
+        # Como numa requisição: a sessão não acumula objetos entre páginas
+        db.expunge_all()
+
+
+def medir(alunos: int, pagina: int) -> dict:
+    """Retorna linhas/s de cada caminho de leitura (melhor de 3 execuções)."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    popular_banco(engine, turmas=max(1, alunos // 100), alunos=alunos, materias=10, tarefas=0)
+
+    orm = lambda repo, after_id, limit: repo.get_all(after_id, limit)
+    projecao = lambda repo, after_id, limit: repo.listar_resumo(after_id, limit)
+    # `serializar` reproduz a montagem do corpo da resposta (None: só leitura)
+    cenarios = {
+        "get_all": (orm, None),
+        "listar_resumo": (projecao, None),
+        "get_all + json": (orm, jsonable_encoder),
+        "listar_resumo + json": (projecao, lambda linhas: jsonable_encoder([linha._asdict() for linha in linhas])),
+        "listar_resumo + modelo": (projecao, _via_response_model),
+    }
+    resultados = {}
+    try:
+        for nome, (ler, serializar) in cenarios.items():
+            tempos = []
+            for _ in range(3):
+                with Session(engine) as db:
+                    inicio = time.perf_counter()
+                    total = _ler_tudo(db, ler, pagina, serializar)
+                    tempos.append(time.perf_counter() - inicio)
+            resultados[nome] = total / min(tempos)
+    finally:
+        engine.dispose()
+    return resultados
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--alunos", type=int, default=100_000)
+    parser.add_argument("--pagina", type=int, default=1000)
+    args = parser.parse_args()
+
+    resultados = medir(args.alunos, args.pagina)
+    print(f"{'caminho':<24}{'linhas/s':>14}{'vs get_all':>12}")
+    for nome, vazao in resultados.items():
+        referencia = resultados["get_all + json" if "+" in nome else "get_all"]
+        print(f"{nome:<24}{vazao:>14,.0f}{vazao / referencia:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark de leituras concorrentes com escritas contínuas no SQLite.
+
+Compara os perfis de app/database.py ("padrao" x "producao") medindo
+quantas leituras por segundo os leitores conseguem completar enquanto uma
+thread escritora faz commits em sequência.
+
+Uso:
+    python -m benchmarks.sqlite_concorrencia [--segundos 5] [--leitores 4]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, criar_engine
+from app.models import Aluno, Turma
+
+
+def _preparar_banco(url: str, perfil: str, alunos: int) -> None:
+    engine = criar_engine(url, perfil)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        turma = Turma(nome="Turma Benchmark")
+        db.add(turma)
+        db.flush()
+        db.add_all(Aluno(nome=f"Aluno {i}", idade=18, turma_id=turma.id) for i in range(alunos))
+        db.commit()
+    engine.dispose()
+
+
+def medir(perfil: str, segundos: float, leitores: int, alunos: int) -> dict:
+    """Executa o cenário para um perfil e retorna as métricas coletadas."""
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        _preparar_banco(url, perfil, alunos)
+        engine = criar_engine(url, perfil)
+        parar = threading.Event()
+        contagem = {"leituras": 0, "escritas": 0, "bloqueios": 0}
+        trava = threading.Lock()
+
+        def escritor():
+            while not parar.is_set():
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(text(
+                            "INSERT INTO alunos (nome, idade, bolsista, turma_id) VALUES ('Novo', 20, 0, 1)"
+                        ))
+                    with trava:
+                        contagem["escritas"] += 1
+                except OperationalError:
+                    with trava:
+                        contagem["bloqueios"] += 1
+
+        def leitor():
+            while not parar.is_set():
+                try:
+                    with engine.connect() as conn:
+                        conn.execute(text("SELECT id, nome FROM alunos ORDER BY id LIMIT 100")).all()
+                    with trava:
+                        contagem["leituras"] += 1
+                except OperationalError:
+                    with trava:
+                        contagem["bloqueios"] += 1
+
+        threads = [threading.Thread(target=escritor)]
+        threads += [threading.Thread(target=leitor) for _ in range(leitores)]
+        for t in threads:
+            t.start()
+        time.sleep(segundos)
+        parar.set()
+        for t in threads:
+            t.join()
+        engine.dispose()
+
+    return {
+        "perfil": perfil,
+        "leituras_por_segundo": contagem["leituras"] / segundos,
+        "escritas_por_segundo": contagem["escritas"] / segundos,
+        "bloqueios": contagem["bloqueios"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--segundos", type=float, default=5.0)
+    parser.add_argument("--leitores", type=int, default=4)
+    parser.add_argument("--alunos", type=int, default=10000)
+    args = parser.parse_args()
+
+    for perfil in ("padrao", "producao"):
+        r = medir(perfil, args.segundos, args.leitores, args.alunos)
+        print(
+            f"{r['perfil']:>9}: {r['leituras_por_segundo']:10.1f} leituras/s | "
+            f"{r['escritas_por_segundo']:8.1f} escritas/s | {r['bloqueios']} bloqueios"
+        )
+
+
+if __name__ == "__main__":
+    main()
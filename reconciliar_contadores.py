@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Script para reconstruir os contadores dos rankings no banco alunos.db
+
+Uso:
+    python reconciliar_contadores.py
+"""
+from app.database import SessionLocal, unidade_de_trabalho
+from app.services.contadores_service import reconciliar_contadores_service
+
+
+def main():
+    with SessionLocal() as db, unidade_de_trabalho(db):
+        resultado = reconciliar_contadores_service(db)
+    print(
+        f"Contadores reconciliados: {resultado['alunos']} alunos, "
+        f"{resultado['materias']} matérias, {resultado['turmas']} turmas"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Fixtures da suíte de desempenho (tests/benchmarks).
+
+Cada caso é executado em bancos SQLite semeados por `benchmarks.dados` com
+tamanhos crescentes (número de alunos e de tarefas) e roda em dois modos:
+- "comandos" (execução padrão): uma repetição por tamanho, só em memória;
+  falha se o número de comandos SQL variar com o tamanho do banco (ex.: N+1).
+- "tempo" (marcador `benchmark`, fora da execução padrão; `-m benchmark`):
+  bancos em memória e em disco, o menor tempo entre as repetições; falha
+  também se o tempo crescer mais que o permitido pela complexidade declarada
+  ("constante" ou "linear") entre o menor e o maior tamanho (ex.: O(n²)).
+  Comparar tempos de frações de milissegundo é sensível à carga da máquina,
+  por isso esse modo não roda a cada `pytest`.
+
+Variáveis de ambiente (modo "tempo"):
+- BENCHMARK_TAMANHOS: tamanhos separados por vírgula (padrão: "1000,10000";
+  a curva completa usa "1000,10000,100000")
+- BENCHMARK_REPETICOES: repetições por ponto (padrão: 5)
+- BENCHMARK_SAIDA: arquivo JSON onde gravar as curvas medidas
+"""
+import json
+import os
+import time
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.utils import cache_respostas
+from benchmarks.dados import popular_banco
+
+TAMANHOS = [int(t) for t in os.getenv("BENCHMARK_TAMANHOS", "1000,10000").split(",")]
+REPETICOES = int(os.getenv("BENCHMARK_REPETICOES", "5"))
+ARMAZENAMENTOS = ("memoria", "disco")
+# Modo "comandos": dois tamanhos bastam para ver o número de comandos variar
+TAMANHOS_COMANDOS = [100, 1000]
+ALUNOS_POR_TURMA = 100
+
+# Crescimento de tempo aceito entre o menor e o maior banco, como fração do
+# crescimento do número de linhas; O(n²) ultrapassa ambos já com 10x mais linhas
+CRESCIMENTO_MAXIMO = {"constante": 0.5, "linear": 3.0}
+
+# (caso, armazenamento) -> {tamanho: {"ms": ..., "comandos": ...}}
+_curvas = {}
+
+
+def pytest_generate_tests(metafunc):
+    """Executa cada caso que usa `curva` nos modos "comandos" e "tempo" (marcado como benchmark)."""
+    if "curva" in metafunc.fixturenames:
+        metafunc.parametrize(
+            "modo_curva", ["comandos", pytest.param("tempo", marks=pytest.mark.benchmark)], indirect=True
+        )
+
+
+@pytest.fixture
+def modo_curva(request):
+    """Fixture com o modo da medição ("comandos" ou "tempo")"""
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def bancos(tmp_path_factory):
+    """Fixture que cria (sob demanda) e reutiliza os bancos semeados por armazenamento e tamanho"""
+    criados = {}
+
+    def obter(armazenamento, tamanho):
+        chave = (armazenamento, tamanho)
+        if chave not in criados:
+            if armazenamento == "memoria":
+                engine = create_engine(
+                    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+                )
+            else:
+                engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('benchmark') / 'banco.db'}")
+            popular_banco(
+                engine, turmas=max(1, tamanho // ALUNOS_POR_TURMA), alunos=tamanho,
+                materias=30, tarefas=tamanho,
+            )
+            criados[chave] = engine
+        return criados[chave]
+
+    yield obter
+    for engine in criados.values():
+        engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def sem_cache_de_respostas():
+    """Fixture que desativa o cache de respostas: cada repetição deve ir ao banco"""
+    cache_respostas.ativo = False
+    yield
+    cache_respostas.ativo = True
+
+
+@pytest.fixture
+def curva(bancos, modo_curva, request):
+    """
+    Fixture que mede uma operação nos bancos do modo atual e valida a curva de crescimento.
+
+    A operação recebe `(db, tamanho, repeticao)`. Se `preparar(db, tamanho,
+    repeticao)` for informado, ele roda antes da medição (fora do tempo e da
+    contagem de comandos) e o valor retornado substitui a repetição; útil para
+    escolher registros num estado conhecido.
+    """
+    if modo_curva == "tempo":
+        armazenamentos, tamanhos, repeticoes = ARMAZENAMENTOS, TAMANHOS, REPETICOES
+    else:
+        armazenamentos, tamanhos, repeticoes = ("memoria",), TAMANHOS_COMANDOS, 1
+
+    def medir(operacao, complexidade="constante", preparar=None):
+        for armazenamento in armazenamentos:
+            pontos = {}
+            for tamanho in tamanhos:
+                engine = bancos(armazenamento, tamanho)
+                Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+                comandos = []
+
+                def contar(conn, cursor, statement, parameters, context, executemany):
+                    comandos.append(statement)
+
+                event.listen(engine, "after_cursor_execute", contar)
+                tempos = []
+                try:
+                    for repeticao in range(repeticoes):
+                        with Session() as db:
+                            alvo = preparar(db, tamanho, repeticao) if preparar else repeticao
+                            comandos.clear()
+                            inicio = time.perf_counter()
+                            operacao(db, tamanho, alvo)
+                            tempos.append(time.perf_counter() - inicio)
+                finally:
+                    event.remove(engine, "after_cursor_execute", contar)
+                pontos[tamanho] = {"ms": round(min(tempos) * 1000, 3), "comandos": len(comandos)}
+
+            _verificar_comandos(armazenamento, pontos)
+            if modo_curva == "tempo":
+                _curvas[(request.node.name, armazenamento)] = pontos
+                _verificar_tempo(armazenamento, pontos, complexidade)
+
+    return medir
+
+
+def _verificar_comandos(armazenamento, pontos):
+    comandos = {tamanho: ponto["comandos"] for tamanho, ponto in pontos.items()}
+    assert len(set(comandos.values())) == 1, (
+        f"[{armazenamento}] número de comandos SQL varia com o tamanho do banco: {comandos}"
+    )
+
+
+def _verificar_tempo(armazenamento, pontos, complexidade):
+    menor, maior = min(pontos), max(pontos)
+    if menor == maior:
+        return
+    crescimento = pontos[maior]["ms"] / max(pontos[menor]["ms"], 1e-3)
+    limite = CRESCIMENTO_MAXIMO[complexidade] * maior / menor
+    assert crescimento <= limite, (
+        f"[{armazenamento}] tempo cresceu {crescimento:.1f}x de {menor} para {maior} linhas "
+        f"(limite para '{complexidade}': {limite:.1f}x): {pontos}"
+    )
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Imprime as curvas de escala medidas e, se configurado, grava-as em JSON."""
+    if not _curvas:
+        return
+    terminalreporter.section("curvas de desempenho (ms / comandos SQL)")
+    cabecalho = "".join(f"{tamanho:>16}" for tamanho in TAMANHOS)
+    terminalreporter.write_line(f"{'caso':<58}{'banco':<9}{cabecalho}")
+    for (caso, armazenamento), pontos in sorted(_curvas.items()):
+        colunas = "".join(
+            f"{pontos[t]['ms']:>10.2f} / {pontos[t]['comandos']:<3}" for t in TAMANHOS if t in pontos
+        )
+        terminalreporter.write_line(f"{caso:<58}{armazenamento:<9}{colunas}")
+
+    saida = os.getenv("BENCHMARK_SAIDA")
+    if saida:
+        dados = {
+            f"{caso}[{armazenamento}]": {str(t): ponto for t, ponto in pontos.items()}
+            for (caso, armazenamento), pontos in sorted(_curvas.items())
+        }
+        with open(saida, "w", encoding="utf-8") as arquivo:
+            json.dump(dados, arquivo, indent=2, sort_keys=True)
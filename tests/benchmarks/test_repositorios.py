@@ -0,0 +1,129 @@
+"""
+Curvas de desempenho dos métodos dos repositórios.
+
+Cada remoção apaga um registro criado (ou escolhido) em `preparar`, para
+que a contagem de comandos não dependa dos dados sorteados.
+"""
+import pytest
+
+from app.models import Aluno, Materia, Tarefa, Turma
+from app.repositories import AlunoRepository, MateriaRepository, TarefaRepository, TurmaRepository
+from app.utils.pagination import LIMITE_PADRAO
+
+
+def novo_aluno(turma_id=1):
+    return Aluno(nome="Aluno Benchmark", idade=18, turma_id=turma_id, bolsista=True)
+
+
+def nova_turma(db, tamanho, repeticao):
+    turma = Turma(nome=f"Turma Temporária {tamanho}-{repeticao}")
+    db.add(turma)
+    db.commit()
+    return turma.id
+
+
+def nova_materia(db, tamanho, repeticao):
+    materia = Materia(nome=f"Matéria Temporária {tamanho}-{repeticao}")
+    db.add(materia)
+    db.commit()
+    return materia.id
+
+
+def novo_aluno_sem_tarefas(db, tamanho, repeticao):
+    aluno = Aluno(nome="Aluno Temporário", idade=18, turma_id=1, bolsista=False)
+    db.add(aluno)
+    db.commit()
+    return aluno.id
+
+
+def tarefa_concluida(db, tamanho, repeticao):
+    return db.query(Tarefa.id).filter(Tarefa.concluido.is_(True)).order_by(Tarefa.id.desc()).limit(1).scalar()
+
+
+def tarefa_pendente(db, tamanho, repeticao):
+    return db.query(Tarefa.id).filter(Tarefa.concluido.is_(False)).order_by(Tarefa.id).limit(1).scalar()
+
+
+CASOS = {
+    # AlunoRepository
+    "aluno.create": ("constante", lambda db, n, i: AlunoRepository(db).create(novo_aluno())),
+    "aluno.create_many": ("constante", lambda db, n, i: AlunoRepository(db).create_many(
+        [{"nome": "Aluno Benchmark", "idade": 18, "turma_id": 1 + j % 2, "bolsista": j % 3 == 0}
+         for j in range(100)])),
+    "aluno.inserir_em_lote": ("constante", lambda db, n, i: AlunoRepository(db).inserir_em_lote(
+        [{"nome": "Aluno Benchmark", "idade": 18, "turma_id": 1 + j % 2, "bolsista": j % 3 == 0}
+         for j in range(100)])),
+    "aluno.get_by_id": ("constante", lambda db, n, i: AlunoRepository(db).get_by_id(n // 2)),
+    "aluno.get_all": ("constante", lambda db, n, i: AlunoRepository(db).get_all(n // 2, LIMITE_PADRAO)),
+    "aluno.listar_resumo": ("constante", lambda db, n, i: AlunoRepository(db).listar_resumo(n // 2, LIMITE_PADRAO)),
+    "aluno.update": ("constante", lambda db, n, i: AlunoRepository(db).update(2, idade=20 + i)),
+    "aluno.delete": ("constante", lambda db, n, id: AlunoRepository(db).delete(id), novo_aluno_sem_tarefas),
+    "aluno.get_by_turma_id": ("constante", lambda db, n, i: AlunoRepository(db).get_by_turma_id(
+        1, limit=LIMITE_PADRAO)),
+    "aluno.listar_resumo_por_turma": ("constante", lambda db, n, i: AlunoRepository(db).listar_resumo_por_turma(
+        1, limit=LIMITE_PADRAO)),
+    "aluno.count_by_turma_id": ("constante", lambda db, n, i: AlunoRepository(db).count_by_turma_id(1)),
+    "aluno.get_by_materia_id": ("constante", lambda db, n, i: AlunoRepository(db).get_by_materia_id(
+        1, limit=LIMITE_PADRAO)),
+    "aluno.listar_resumo_por_materia": ("constante", lambda db, n, i:
+                                        AlunoRepository(db).listar_resumo_por_materia(1, limit=LIMITE_PADRAO)),
+    "aluno.get_ids_existentes": ("constante", lambda db, n, i: AlunoRepository(db).get_ids_existentes(
+        range(1, 11))),
+    "aluno.recalcular_tarefas_pendentes": ("linear", lambda db, n, i:
+                                           AlunoRepository(db).recalcular_tarefas_pendentes()),
+    # TurmaRepository
+    "turma.create": ("constante", lambda db, n, i: TurmaRepository(db).create(
+        Turma(nome=f"Turma Benchmark {n}-{i}"))),
+    "turma.get_by_id": ("constante", lambda db, n, i: TurmaRepository(db).get_by_id(1)),
+    "turma.get_all": ("constante", lambda db, n, i: TurmaRepository(db).get_all(limit=LIMITE_PADRAO)),
+    "turma.get_all_com_alunos": ("linear", lambda db, n, i: TurmaRepository(db).get_all_com_alunos(
+        limit=LIMITE_PADRAO)),
+    "turma.listar_resumo_com_alunos": ("linear", lambda db, n, i: TurmaRepository(db).listar_resumo_com_alunos(
+        limit=LIMITE_PADRAO)),
+    "turma.update": ("constante", lambda db, n, i: TurmaRepository(db).update(1, nome=f"Turma {n}-{i}")),
+    "turma.delete": ("constante", lambda db, n, id: TurmaRepository(db).delete(id), nova_turma),
+    "turma.get_ids_existentes": ("constante", lambda db, n, i: TurmaRepository(db).get_ids_existentes(
+        range(1, 11))),
+    "turma.get_by_nome": ("constante", lambda db, n, i: TurmaRepository(db).get_by_nome("Turma 0001")),
+    "turma.recalcular_total_bolsistas": ("linear", lambda db, n, i:
+                                         TurmaRepository(db).recalcular_total_bolsistas()),
+    # MateriaRepository
+    "materia.create": ("constante", lambda db, n, i: MateriaRepository(db).create(
+        Materia(nome=f"Matéria Benchmark {n}-{i}"))),
+    "materia.get_by_id": ("constante", lambda db, n, i: MateriaRepository(db).get_by_id(1)),
+    "materia.get_all": ("constante", lambda db, n, i: MateriaRepository(db).get_all(limit=LIMITE_PADRAO)),
+    "materia.listar_resumo": ("constante", lambda db, n, i: MateriaRepository(db).listar_resumo(
+        limit=LIMITE_PADRAO)),
+    "materia.update": ("constante", lambda db, n, i: MateriaRepository(db).update(1, nome=f"Matéria {n}-{i}")),
+    "materia.delete": ("constante", lambda db, n, id: MateriaRepository(db).delete(id), nova_materia),
+    "materia.get_ids_existentes": ("constante", lambda db, n, i: MateriaRepository(db).get_ids_existentes(
+        range(1, 11))),
+    "materia.matricular_turma": ("constante", lambda db, n, i: MateriaRepository(db).matricular_turma(
+        1 + i, [1, 2, 3])),
+    "materia.recalcular_total_alunos": ("linear", lambda db, n, i:
+                                        MateriaRepository(db).recalcular_total_alunos()),
+    "materia.get_by_nome": ("constante", lambda db, n, i: MateriaRepository(db).get_by_nome("Matéria 001")),
+    # TarefaRepository
+    "tarefa.create": ("constante", lambda db, n, i: TarefaRepository(db).create(
+        Tarefa(nome="Tarefa Benchmark", materia_id=1, aluno_id=3))),
+    "tarefa.create_para_turma": ("constante", lambda db, n, i: TarefaRepository(db).create_para_turma(
+        "Prova", 1, 1)),
+    "tarefa.get_by_id": ("constante", lambda db, n, i: TarefaRepository(db).get_by_id(n // 2)),
+    "tarefa.get_all": ("constante", lambda db, n, i: TarefaRepository(db).get_all(n // 2, LIMITE_PADRAO)),
+    "tarefa.update": ("constante", lambda db, n, id: TarefaRepository(db).update(id, concluido=True),
+                      tarefa_pendente),
+    "tarefa.delete": ("constante", lambda db, n, id: TarefaRepository(db).delete(id), tarefa_concluida),
+    "tarefa.get_by_aluno_id": ("constante", lambda db, n, i: TarefaRepository(db).get_by_aluno_id(
+        4, limit=LIMITE_PADRAO)),
+    "tarefa.listar_resumo_por_aluno": ("constante", lambda db, n, i:
+                                       TarefaRepository(db).listar_resumo_por_aluno(4, limit=LIMITE_PADRAO)),
+    "tarefa.concluir": ("constante", lambda db, n, i: TarefaRepository(db).concluir(range(1, 51))),
+    "tarefa.get_pendentes_by_aluno": ("constante", lambda db, n, i:
+                                      TarefaRepository(db).get_pendentes_by_aluno(4)),
+}
+
+
+@pytest.mark.parametrize("caso", list(CASOS))
+def test_repositorio(curva, caso):
+    complexidade, operacao, *preparar = CASOS[caso]
+    curva(operacao, complexidade, *preparar)
@@ -0,0 +1,99 @@
+"""
+Curvas de desempenho das funções de app/services.
+
+Leituras usam o limite de página padrão dos routers (100). Escritas
+alteram registros diferentes a cada repetição quando a operação não é
+idempotente.
+"""
+import pytest
+from sqlalchemy import exists
+
+from app.models import Aluno, Tarefa
+from app.routers.alunos_router import AlunoCreate
+from app.routers.materias_router import MateriaCreate, MateriasParaTurma
+from app.routers.tarefas_router import TarefaCreate, TarefaParaAluno, TarefasParaConcluir, TarefaTurmaCreate
+from app.routers.turmas_router import TurmaCreate
+from app.services import alunos_service, materias_service, tarefas_service, turmas_service
+from app.services.contadores_service import reconciliar_contadores_service
+from app.utils.pagination import LIMITE_PADRAO
+
+PAGINA = {"limit": LIMITE_PADRAO}
+
+
+def novo_aluno(turma_id=1):
+    return AlunoCreate(nome="Aluno Benchmark", idade=18, turma_id=turma_id, bolsista=True)
+
+
+def aluno_sem_tarefas(db, tamanho, repeticao):
+    """Último aluno não bolsista e sem tarefas: a remoção sempre emite os mesmos comandos"""
+    return (
+        db.query(Aluno.id)
+        .filter(Aluno.bolsista.is_(False), ~exists().where(Tarefa.aluno_id == Aluno.id))
+        .order_by(Aluno.id.desc())
+        .limit(1)
+        .scalar()
+    )
+
+
+def tarefa_pendente(db, tamanho, repeticao):
+    return db.query(Tarefa.id).filter(Tarefa.concluido.is_(False)).order_by(Tarefa.id).limit(1).scalar()
+
+
+def tarefas_pendentes(db, tamanho, repeticao):
+    ids = db.query(Tarefa.id).filter(Tarefa.concluido.is_(False)).order_by(Tarefa.id.desc()).limit(50)
+    return TarefasParaConcluir(tarefas_ids=[id for (id,) in ids])
+
+
+CASOS = {
+    # Turmas
+    "criar_turma": ("constante", lambda db, n, i: turmas_service.criar_turma_service(
+        TurmaCreate(nome=f"Turma Serviço {n}-{i}"), db)),
+    "listar_turmas": ("linear", lambda db, n, i: turmas_service.listar_turmas_service(db, **PAGINA)),
+    "listar_alunos_da_turma": ("constante", lambda db, n, i: turmas_service.listar_alunos_da_turma_service(
+        1, db, **PAGINA)),
+    "turmas_com_mais_bolsistas": ("linear", lambda db, n, i: turmas_service.turmas_com_mais_bolsistas_service(db)),
+    # Alunos
+    "criar_aluno": ("constante", lambda db, n, i: alunos_service.criar_aluno_service(novo_aluno(), db)),
+    "listar_alunos": ("constante", lambda db, n, i: alunos_service.listar_alunos_service(db, **PAGINA)),
+    "obter_aluno": ("constante", lambda db, n, i: alunos_service.obter_aluno_service(n // 2, db)),
+    "atualizar_aluno": ("constante", lambda db, n, i: alunos_service.atualizar_aluno_service(
+        2, novo_aluno(turma_id=1 + i % 2), db)),
+    "deletar_aluno": ("constante", lambda db, n, id: alunos_service.deletar_aluno_service(id, db),
+                      aluno_sem_tarefas),
+    "alunos_com_mais_tarefas_pendentes": ("linear", lambda db, n, i:
+                                          alunos_service.alunos_com_mais_tarefas_pendentes_service(db)),
+    "criar_alunos_em_lote": ("constante", lambda db, n, i: alunos_service.criar_alunos_em_lote_service(
+        [novo_aluno(turma_id=1 + j % 2) for j in range(100)], db)),
+    # Matérias
+    "criar_materia": ("constante", lambda db, n, i: materias_service.criar_materia_service(
+        MateriaCreate(nome=f"Matéria Serviço {n}-{i}"), db)),
+    "listar_materias": ("constante", lambda db, n, i: materias_service.listar_materias_service(db, **PAGINA)),
+    "listar_alunos_por_materia": ("constante", lambda db, n, i:
+                                  materias_service.listar_alunos_por_materia_service(1, db, **PAGINA)),
+    "listar_materias_mais_populares": ("constante", lambda db, n, i:
+                                       materias_service.listar_materias_mais_populares_service(db)),
+    "atribuir_materias_para_turma": ("constante", lambda db, n, i:
+                                     materias_service.atribuir_materias_para_turma_service(
+                                         1 + i, MateriasParaTurma(materias_ids=[1, 2, 3]), db)),
+    # Tarefas
+    "criar_tarefa": ("constante", lambda db, n, i: tarefas_service.criar_tarefa_service(
+        TarefaCreate(nome="Tarefa Benchmark", materia_id=1, aluno_id=3), db)),
+    "concluir_tarefa": ("constante", lambda db, n, id: tarefas_service.concluir_tarefa_service(id, db),
+                        tarefa_pendente),
+    "concluir_tarefas": ("constante", lambda db, n, dados: tarefas_service.concluir_tarefas_service(dados, db),
+                         tarefas_pendentes),
+    "atribuir_tarefa_para_turma": ("constante", lambda db, n, i: tarefas_service.atribuir_tarefa_para_turma_service(
+        1, TarefaTurmaCreate(nome="Prova", materia_id=1), db)),
+    "listar_tarefas_do_aluno": ("constante", lambda db, n, i: tarefas_service.listar_tarefas_do_aluno_service(
+        4, db, **PAGINA)),
+    "atribuir_tarefa_para_aluno": ("constante", lambda db, n, i: tarefas_service.atribuir_tarefa_para_aluno_service(
+        3, TarefaParaAluno(nome="Lista", materia_id=1), db)),
+    # Contadores
+    "reconciliar_contadores": ("linear", lambda db, n, i: reconciliar_contadores_service(db)),
+}
+
+
+@pytest.mark.parametrize("caso", list(CASOS))
+def test_servico(curva, caso):
+    complexidade, operacao, *preparar = CASOS[caso]
+    curva(operacao, complexidade, *preparar)
@@ -1,22 +1,34 @@
 """
 Arquivo conftest.py raiz com todas as fixtures centralizadas.
 """
+import asyncio
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
-from app.database import Base, get_db
+from app.database import Base, get_db, get_async_db, url_assincrona, instrumentar_consultas, unidade_de_trabalho
 from app.models import Aluno, Turma, Materia, Tarefa
 from app.main import app
+from app.utils import cache_respostas
 
 # Adiciona o diretório raiz ao path para imports funcionarem corretamente
 root_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(root_dir))
 
 
+@pytest.fixture(autouse=True)
+def limpar_cache():
+    """Fixture que esvazia o cache de respostas entre os testes (cada teste usa outro banco)"""
+    cache_respostas.limpar()
+    yield
+    cache_respostas.limpar()
+
+
 @pytest.fixture
 def db_session():
     """Fixture que cria uma sessão de banco de dados em memória para testes"""
@@ -79,33 +91,37 @@ def tarefa_sample(db_session, aluno_sample, materia_sample):
 
 
 @pytest.fixture
-def client():
-    """Fixture que cria um cliente de teste com banco de dados em memória"""
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
+def client(tmp_path):
+    """Fixture que cria um cliente de teste com um banco de dados temporário"""
+    url = f"sqlite:///{tmp_path / 'teste.db'}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(url_assincrona(url))
+    instrumentar_consultas(async_engine.sync_engine)
     Base.metadata.create_all(bind=engine)
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+    TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
     def override_get_db():
-        db = TestingSessionLocal()
-        try:
+        with TestingSessionLocal() as db, unidade_de_trabalho(db):
+            yield db
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
             yield db
-        finally:
-            db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     app.state._session_factory = TestingSessionLocal
     try:
         with TestClient(app) as test_client:
             yield test_client
     finally:
         app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_async_db, None)
         app.state.__dict__.pop("_session_factory", None)
         Base.metadata.drop_all(bind=engine)
         engine.dispose()
+        asyncio.run(async_engine.dispose())
 
 
 @pytest.fixture
@@ -117,3 +133,33 @@ def client_session(client):
         yield session
     finally:
         session.close()
+
+
+@pytest.fixture
+def orcamento_consultas():
+    """
+    Fixture que falha o teste se um trecho executar mais comandos SQL que o declarado.
+
+    Conta os comandos de qualquer engine (síncrona ou assíncrona) dentro do bloco.
+
+    Example:
+        >>> with orcamento_consultas(2):
+        ...     client.get("/turmas")
+    """
+    @contextmanager
+    def limitar(maximo: int):
+        comandos = []
+
+        def contar(conn, cursor, statement, parameters, context, executemany):
+            comandos.append(" ".join(statement.split()))
+
+        event.listen(Engine, "after_cursor_execute", contar)
+        try:
+            yield comandos
+        finally:
+            event.remove(Engine, "after_cursor_execute", contar)
+        if len(comandos) > maximo:
+            listagem = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(comandos, 1))
+            pytest.fail(f"{len(comandos)} comandos SQL executados (orçamento: {maximo}):\n{listagem}")
+
+    return limitar
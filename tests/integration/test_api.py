@@ -1,3 +1,8 @@
+import csv
+import io
+import json
+
+
 def create_turma(client, nome):
     r = client.post("/turmas", json={"nome": nome})
     assert r.status_code == 200
@@ -125,3 +130,98 @@ def test_atribui_tarefa_para_turma(client):
     assert len(ranking) >= 2
     ids = {item["id"]: item.get("pendentes", 0) for item in ranking}
     assert ids.get(aluno1["id"]) == 1 and ids.get(aluno2["id"]) == 1
+
+
+def test_paginacao_por_cursor_em_alunos(client):
+    turma = create_turma(client, "Turma 11")
+    criados = [create_aluno(client, turma["id"], f"Aluno 11-{i}")["id"] for i in range(5)]
+
+    vistos = []
+    params = {"limit": 2}
+    while True:
+        resp = client.get("/alunos", params=params)
+        assert resp.status_code == 200
+        assert len(resp.json()) <= 2
+        vistos.extend(item["id"] for item in resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"limit": 2, "cursor": cursor}
+
+    assert vistos == sorted(criados)
+    turma_pagina = client.get(f"/turmas/{turma['id']}/alunos", params={"limit": 3})
+    assert [item["id"] for item in turma_pagina.json()] == sorted(criados)[:3]
+
+
+def test_paginacao_cursor_invalido(client):
+    resp = client.get("/alunos", params={"cursor": "nao-e-um-cursor"})
+    assert resp.status_code == 400
+
+
+def test_cria_alunos_em_lote(client):
+    turma = create_turma(client, "Turma 12")
+    lote = [{"nome": f"Aluno 12-{i}", "idade": 18, "turma_id": turma["id"]} for i in range(3)]
+    resp = client.post("/alunos/lote", json=lote)
+    assert resp.status_code == 200
+    criados = resp.json()
+    assert [item["nome"] for item in criados] == [a["nome"] for a in lote]
+    assert all(item["turma_id"] == turma["id"] for item in criados)
+
+
+def test_respostas_seguem_response_model(client):
+    turma = create_turma(client, "Turma 13")
+    aluno = create_aluno(client, turma["id"], "Aluno 13", bolsista=True)
+    assert set(turma) == {"id", "nome"}
+    assert set(aluno) == {"id", "nome", "idade", "turma_id", "bolsista", "tarefas_pendentes"}
+    resp = client.get(f"/turmas/{turma['id']}/alunos")
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json() == [aluno]
+
+
+def test_exporta_alunos_e_tarefas_em_fluxo(client):
+    turma = create_turma(client, "Turma 14")
+    alunos = [create_aluno(client, turma["id"], f"Aluno 14-{i}") for i in range(3)]
+    materia = create_materia(client, "Materia 14")
+    tarefa = create_tarefa(client, "Tarefa 14", materia["id"], alunos[0]["id"])
+
+    resp = client.get("/alunos/export")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    exportados = [json.loads(linha) for linha in resp.text.splitlines()]
+    assert exportados == [{**aluno, "tarefas_pendentes": int(aluno is alunos[0])} for aluno in alunos]
+
+    resp = client.get("/tarefas/export", params={"formato": "csv"})
+    assert resp.headers["content-disposition"] == 'attachment; filename="tarefas.csv"'
+    cabecalho, *linhas = list(csv.reader(io.StringIO(resp.text)))
+    assert cabecalho == ["id", "nome", "concluido", "materia_id", "aluno_id"]
+    assert linhas == [[str(tarefa["id"]), "Tarefa 14", "False", str(materia["id"]), str(alunos[0]["id"])]]
+
+    assert client.get("/turmas/export", params={"formato": "xml"}).status_code == 422
+
+
+def test_importa_alunos_em_fluxo_com_erros_por_linha(client):
+    turma = create_turma(client, "Turma 15")
+    ndjson = "\n".join([
+        json.dumps({"nome": "Aluno 15-0", "idade": 18, "turma_id": turma["id"], "bolsista": True}),
+        "{nao e json",
+        json.dumps({"nome": "Aluno 15-1", "idade": "dezoito", "turma_id": turma["id"]}),
+        json.dumps({"nome": "Aluno 15-2", "idade": 19, "turma_id": 999999}),
+        json.dumps({"nome": "Aluno 15-3", "idade": 20, "turma_id": turma["id"]}),
+    ])
+    resp = client.post("/alunos/import", params={"lote": 2}, content=ndjson.encode())
+    assert resp.status_code == 200
+    resumo = resp.json()
+    assert (resumo["linhas"], resumo["criados"], resumo["com_erro"], resumo["lotes"]) == (5, 2, 3, 2)
+    assert [erro["linha"] for erro in resumo["erros"]] == [2, 3, 4]
+    assert resumo["linhas_por_segundo"] > 0
+
+    csv_texto = f"nome,idade,turma_id,bolsista\r\nAluno 15-4,21,{turma['id']},\r\nAluno 15-5,22,{turma['id']},true\r\n"
+    resp = client.post("/alunos/import", params={"formato": "csv"}, content=csv_texto.encode())
+    assert (resp.json()["criados"], resp.json()["com_erro"]) == (2, 0)
+
+    alunos = client.get(f"/turmas/{turma['id']}/alunos").json()
+    assert [(a["nome"], a["bolsista"]) for a in alunos] == [
+        ("Aluno 15-0", True), ("Aluno 15-3", False), ("Aluno 15-4", False), ("Aluno 15-5", True)
+    ]
+    bolsistas = {item["id"]: item["total_bolsistas"] for item in client.get("/turmas/mais-bolsistas").json()}
+    assert bolsistas[turma["id"]] == 2
@@ -0,0 +1,75 @@
+import logging
+
+
+def registros_de_requisicao(caplog):
+    return [r for r in caplog.records if r.name == "app.requisicoes"]
+
+
+def test_request_id_gerado_e_devolvido(client):
+    resp = client.get("/turmas")
+    assert resp.status_code == 200
+    assert len(resp.headers["X-Request-ID"]) == 32
+
+
+def test_request_id_recebido_propagado_para_logs_dos_servicos(client, caplog):
+    with caplog.at_level(logging.INFO):
+        resp = client.post("/turmas", json={"nome": "Turma 1"}, headers={"X-Request-ID": "req-123"})
+
+    assert resp.headers["X-Request-ID"] == "req-123"
+    servicos = [r for r in caplog.records if r.name == "app.services.turmas_service"]
+    assert servicos and all(r.request_id == "req-123" for r in servicos)
+
+
+def test_log_da_requisicao_tem_rota_status_e_consultas(client, caplog):
+    turma = client.post("/turmas", json={"nome": "Turma 1"}).json()
+    with caplog.at_level(logging.INFO):
+        client.get(f"/turmas/{turma['id']}/alunos")
+
+    registro = registros_de_requisicao(caplog)[-1]
+    assert registro.campos["metodo"] == "GET"
+    assert registro.campos["rota"] == "/turmas/{id}/alunos"
+    assert registro.campos["status"] == 200
+    assert registro.campos["consultas_db"] == 2
+    assert registro.campos["duracao_ms"] >= registro.campos["tempo_db_ms"] > 0
+
+
+def test_metrics_expoe_rotas_banco_cache_e_logs(client):
+    client.post("/turmas", json={"nome": "Turma 1"})
+    client.get("/turmas")
+    client.get("/turmas")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    texto = resp.text
+    assert 'http_request_duration_seconds_count{metodo="GET",rota="/turmas"}' in texto
+    assert 'http_requests_total{metodo="POST",rota="/turmas",status="200"}' in texto
+    assert "http_requests_in_flight 1.0" in texto
+    assert 'db_statement_duration_seconds_count{operacao="INSERT"}' in texto
+    assert "db_pool_checkout_wait_seconds_count" in texto
+    assert 'cache_hits_total{rota="GET /turmas"} 1' in texto
+    assert "log_queue_capacity" in texto
+
+
+def test_request_id_com_bytes_invalidos_e_substituido(client):
+    resp = client.get("/turmas", headers={"X-Request-ID": b"req-\xff"})
+
+    assert resp.status_code == 200
+    assert len(resp.headers["X-Request-ID"]) == 32
+
+
+def test_request_id_longo_demais_e_substituido(client):
+    resp = client.get("/turmas", headers={"X-Request-ID": "a" * 5000})
+
+    assert resp.status_code == 200
+    assert resp.headers["X-Request-ID"] != "a" * 5000
+    assert len(resp.headers["X-Request-ID"]) == 32
+
+
+def test_requisicoes_sem_rota_compartilham_uma_serie(client):
+    for i in range(3):
+        assert client.get(f"/nao-existe/{i}").status_code == 404
+
+    texto = client.get("/metrics").text
+    assert 'http_requests_total{metodo="GET",rota="<sem rota>",status="404"} 3' in texto
+    assert "/nao-existe" not in texto
@@ -0,0 +1,122 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from tests.integration.test_api import create_turma, create_aluno, create_materia, create_tarefa
+
+
+@pytest.fixture
+def escola(client):
+    """Três turmas com cinco alunos cada, duas matérias matriculadas e tarefas"""
+    materias = [create_materia(client, f"Matéria {i}")["id"] for i in range(2)]
+    turmas = []
+    for t in range(3):
+        turma = create_turma(client, f"Turma {t}")["id"]
+        alunos = [create_aluno(client, turma, f"Aluno {t}-{a}", bolsista=a % 2 == 0)["id"] for a in range(5)]
+        client.post(f"/materias/turma/{turma}", json={"materias_ids": materias})
+        for materia in materias:
+            create_tarefa(client, "Lista", materia, alunos[0])
+        turmas.append({"id": turma, "alunos": alunos})
+    return {"turmas": turmas, "materias": materias}
+
+
+@pytest.mark.parametrize("rota, maximo", [
+    ("/turmas", 2),
+    ("/alunos", 1),
+    ("/materias", 1),
+    ("/alunos/mais-pendentes", 1),
+    ("/materias/mais-alunos", 1),
+    ("/turmas/mais-bolsistas", 1),
+])
+def test_listagens_respeitam_orcamento(client, escola, orcamento_consultas, rota, maximo):
+    with orcamento_consultas(maximo):
+        assert client.get(rota).status_code == 200
+
+
+def test_listagens_por_relacionamento(client, escola, orcamento_consultas):
+    turma = escola["turmas"][0]["id"]
+    with orcamento_consultas(2):
+        assert len(client.get(f"/turmas/{turma}/alunos").json()) == 5
+    with orcamento_consultas(2):
+        assert len(client.get(f"/materias/{escola['materias'][0]}/alunos").json()) == 15
+
+
+def test_escritas_em_lote_nao_crescem_com_a_turma(client, escola, orcamento_consultas):
+    turma = escola["turmas"][0]["id"]
+    materia = escola["materias"][0]
+    with orcamento_consultas(4):
+        resp = client.post(f"/tarefas/turma/{turma}", json={"nome": "Prova", "materia_id": materia})
+    assert len(resp.json()["tarefas"]) == 5
+
+
+def test_orcamento_excedido_falha_o_teste(client, orcamento_consultas):
+    with pytest.raises(pytest.fail.Exception, match="orçamento: 0"):
+        with orcamento_consultas(0):
+            client.get("/alunos")
+
+
+def test_escritas_unitarias_sem_refresh(client, escola, orcamento_consultas):
+    turma = escola["turmas"][0]["id"]
+    aluno = escola["turmas"][0]["alunos"][0]
+    dados = {"nome": "Novo", "idade": 18, "turma_id": turma, "bolsista": True}
+    # SELECT da turma + INSERT ... RETURNING + contador de bolsistas
+    with orcamento_consultas(3):
+        assert client.post("/alunos", json=dados).status_code == 200
+    # Contador antigo + UPDATE ... RETURNING + contador novo
+    with orcamento_consultas(3):
+        resp = client.put(f"/alunos/{aluno}", json={**dados, "bolsista": False})
+    assert resp.json()["bolsista"] is False
+    # Matrículas (DELETE ... RETURNING) + contadores de matéria + tarefas + DELETE do aluno
+    with orcamento_consultas(4):
+        assert client.delete(f"/alunos/{aluno}").status_code == 200
+
+
+def test_uma_transacao_por_requisicao(client, escola):
+    turma = escola["turmas"][0]["id"]
+    commits = []
+    ouvinte = lambda conn: commits.append(conn)
+    event.listen(Engine, "commit", ouvinte)
+    try:
+        resp = client.post(f"/tarefas/turma/{turma}", json={"nome": "Prova", "materia_id": escola["materias"][0]})
+        client.post("/alunos/lote", json=[
+            {"nome": f"Novo {i}", "idade": 18, "turma_id": turma, "bolsista": True} for i in range(3)
+        ])
+    finally:
+        event.remove(Engine, "commit", ouvinte)
+    assert resp.status_code == 200
+    assert len(commits) == 2
+
+
+def test_conclusao_de_tarefas(client, escola, orcamento_consultas):
+    turma = escola["turmas"][0]["id"]
+    resp = client.post(f"/tarefas/turma/{turma}", json={"nome": "Prova", "materia_id": escola["materias"][0]})
+    ids = [tarefa["id"] for tarefa in resp.json()["tarefas"]]
+    # UPDATE ... WHERE concluido = 0 RETURNING + contador de pendentes
+    with orcamento_consultas(2):
+        assert client.put(f"/tarefas/{ids[0]}/concluir").status_code == 200
+    with orcamento_consultas(2):
+        resp = client.put("/tarefas/concluir", json={"tarefas_ids": ids[1:]})
+    assert resp.json()["concluidas"] == ids[1:]
+    resp = client.put("/tarefas/concluir", json={"tarefas_ids": [ids[0], 999999]})
+    assert resp.json() == {"mensagem": "0 tarefas concluídas", "concluidas": [], "nao_encontradas": [999999]}
+    pendentes = {item["id"]: item["pendentes"] for item in client.get("/alunos/mais-pendentes").json()}
+    assert all(aluno not in pendentes for aluno in escola["turmas"][0]["alunos"][1:])
+
+
+def test_tarefas_do_aluno_em_uma_consulta(client, escola, orcamento_consultas):
+    aluno = escola["turmas"][0]["alunos"][0]
+    for i in range(20):
+        create_tarefa(client, f"Exercício {i}", escola["materias"][i % 2], aluno)
+    client.put("/tarefas/concluir", json={"tarefas_ids": [1, 2]})
+    # tarefas LEFT JOIN materias, sem carregar tarefa.materia por linha
+    with orcamento_consultas(1):
+        tarefas = client.get(f"/tarefas/aluno/{aluno}").json()
+    assert len(tarefas) == 22
+    assert {tarefa["materia"] for tarefa in tarefas} == {"Matéria 0", "Matéria 1"}
+    with orcamento_consultas(1):
+        pendentes = client.get(f"/tarefas/aluno/{aluno}", params={"concluido": False, "limit": 5}).json()
+    assert len(pendentes) == 5 and not any(tarefa["concluido"] for tarefa in pendentes)
+    # Lista vazia: uma consulta extra confirma que o aluno existe
+    sem_tarefas = escola["turmas"][0]["alunos"][1]
+    with orcamento_consultas(2):
+        assert client.get(f"/tarefas/aluno/{sem_tarefas}").json() == []
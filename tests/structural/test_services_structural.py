@@ -20,6 +20,7 @@ from app.services.alunos_service import (
     alunos_com_mais_tarefas_pendentes_service,
     criar_alunos_em_lote_service,
 )
+from app.services.contadores_service import reconciliar_contadores_service
 from app.services.turmas_service import (
     criar_turma_service,
     listar_turmas_service,
@@ -174,6 +175,8 @@ def test_alunos_cenarios_coletivos(db_session, setup_dados):
         criar_alunos_em_lote_service(lote_invalido, db_session)
     db_session.query(Tarefa).filter(Tarefa.aluno_id == setup_dados["aluno1"].id).update({"concluido": True})
     db_session.commit()
+    # Escritas diretas não passam pelos repositórios: os contadores precisam ser reconciliados
+    reconciliar_contadores_service(db_session)
 
     pendentes_vazio = alunos_com_mais_tarefas_pendentes_service(db_session)
     if pendentes_vazio:
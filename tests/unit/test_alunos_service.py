@@ -21,7 +21,7 @@ class MockAlunoCreate:
 
 
 class TestAlunosService:
-    """Testes unitários para alunos_service (5 testes)"""
+    """Testes unitários para alunos_service (6 testes)"""
 
     def test_criar_aluno_sucesso(self, db_session, turma_sample):
         """Teste de criação de aluno com sucesso"""
@@ -52,3 +52,13 @@ class TestAlunosService:
         aluno = alunos_service.criar_aluno_service(dados, db_session)
         resultado = alunos_service.deletar_aluno_service(aluno.id, db_session)
         assert "mensagem" in resultado
+
+    def test_criar_alunos_em_lote_atomico(self, db_session, turma_sample):
+        """Teste de que um lote com turma inexistente não grava nenhum aluno"""
+        lote = [
+            MockAlunoCreate("Válido", 20, False, turma_sample.id),
+            MockAlunoCreate("Inválido", 20, False, 9999),
+        ]
+        with pytest.raises(TurmaNotFoundException):
+            alunos_service.criar_alunos_em_lote_service(lote, db_session)
+        assert alunos_service.listar_alunos_service(db_session) == []
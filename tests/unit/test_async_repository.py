@@ -0,0 +1,69 @@
+import asyncio
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.database import Base
+from app.models import Aluno, Turma
+from app.repositories import AsyncAlunoRepository, AsyncTurmaRepository
+
+
+@pytest.fixture
+def async_session_factory(tmp_path):
+    """Fixture que cria um banco SQLite temporário acessado via aiosqlite"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+
+    async def criar_tabelas():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(criar_tabelas())
+    yield async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+class TestAsyncRepositories:
+    """Testes unitários para os repositórios assíncronos (3 testes)"""
+
+    def test_crud_assincrono(self, async_session_factory):
+        """Teste de criação, busca, atualização e exclusão via AsyncSession"""
+        async def cenario():
+            async with async_session_factory() as db:
+                turma = await AsyncTurmaRepository(db).create(Turma(nome="Turma Async"))
+                repo = AsyncAlunoRepository(db)
+                aluno = await repo.create(Aluno(nome="Ana", idade=20, turma_id=turma.id))
+                atualizado = await repo.update(aluno.id, nome="Ana Maria")
+                buscado = await repo.get_by_id(aluno.id)
+                removido = await repo.delete(aluno.id)
+                return atualizado.nome, buscado.id, removido, await repo.get_by_id(aluno.id)
+
+        nome, id, removido, apos_remocao = asyncio.run(cenario())
+        assert nome == "Ana Maria"
+        assert id is not None
+        assert removido is True
+        assert apos_remocao is None
+
+    def test_metodos_especificos_do_repositorio(self, async_session_factory):
+        """Teste de métodos específicos expostos como corrotinas"""
+        async def cenario():
+            async with async_session_factory() as db:
+                turma = await AsyncTurmaRepository(db).create(Turma(nome="Turma Async 2"))
+                repo = AsyncAlunoRepository(db)
+                for i in range(3):
+                    await repo.create(Aluno(nome=f"Aluno {i}", idade=18, turma_id=turma.id))
+                return await repo.get_by_turma_id(turma.id, limit=2)
+
+        alunos = asyncio.run(cenario())
+        assert [a.nome for a in alunos] == ["Aluno 0", "Aluno 1"]
+
+    def test_exportar_em_lotes(self, async_session_factory):
+        """Teste de leitura da tabela inteira em lotes limitados, via cursor"""
+        async def cenario():
+            async with async_session_factory() as db:
+                turma = await AsyncTurmaRepository(db).create(Turma(nome="Turma Async 3"))
+                repo = AsyncAlunoRepository(db)
+                for i in range(5):
+                    await repo.create(Aluno(nome=f"Aluno {i}", idade=18, turma_id=turma.id))
+                return [[linha.nome for linha in linhas] async for linhas in repo.exportar(lote=2)]
+
+        lotes = asyncio.run(cenario())
+        assert lotes == [["Aluno 0", "Aluno 1"], ["Aluno 2", "Aluno 3"], ["Aluno 4"]]
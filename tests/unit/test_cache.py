@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.services import alunos_service, tarefas_service, turmas_service
+from app.utils import cache_respostas
+from app.utils.cache import CacheRespostas
+
+
+class TestCacheRespostas:
+    """Testes do cache LRU com TTL e invalidação por tabela (5 testes)"""
+
+    def test_segunda_leitura_vem_do_cache(self):
+        """Teste de que a mesma rota e parâmetros calculam o valor uma única vez"""
+        cache = CacheRespostas()
+        chamadas = []
+        calcular = lambda: chamadas.append(1) or [1, 2]
+
+        assert cache.obter_ou_calcular("GET /x", (), frozenset({"a"}), calcular) == [1, 2]
+        assert cache.obter_ou_calcular("GET /x", (), frozenset({"a"}), calcular) == [1, 2]
+        assert len(chamadas) == 1
+        assert cache.estatisticas()["rotas"]["GET /x"] == {"hits": 1, "misses": 1}
+
+    def test_invalidacao_remove_apenas_dependentes(self):
+        """Teste de que invalidar uma tabela preserva entradas de outras tabelas"""
+        cache = CacheRespostas()
+        cache.obter_ou_calcular("GET /a", (), frozenset({"alunos"}), lambda: "a")
+        cache.obter_ou_calcular("GET /m", (), frozenset({"materias"}), lambda: "m")
+
+        cache.invalidar("alunos")
+
+        assert cache.obter_ou_calcular("GET /a", (), frozenset({"alunos"}), lambda: "novo") == "novo"
+        assert cache.obter_ou_calcular("GET /m", (), frozenset({"materias"}), lambda: "novo") == "m"
+
+    def test_lru_e_ttl(self):
+        """Teste de remoção da entrada menos usada e de expiração por TTL"""
+        cache = CacheRespostas(max_itens=2, ttl_segundos=10)
+        for chave in ("1", "2", "3"):
+            cache.obter_ou_calcular("GET /x", (chave,), frozenset(), lambda: chave)
+        assert cache.estatisticas()["itens"] == 2
+        assert cache.estatisticas()["remocoes_lru"] == 1
+
+        with patch("app.utils.cache.time.monotonic", return_value=10**9):
+            assert cache.obter_ou_calcular("GET /x", ("3",), frozenset(), lambda: "expirado") == "expirado"
+
+    def test_escrita_durante_calculo_nao_grava_valor_antigo(self):
+        """Teste de que um resultado lido antes de uma invalidação não fica no cache"""
+        cache = CacheRespostas()
+
+        def calcular_com_escrita_concorrente():
+            cache.invalidar("alunos")
+            return "antigo"
+
+        cache.obter_ou_calcular("GET /a", (), frozenset({"alunos"}), calcular_com_escrita_concorrente)
+        assert cache.estatisticas()["itens"] == 0
+
+    def test_rota_desativada(self):
+        """Teste de que rotas configuradas como desativadas sempre recalculam"""
+        cache = CacheRespostas(rotas_desativadas=["GET /x"])
+        cache.obter_ou_calcular("GET /x", (), frozenset(), lambda: 1)
+        assert cache.obter_ou_calcular("GET /x", (), frozenset(), lambda: 2) == 2
+        assert cache.estatisticas()["itens"] == 0
+
+
+class TestCacheNosServicos:
+    """Testes da integração do cache com os serviços de leitura e escrita (2 testes)"""
+
+    def test_ranking_invalidado_pela_escrita(self, db_session, aluno_sample, materia_sample):
+        """Teste de que criar uma tarefa invalida o ranking de pendências em cache"""
+        assert alunos_service.alunos_com_mais_tarefas_pendentes_service(db_session) == []
+
+        dados = SimpleNamespace(nome="Lista 1", materia_id=materia_sample.id)
+        tarefas_service.atribuir_tarefa_para_aluno_service(aluno_sample.id, dados, db_session)
+
+        ranking = alunos_service.alunos_com_mais_tarefas_pendentes_service(db_session)
+        assert ranking == [{"id": aluno_sample.id, "nome": aluno_sample.nome, "pendentes": 1}]
+
+    def test_parametros_fazem_parte_da_chave(self, db_session, turma_sample):
+        """Teste de que páginas diferentes são armazenadas separadamente e a sessão é ignorada"""
+        turmas_service.listar_turmas_service(db_session, limit=1)
+        turmas_service.listar_turmas_service(db=db_session, limit=1)
+        turmas_service.listar_turmas_service(db_session, after_id=turma_sample.id, limit=1)
+
+        rota = cache_respostas.estatisticas()["rotas"]["GET /turmas"]
+        assert rota == {"hits": 1, "misses": 2}
@@ -0,0 +1,89 @@
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+
+import reconciliar_contadores
+from app.database import Base
+from app.models import Aluno, Turma, Materia, Tarefa
+from app.repositories import AlunoRepository, TurmaRepository, MateriaRepository, TarefaRepository
+from app.services.contadores_service import reconciliar_contadores_service
+
+
+def contadores(db_session):
+    """Retorna um retrato dos três contadores materializados"""
+    db_session.expire_all()
+    return (
+        {a.id: a.tarefas_pendentes for a in db_session.query(Aluno)},
+        {m.id: m.total_alunos for m in db_session.query(Materia)},
+        {t.id: t.total_bolsistas for t in db_session.query(Turma)},
+    )
+
+
+class TestContadoresMaterializados:
+    """Testes dos contadores mantidos pelas escritas dos repositórios (4 testes)"""
+
+    def test_contadores_incrementais_batem_com_reconciliacao(self, db_session):
+        """Teste de que as escritas mantêm os mesmos valores que a reconstrução completa"""
+        turma_repo, aluno_repo = TurmaRepository(db_session), AlunoRepository(db_session)
+        materia_repo, tarefa_repo = MateriaRepository(db_session), TarefaRepository(db_session)
+        turma_a = turma_repo.create(Turma(nome="A")).id
+        turma_b = turma_repo.create(Turma(nome="B")).id
+        materia = materia_repo.create(Materia(nome="Física")).id
+
+        aluno = aluno_repo.create(Aluno(nome="Ana", idade=18, bolsista=True, turma_id=turma_a)).id
+        aluno_repo.create_many([
+            {"nome": "Bia", "idade": 18, "bolsista": True, "turma_id": turma_a},
+            {"nome": "Caio", "idade": 19, "bolsista": False, "turma_id": turma_b},
+        ])
+        materia_repo.matricular_turma(turma_a, [materia])
+        tarefa = tarefa_repo.create(Tarefa(nome="T1", materia_id=materia, aluno_id=aluno)).id
+        tarefa_repo.create_para_turma("T2", materia, turma_a)
+        tarefa_repo.update(tarefa, concluido=True)
+        aluno_repo.update(aluno, turma_id=turma_b)
+
+        incrementais = contadores(db_session)
+        reconciliar_contadores_service(db_session)
+        assert contadores(db_session) == incrementais
+        assert incrementais[1][materia] == 2
+        assert incrementais[2] == {turma_a: 1, turma_b: 1}
+
+    def test_exclusao_de_aluno_atualiza_contadores(self, db_session, aluno_sample, materia_sample):
+        """Teste de exclusão de aluno bolsista matriculado"""
+        MateriaRepository(db_session).matricular_turma(aluno_sample.turma_id, [materia_sample.id])
+        reconciliar_contadores_service(db_session)
+        turma_id, materia_id = aluno_sample.turma_id, materia_sample.id
+
+        AlunoRepository(db_session).delete(aluno_sample.id)
+
+        _, materias, turmas = contadores(db_session)
+        assert materias[materia_id] == 0
+        assert turmas[turma_id] == 0
+
+    def test_reconciliacao_corrige_escritas_diretas(self, db_session, tarefa_sample):
+        """Teste de reconciliação após escrita que não passou pelos repositórios"""
+        aluno_id = tarefa_sample.aluno_id
+        reconciliar_contadores_service(db_session)
+        assert contadores(db_session)[0][aluno_id] == 1
+
+        db_session.query(Tarefa).update({"concluido": True})
+        db_session.commit()
+        reconciliar_contadores_service(db_session)
+        assert contadores(db_session)[0][aluno_id] == 0
+
+    def test_script_grava_contadores_reconciliados(self, tmp_path, monkeypatch, capsys):
+        """Teste de que o script confirma a reconciliação: outra sessão lê os contadores"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'contadores.db'}")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            turma_id = conn.execute(insert(Turma).values(nome="A").returning(Turma.id)).scalar_one()
+            conn.execute(insert(Aluno), [
+                {"nome": "Ana", "idade": 18, "bolsista": True, "turma_id": turma_id},
+                {"nome": "Bia", "idade": 18, "bolsista": True, "turma_id": turma_id},
+            ])
+        monkeypatch.setattr(reconciliar_contadores, "SessionLocal", sessionmaker(bind=engine))
+        try:
+            reconciliar_contadores.main()
+            with Session(engine) as db:
+                assert db.get(Turma, turma_id).total_bolsistas == 2
+        finally:
+            engine.dispose()
+        assert "Contadores reconciliados" in capsys.readouterr().out
@@ -0,0 +1,50 @@
+from sqlalchemy import create_engine, text
+
+from benchmarks.carga import ler_estatisticas
+from benchmarks.dados import gerar_dados
+
+
+def conteudo(url):
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        dados = {
+            tabela: conn.execute(text(f"SELECT * FROM {tabela} ORDER BY 1, 2")).all()
+            for tabela in ("turmas", "materias", "alunos", "aluno_materia", "tarefas")
+        }
+    engine.dispose()
+    return dados
+
+
+class TestDadosDeCarga:
+    """Testes do gerador de dados e do relatório de carga (2 testes)"""
+
+    def test_gerador_deterministico(self, tmp_path):
+        """Teste de que a mesma semente gera bancos idênticos e contadores consistentes"""
+        urls = [f"sqlite:///{tmp_path / nome}" for nome in ("a.db", "b.db")]
+        manifestos = [gerar_dados(url, turmas=3, alunos=30, materias=6, tarefas=90) for url in urls]
+
+        assert manifestos[0] == manifestos[1]
+        assert manifestos[0]["matriculas"] == 30 * 5
+        primeiro, segundo = conteudo(urls[0]), conteudo(urls[1])
+        assert primeiro == segundo
+        pendentes = sum(1 for tarefa in primeiro["tarefas"] if not tarefa.concluido)
+        assert sum(aluno.tarefas_pendentes for aluno in primeiro["alunos"]) == pendentes
+
+    def test_leitura_do_csv_do_locust(self, tmp_path):
+        """Teste da conversão das estatísticas do Locust em métricas por endpoint"""
+        arquivo = tmp_path / "locust_stats.csv"
+        arquivo.write_text(
+            "Type,Name,Request Count,Failure Count,Median Response Time,Average Response Time,"
+            "Min Response Time,Max Response Time,Average Content Size,Requests/s,Failures/s,"
+            "50%,66%,75%,80%,90%,95%,98%,99%,99.9%,99.99%,100%\n"
+            "GET,/turmas,100,1,12,14.5,3,80,900,20.123,0.2,12,13,14,15,20,30,40,60,80,80,80\n"
+            ",Aggregated,100,1,12,14.5,3,80,900,20.123,0.2,12,13,14,15,20,30,40,60,80,80,80\n",
+            encoding="utf-8",
+        )
+        endpoints = ler_estatisticas(arquivo)
+
+        assert endpoints["GET /turmas"] == {
+            "requisicoes": 100, "falhas": 1, "rps": 20.12, "media_ms": 14.5,
+            "p50_ms": 12.0, "p95_ms": 30.0, "p99_ms": 60.0,
+        }
+        assert "total" in endpoints
@@ -0,0 +1,136 @@
+import logging
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import database
+from app.database import Base, criar_engine, get_db, instrumentar_consultas, pragmas_do_perfil, unidade_de_trabalho
+from app.exceptions import TurmaNotFoundException
+from app.models import Turma
+from app.repositories import TurmaRepository
+from app.utils import em_cache, invalidar_cache
+
+
+class TestPerfisSQLite:
+    """Testes unitários dos perfis de ajuste do SQLite (3 testes)"""
+
+    def test_perfil_producao_aplica_pragmas(self, tmp_path):
+        """Teste de que o perfil de produção ativa WAL e synchronous=NORMAL"""
+        engine = criar_engine(f"sqlite:///{tmp_path / 'perfil.db'}", "producao")
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+            assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+        engine.dispose()
+
+    def test_sobrescrita_por_variavel_de_ambiente(self, monkeypatch):
+        """Teste de sobrescrita de um PRAGMA pelo ambiente"""
+        monkeypatch.setenv("SQLITE_BUSY_TIMEOUT", "100")
+        assert pragmas_do_perfil("producao")["busy_timeout"] == "100"
+
+    def test_perfil_desconhecido(self):
+        """Teste de perfil inexistente"""
+        with pytest.raises(ValueError):
+            pragmas_do_perfil("inexistente")
+
+
+class TestConsultasLentas:
+    """Testes do registro de consultas lentas com plano de execução (1 teste)"""
+
+    def test_consulta_acima_do_limite_registra_parametros_e_plano(self, caplog):
+        """Teste de que um comando acima do limite é registrado com parâmetros e EXPLAIN"""
+        engine = create_engine("sqlite://")
+        instrumentar_consultas(engine, limite_consulta_lenta_ms=0)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE itens (id INTEGER PRIMARY KEY, nome TEXT)"))
+            with caplog.at_level(logging.WARNING, logger="app.banco"):
+                conn.execute(text("SELECT nome FROM itens WHERE id = :id"), {"id": 7})
+
+        registro = [r for r in caplog.records if r.name == "app.banco"][-1]
+        assert registro.campos["sql"] == "SELECT nome FROM itens WHERE id = ?"
+        assert registro.campos["parametros"] == (7,)
+        assert "SEARCH itens USING INTEGER PRIMARY KEY" in registro.campos["plano"]
+        engine.dispose()
+
+
+class TestUnidadeDeTrabalho:
+    """Testes unitários da unidade de trabalho (5 testes)"""
+
+    @staticmethod
+    def nomes(db_session):
+        return sorted(nome for (nome,) in db_session.query(Turma.nome))
+
+    def test_um_commit_para_varias_escritas(self, db_session):
+        """Teste de que várias escritas de repositório geram um único commit"""
+        commits = []
+        event.listen(db_session.get_bind(), "commit", lambda conn: commits.append(conn))
+        with unidade_de_trabalho(db_session):
+            repo = TurmaRepository(db_session)
+            for nome in ("A", "B", "C"):
+                repo.create(Turma(nome=nome))
+            assert commits == []
+        assert len(commits) == 1
+        assert self.nomes(db_session) == ["A", "B", "C"]
+
+    def test_app_exception_desfaz_tudo(self, db_session):
+        """Teste de rollback de todas as escritas quando o serviço lança AppException"""
+        with pytest.raises(TurmaNotFoundException):
+            with unidade_de_trabalho(db_session):
+                TurmaRepository(db_session).create(Turma(nome="A"))
+                raise TurmaNotFoundException("Turma com ID 99 não encontrada")
+        assert self.nomes(db_session) == []
+
+    def test_unidade_aninhada_usa_savepoint(self, db_session):
+        """Teste de que um erro numa unidade aninhada desfaz apenas o trecho interno"""
+        repo = TurmaRepository(db_session)
+        with unidade_de_trabalho(db_session):
+            repo.create(Turma(nome="A"))
+            with pytest.raises(TurmaNotFoundException):
+                with unidade_de_trabalho(db_session):
+                    repo.create(Turma(nome="B"))
+                    raise TurmaNotFoundException("Turma com ID 99 não encontrada")
+            repo.create(Turma(nome="C"))
+        assert self.nomes(db_session) == ["A", "C"]
+
+    def test_cache_invalidado_apenas_apos_commit(self, db_session):
+        """Teste de que a invalidação de cache espera o commit e é descartada no rollback"""
+        chamadas = []
+
+        @em_cache("GET /teste", depende_de=("turmas",))
+        def listar(db):
+            chamadas.append(1)
+            return len(chamadas)
+
+        listar(db_session)
+        with pytest.raises(TurmaNotFoundException):
+            with unidade_de_trabalho(db_session):
+                invalidar_cache("turmas")
+                raise TurmaNotFoundException("Turma com ID 99 não encontrada")
+        assert listar(db_session) == 1
+        with unidade_de_trabalho(db_session):
+            invalidar_cache("turmas")
+            assert listar(db_session) == 1
+        assert listar(db_session) == 2
+
+    def test_get_db_grava_ao_final_e_desfaz_em_erro(self, tmp_path, monkeypatch):
+        """Teste de que Depends(get_db) confirma as escritas da rota ou desfaz em exceção"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'get_db.db'}")
+        Base.metadata.create_all(engine)
+        monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=engine))
+        try:
+            dependencia = get_db()
+            TurmaRepository(next(dependencia)).create(Turma(nome="A"))
+            with pytest.raises(StopIteration):
+                next(dependencia)
+
+            dependencia = get_db()
+            TurmaRepository(next(dependencia)).create(Turma(nome="B"))
+            with pytest.raises(TurmaNotFoundException):
+                dependencia.throw(TurmaNotFoundException("Turma com ID 99 não encontrada"))
+
+            with Session(engine) as db:
+                assert self.nomes(db) == ["A"]
+        finally:
+            engine.dispose()
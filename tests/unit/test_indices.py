@@ -0,0 +1,72 @@
+"""
+Testes de plano de execução: garantem que as consultas mais frequentes
+dos repositórios e rankings usam índices em vez de varrer tabelas inteiras.
+"""
+from sqlalchemy import event
+
+from app.repositories import AlunoRepository, TarefaRepository
+from app.services.alunos_service import alunos_com_mais_tarefas_pendentes_service
+from app.services.materias_service import listar_materias_mais_populares_service
+from app.services.turmas_service import turmas_com_mais_bolsistas_service
+
+
+def planos_executados(db_session, operacao) -> str:
+    """Executa a operação e retorna o EXPLAIN QUERY PLAN de cada SELECT emitido"""
+    consultas = []
+    engine = db_session.get_bind()
+    listener = lambda conn, cursor, sql, params, *args: consultas.append((sql, params))
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        operacao()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    conexao = db_session.connection().connection.dbapi_connection
+    planos = []
+    for sql, params in consultas:
+        if sql.lstrip().upper().startswith("SELECT"):
+            linhas = conexao.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            planos.extend(linha[-1] for linha in linhas)
+    return "\n".join(planos)
+
+
+class TestPlanosDeConsulta:
+    """Testes de uso de índices nas consultas frequentes (7 testes)"""
+
+    def test_alunos_por_turma(self, db_session):
+        """Teste de busca de alunos por turma via índice"""
+        plano = planos_executados(db_session, lambda: AlunoRepository(db_session).get_by_turma_id(1))
+        assert "USING INDEX ix_alunos_turma_id (turma_id=?)" in plano
+
+    def test_alunos_por_materia(self, db_session):
+        """Teste de busca de alunos matriculados via índice de aluno_materia"""
+        plano = planos_executados(db_session, lambda: AlunoRepository(db_session).get_by_materia_id(1))
+        assert "ix_aluno_materia_materia_id (materia_id=?)" in plano
+
+    def test_tarefas_por_aluno(self, db_session):
+        """Teste de busca de tarefas por aluno via índice composto"""
+        plano = planos_executados(db_session, lambda: TarefaRepository(db_session).get_by_aluno_id(1))
+        assert "ix_tarefas_aluno_id_concluido (aluno_id=?)" in plano
+
+    def test_tarefas_pendentes_por_aluno(self, db_session):
+        """Teste de busca de tarefas pendentes usando as duas colunas do índice composto"""
+        plano = planos_executados(db_session, lambda: TarefaRepository(db_session).get_pendentes_by_aluno(1))
+        assert "ix_tarefas_aluno_id_concluido (aluno_id=? AND concluido=?)" in plano
+
+    def test_ranking_alunos_pendentes(self, db_session):
+        """Teste do ranking de pendentes lido pelo índice do contador"""
+        plano = planos_executados(db_session, lambda: alunos_com_mais_tarefas_pendentes_service(db_session))
+        assert "ix_alunos_tarefas_pendentes" in plano
+        assert "TEMP B-TREE" not in plano
+
+    def test_ranking_materias_populares(self, db_session):
+        """Teste do ranking de matérias lido pelo índice do contador"""
+        plano = planos_executados(db_session, lambda: listar_materias_mais_populares_service(db_session))
+        assert "ix_materias_total_alunos" in plano
+        assert "TEMP B-TREE" not in plano
+
+    def test_ranking_turmas_bolsistas(self, db_session):
+        """Teste do ranking de turmas lido pelo índice do contador"""
+        plano = planos_executados(db_session, lambda: turmas_com_mais_bolsistas_service(db_session))
+        assert "ix_turmas_total_bolsistas" in plano
+        assert "TEMP B-TREE" not in plano
@@ -0,0 +1,177 @@
+import json
+import logging
+import queue
+
+from app.utils import setup_logger, iniciar_logs, parar_logs, estatisticas_logs, LoggerEstruturado
+from app.utils.contexto import request_id_atual
+from app.utils.logger import QueueHandlerLimitado, FormatadorJSON, FiltroContexto
+
+
+class HandlerMemoria(logging.Handler):
+    """Handler que guarda as mensagens formatadas em memória"""
+
+    def __init__(self):
+        super().__init__()
+        self.mensagens = []
+
+    def emit(self, record):
+        self.mensagens.append(self.format(record))
+
+
+def registro(nivel=logging.INFO, mensagem="msg"):
+    return logging.LogRecord("teste", nivel, __file__, 1, mensagem, None, None)
+
+
+class TestLoggerEmFila:
+    """Testes da escrita de logs em segundo plano (5 testes)"""
+
+    def test_parar_logs_escreve_registros_pendentes(self, tmp_path):
+        """Teste de que o desligamento escreve no arquivo tudo o que estava na fila"""
+        arquivo = tmp_path / "fila.log"
+        logger = setup_logger("teste.fila", log_file=str(arquivo))
+        logger.propagate = False
+        try:
+            for i in range(50):
+                logger.info("registro %d", i)
+            parar_logs()
+            linhas = arquivo.read_text(encoding="utf-8").splitlines()
+            assert len(linhas) == 50
+            assert linhas[-1].endswith("registro 49")
+        finally:
+            iniciar_logs()
+        assert estatisticas_logs()["ativo"]
+
+    def test_formato_texto_inclui_request_id(self, tmp_path):
+        """Teste de que o formato de texto traz o request_id da requisição"""
+        arquivo = tmp_path / "texto.log"
+        logger = setup_logger("teste.texto", log_file=str(arquivo))
+        logger.propagate = False
+        token = request_id_atual.set("req-7")
+        try:
+            logger.info("dentro da requisição")
+        finally:
+            request_id_atual.reset(token)
+        logger.info("fora da requisição")
+        try:
+            parar_logs()
+            linhas = arquivo.read_text(encoding="utf-8").splitlines()
+            assert " - [req-7] - dentro da requisição" in linhas[0]
+            assert " - [None] - fora da requisição" in linhas[1]
+        finally:
+            iniciar_logs()
+
+    def test_fila_cheia_descarta_abaixo_de_warning(self):
+        """Teste da política de descarte: INFO é descartado e WARNING aguarda espaço"""
+        fila = queue.Queue(maxsize=1)
+        handler = QueueHandlerLimitado(fila, [], politica="descartar", timeout=0.01)
+        handler.enqueue(handler.prepare(registro()))
+        handler.enqueue(handler.prepare(registro()))
+        handler.enqueue(handler.prepare(registro(logging.WARNING)))
+
+        assert fila.qsize() == 1
+        assert handler.descartados == 2
+
+    def test_alteracoes_apos_o_log_nao_mudam_a_mensagem(self):
+        """Teste de que argumentos e campos são copiados ao enfileirar o registro"""
+        fila = queue.Queue()
+        destino = HandlerMemoria()
+        base = logging.getLogger("teste.copia")
+        base.setLevel(logging.INFO)
+        base.propagate = False
+        handler = QueueHandlerLimitado(fila, [destino])
+        base.addHandler(handler)
+        ids, notas = [1], {"a": 1}
+        try:
+            LoggerEstruturado(base).info("Alunos %s", ids, notas=notas)
+        finally:
+            base.removeHandler(handler)
+        ids.append(2)
+        notas["b"] = 2
+
+        destinos, record = fila.get_nowait()
+        destinos[0].handle(record)
+        assert destino.mensagens == ["Alunos [1] notas={'a': 1}"]
+        assert record.campos == {"notas": {"a": 1}}
+
+    def test_sem_despachante_escreve_de_forma_sincrona(self):
+        """Teste de que, com a thread parada, os registros são escritos na hora"""
+        destino = HandlerMemoria()
+        handler = QueueHandlerLimitado(queue.Queue(), [destino])
+        parar_logs()
+        try:
+            handler.emit(registro(mensagem="direto"))
+        finally:
+            iniciar_logs()
+        assert destino.mensagens == ["direto"]
+
+
+class Contador:
+    """Valor de campo que conta quantas vezes foi convertido em texto"""
+
+    def __init__(self):
+        self.conversoes = 0
+
+    def __str__(self):
+        self.conversoes += 1
+        return "valor"
+
+
+class TestLoggerEstruturado:
+    """Testes do logger com campos chave=valor e formatação adiada (2 testes)"""
+
+    def test_campos_renderizados_na_formatacao(self):
+        """Teste de que a mensagem inclui os campos chave=valor, convertidos uma única vez"""
+        base = logging.getLogger("teste.estruturado")
+        base.setLevel(logging.INFO)
+        base.propagate = False
+        destino = HandlerMemoria()
+        base.addHandler(destino)
+        logger = LoggerEstruturado(base)
+        campo = Contador()
+
+        logger.info("Aluno criado", aluno_id=1, campo=campo)
+
+        assert destino.mensagens == ["Aluno criado aluno_id=1 campo=valor"]
+        assert campo.conversoes == 1
+        base.removeHandler(destino)
+
+    def test_nivel_desativado_nao_formata(self):
+        """Teste de que DEBUG desativado não converte nenhum campo em texto"""
+        base = logging.getLogger("teste.estruturado.desativado")
+        base.setLevel(logging.INFO)
+        destino = HandlerMemoria()
+        base.addHandler(destino)
+        campo = Contador()
+
+        LoggerEstruturado(base).debug("Processando", campo=campo)
+
+        assert campo.conversoes == 0
+        assert destino.mensagens == []
+        base.removeHandler(destino)
+
+
+class TestFormatadorJSON:
+    """Testes do formato JSON com correlação por requisição (1 teste)"""
+
+    def test_registro_estruturado_vira_json(self):
+        """Teste de que mensagem, request_id e campos saem como chaves do JSON"""
+        base = logging.getLogger("teste.json")
+        base.setLevel(logging.INFO)
+        base.propagate = False
+        destino = HandlerMemoria()
+        destino.setFormatter(FormatadorJSON())
+        destino.addFilter(FiltroContexto())
+        base.addHandler(destino)
+
+        token = request_id_atual.set("req-1")
+        try:
+            LoggerEstruturado(base).info("Aluno criado", aluno_id=7, nivel="ignorado")
+        finally:
+            request_id_atual.reset(token)
+            base.removeHandler(destino)
+
+        dados = json.loads(destino.mensagens[0])
+        assert dados["mensagem"] == "Aluno criado"
+        assert dados["request_id"] == "req-1"
+        assert dados["aluno_id"] == 7
+        assert dados["nivel"] == "INFO"
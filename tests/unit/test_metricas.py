@@ -0,0 +1,27 @@
+from app.utils.metricas import Contador, Histograma
+
+
+class TestMetricas:
+    """Testes do formato de exposição das métricas (2 testes)"""
+
+    def test_histograma_buckets_cumulativos(self):
+        """Teste de que cada bucket conta os valores menores ou iguais ao limite"""
+        histograma = Histograma("latencia", "Latência", buckets=(0.1, 1.0))
+        for valor in (0.05, 0.1, 0.5, 3.0):
+            histograma.observar(valor, rota="/x")
+
+        assert histograma.exportar() == [
+            'latencia_bucket{rota="/x",le="0.1"} 2',
+            'latencia_bucket{rota="/x",le="1.0"} 3',
+            'latencia_bucket{rota="/x",le="+Inf"} 4',
+            'latencia_sum{rota="/x"} 3.65',
+            'latencia_count{rota="/x"} 4',
+        ]
+
+    def test_contador_escapa_rotulos(self):
+        """Teste de que aspas nos rótulos são escapadas"""
+        contador = Contador("erros", "Erros")
+        contador.incrementar(rota='/a"b')
+        contador.incrementar(rota='/a"b')
+
+        assert contador.exportar() == ['erros{rota="/a\\"b"} 2']
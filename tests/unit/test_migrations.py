@@ -0,0 +1,75 @@
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+import pytest
+
+from app.migrations import aplicar_migracoes
+
+
+@pytest.fixture
+def engine_legado():
+    """Banco com o esquema original (sem chaves, índices secundários ou contadores)"""
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE turmas (id INTEGER PRIMARY KEY, nome VARCHAR)"))
+        conn.execute(text("CREATE TABLE materias (id INTEGER PRIMARY KEY, nome VARCHAR)"))
+        conn.execute(text(
+            "CREATE TABLE alunos (id INTEGER PRIMARY KEY, nome VARCHAR, idade INTEGER, "
+            "bolsista BOOLEAN, turma_id INTEGER)"
+        ))
+        conn.execute(text(
+            "CREATE TABLE tarefas (id INTEGER PRIMARY KEY, nome VARCHAR, concluido BOOLEAN, "
+            "materia_id INTEGER, aluno_id INTEGER)"
+        ))
+        conn.execute(text("CREATE TABLE aluno_materia (aluno_id INTEGER, materia_id INTEGER)"))
+        conn.execute(text("INSERT INTO turmas VALUES (1, 'A')"))
+        conn.execute(text("INSERT INTO materias VALUES (1, 'M1'), (2, 'M2')"))
+        conn.execute(text("INSERT INTO alunos VALUES (1, 'Ana', 18, 1, 1), (2, 'Bia', 18, 0, 1)"))
+        conn.execute(text("INSERT INTO tarefas VALUES (1, 'T1', 0, 1, 1), (2, 'T2', 1, 1, 1)"))
+        conn.execute(text("INSERT INTO aluno_materia VALUES (1, 1), (1, 1), (1, 2), (2, 1)"))
+    yield engine
+    engine.dispose()
+
+
+class TestMigracoes:
+    """Testes das migrações aplicadas a bancos existentes (4 testes)"""
+
+    def test_matriculas_ganham_chave_primaria_composta(self, engine_legado):
+        """Teste de deduplicação e criação da chave primária de matrículas"""
+        aplicar_migracoes(engine_legado)
+        with engine_legado.connect() as conn:
+            pares = conn.execute(text("SELECT aluno_id, materia_id FROM aluno_materia ORDER BY 1, 2")).all()
+        assert pares == [(1, 1), (1, 2), (2, 1)]
+        pk = inspect(engine_legado).get_pk_constraint("aluno_materia")
+        assert pk["constrained_columns"] == ["aluno_id", "materia_id"]
+        with pytest.raises(IntegrityError):
+            with engine_legado.begin() as conn:
+                conn.execute(text("INSERT INTO aluno_materia VALUES (1, 1)"))
+
+    def test_indices_secundarios_criados(self, engine_legado):
+        """Teste de criação dos índices declarados nos modelos"""
+        aplicar_migracoes(engine_legado)
+        inspetor = inspect(engine_legado)
+        indices = {
+            indice["name"]
+            for tabela in ("alunos", "tarefas", "aluno_materia")
+            for indice in inspetor.get_indexes(tabela)
+        }
+        assert {
+            "ix_alunos_turma_id",
+            "ix_tarefas_aluno_id_concluido",
+            "ix_tarefas_materia_id",
+            "ix_aluno_materia_materia_id",
+        } <= indices
+
+    def test_contadores_preenchidos(self, engine_legado):
+        """Teste de criação e preenchimento das colunas de contadores"""
+        aplicar_migracoes(engine_legado)
+        with engine_legado.connect() as conn:
+            assert conn.execute(text("SELECT tarefas_pendentes FROM alunos WHERE id = 1")).scalar() == 1
+            assert conn.execute(text("SELECT total_alunos FROM materias WHERE id = 1")).scalar() == 2
+            assert conn.execute(text("SELECT total_bolsistas FROM turmas WHERE id = 1")).scalar() == 1
+
+    def test_migracoes_idempotentes(self, engine_legado):
+        """Teste de que aplicar as migrações duas vezes não falha"""
+        aplicar_migracoes(engine_legado)
+        aplicar_migracoes(engine_legado)
@@ -1,10 +1,11 @@
 import pytest
+from sqlalchemy import event
 from app.repositories import AlunoRepository, TurmaRepository, MateriaRepository, TarefaRepository
 from app.models import Aluno, Turma, Materia, Tarefa
 
 
 class TestAlunoRepository:
-    """Testes unitários para AlunoRepository (8 testes)"""
+    """Testes unitários para AlunoRepository (13 testes)"""
 
     def test_create_aluno(self, db_session, turma_sample):
         """Teste de criação de aluno"""
@@ -47,6 +48,50 @@ class TestAlunoRepository:
         resultado = repo.get_by_id(aluno_sample.id)
         assert resultado is None
 
+    def test_update_e_delete_aluno_inexistente(self, db_session):
+        """Teste de escrita em ID inexistente, detectada pelas linhas afetadas"""
+        repo = AlunoRepository(db_session)
+        assert repo.update(9999, nome="Ninguém") is None
+        assert repo.delete(9999) is False
+
+    def test_update_aluno_uma_instrucao(self, db_session, aluno_sample):
+        """Teste de atualização sem SELECT antes nem refresh depois"""
+        repo = AlunoRepository(db_session)
+        comandos = []
+        event.listen(db_session.get_bind(), "after_cursor_execute", lambda *args: comandos.append(args[2]))
+        atualizado = repo.update(aluno_sample.id, nome="Maria", idade=21)
+        assert len(comandos) == 1 and comandos[0].startswith("UPDATE alunos")
+        assert (atualizado.nome, atualizado.idade) == ("Maria", 21)
+
+    def test_get_all_alunos_paginado(self, db_session, turma_sample):
+        """Teste de paginação por cursor na listagem de alunos"""
+        repo = AlunoRepository(db_session)
+        ids = [repo.create(Aluno(nome=f"Aluno {i}", idade=20, turma_id=turma_sample.id)).id for i in range(5)]
+        primeira = repo.get_all(limit=2)
+        segunda = repo.get_all(after_id=primeira[-1].id, limit=2)
+        assert [a.id for a in primeira] == ids[:2]
+        assert [a.id for a in segunda] == ids[2:4]
+
+    def test_listar_resumo_sem_hidratar(self, db_session, aluno_sample):
+        """Teste de listagem por projeção de colunas, sem objetos no identity map"""
+        repo = AlunoRepository(db_session)
+        db_session.expunge_all()
+        linhas = repo.listar_resumo(limit=10)
+        assert [(a.id, a.nome, a.turma_id) for a in linhas] == [
+            (aluno_sample.id, aluno_sample.nome, aluno_sample.turma_id)
+        ]
+        assert set(linhas[0]._fields) == set(Aluno.__table__.c.keys())
+        assert len(db_session.identity_map) == 0
+
+    def test_create_many_alunos(self, db_session, turma_sample):
+        """Teste de criação de alunos em lote com INSERT ... RETURNING"""
+        repo = AlunoRepository(db_session)
+        dados = [{"nome": f"Lote {i}", "idade": 18 + i, "turma_id": turma_sample.id} for i in range(3)]
+        criados = repo.create_many(dados)
+        assert [a["nome"] for a in criados] == ["Lote 0", "Lote 1", "Lote 2"]
+        assert all(a["id"] is not None and a["bolsista"] is False for a in criados)
+        assert len(repo.get_by_turma_id(turma_sample.id)) == 3
+
     @pytest.mark.parametrize("nome,idade", [("Ana", 20), ("Carlos", 25), ("Beatriz", 22)])
     def test_create_aluno_parametrizado(self, db_session, turma_sample, nome, idade):
         """Teste parametrizado de criação de múltiplos alunos"""
@@ -58,7 +103,7 @@ class TestAlunoRepository:
 
 
 class TestTurmaRepository:
-    """Testes unitários para TurmaRepository (3 testes)"""
+    """Testes unitários para TurmaRepository (4 testes)"""
 
     def test_create_turma(self, db_session):
         """Teste de criação de turma"""
@@ -79,6 +124,29 @@ class TestTurmaRepository:
         resultado = repo.get_all()
         assert len(resultado) >= 1
 
+    def test_get_all_com_alunos_numero_constante_de_consultas(self, db_session):
+        """Teste de listagem de turmas com alunos sem N+1 consultas"""
+        for i in range(5):
+            turma = Turma(nome=f"Turma {i}")
+            turma.alunos = [Aluno(nome=f"Aluno {i}-{j}", idade=18, turma=turma) for j in range(3)]
+            db_session.add(turma)
+        db_session.commit()
+        db_session.expire_all()
+
+        consultas = []
+        engine = db_session.get_bind()
+        listener = lambda *args: consultas.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            repo = TurmaRepository(db_session)
+            turmas = repo.get_all_com_alunos()
+            total_alunos = sum(len(turma.alunos) for turma in turmas)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert total_alunos == 15
+        assert len(consultas) == 2
+
 
 class TestMateriaRepository:
     """Testes unitários para MateriaRepository (3 testes)"""
@@ -104,7 +172,7 @@ class TestMateriaRepository:
 
 
 class TestTarefaRepository:
-    """Testes unitários para TarefaRepository (4 testes)"""
+    """Testes unitários para TarefaRepository (7 testes)"""
 
     def test_create_tarefa(self, db_session, aluno_sample, materia_sample):
         """Teste de criação de tarefa"""
@@ -127,9 +195,75 @@ class TestTarefaRepository:
         resultado = repo.get_by_id(tarefa_sample.id)
         assert resultado.concluido is True
 
+    def test_update_com_concluido_inteiro_ajusta_pendentes(self, db_session, tarefa_sample):
+        """Teste de que concluido=0/1 ajusta o contador de pendentes como False/True"""
+        repo = TarefaRepository(db_session)
+        aluno_id = tarefa_sample.aluno_id
+
+        def pendentes():
+            db_session.expire_all()
+            return db_session.get(Aluno, aluno_id).tarefas_pendentes
+
+        inicial = pendentes()
+        repo.update(tarefa_sample.id, concluido=1)
+        assert pendentes() == inicial - 1
+        repo.update(tarefa_sample.id, concluido=0)
+        assert pendentes() == inicial
+        repo.delete(tarefa_sample.id)
+        assert pendentes() == inicial - 1
+
     def test_delete_tarefa(self, db_session, tarefa_sample):
         """Teste de exclusão de tarefa"""
         repo = TarefaRepository(db_session)
         repo.delete(tarefa_sample.id)
         resultado = repo.get_by_id(tarefa_sample.id)
         assert resultado is None
+
+    def test_create_para_turma_em_uma_instrucao(self, db_session, turma_sample, materia_sample):
+        """Teste de atribuição de tarefa para a turma inteira com um único INSERT ... SELECT"""
+        alunos = [Aluno(nome=f"Aluno {i}", idade=18, turma_id=turma_sample.id) for i in range(4)]
+        db_session.add_all(alunos)
+        db_session.commit()
+        aluno_ids = sorted(a.id for a in alunos)
+        materia_id, turma_id = materia_sample.id, turma_sample.id
+
+        consultas = []
+        engine = db_session.get_bind()
+        listener = lambda *args: consultas.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            repo = TarefaRepository(db_session)
+            criadas = repo.create_para_turma("Lista 1", materia_id, turma_id)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert sorted(t["aluno_id"] for t in criadas) == aluno_ids
+        assert all(t["concluido"] is False and t["nome"] == "Lista 1" for t in criadas)
+        # INSERT ... SELECT das tarefas + UPDATE em lote dos contadores de pendentes
+        assert len(consultas) == 2
+
+    def test_concluir_em_uma_instrucao(self, db_session, aluno_sample, materia_sample):
+        """Teste de conclusão em lote com UPDATE condicional e contadores de pendentes"""
+        repo = TarefaRepository(db_session)
+        ids = [
+            repo.create(Tarefa(nome=f"T{i}", materia_id=materia_sample.id, aluno_id=aluno_sample.id)).id
+            for i in range(3)
+        ]
+        repo.concluir(ids[:1])
+
+        consultas = []
+        engine = db_session.get_bind()
+        listener = lambda *args: consultas.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            concluidas, inexistentes = repo.concluir(ids[1:])
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert (concluidas, inexistentes) == (ids[1:], set())
+        # UPDATE ... RETURNING das tarefas + UPDATE em lote dos contadores de pendentes
+        assert len(consultas) == 2
+        # Já concluídas não alteram o contador; só IDs inexistentes são reportados
+        assert repo.concluir([ids[0], 9999]) == ([], {9999})
+        db_session.expire_all()
+        assert db_session.get(Aluno, aluno_sample.id).tarefas_pendentes == 0
@@ -1,5 +1,11 @@
+import asyncio
+
 import pytest
-from app.services import tarefas_service, materias_service, turmas_service
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from app.models import Aluno
+from app.repositories import AlunoRepository
+from app.services import tarefas_service, materias_service, turmas_service, importacao_service
 from app.exceptions import TarefaNotFoundException, MateriaNotFoundException, TurmaNotFoundException
 
 
@@ -59,7 +65,7 @@ class TestTarefasService:
 
 
 class TestMateriasService:
-    """Testes unitários para materias_service (2 testes)"""
+    """Testes unitários para materias_service (3 testes)"""
 
     def test_criar_materia_sucesso(self, db_session):
         """Teste de criação de matéria com sucesso"""
@@ -72,6 +78,16 @@ class TestMateriasService:
         resultado = materias_service.listar_materias_service(db_session)
         assert len(resultado) >= 1
 
+    def test_atribuir_materias_para_turma_sem_duplicar(self, db_session, aluno_sample, materia_sample):
+        """Teste de matrícula em lote idempotente (pares existentes não são reinseridos)"""
+        dados = type("MateriasParaTurma", (), {"materias_ids": [materia_sample.id, 9999]})
+        primeira = materias_service.atribuir_materias_para_turma_service(aluno_sample.turma_id, dados, db_session)
+        segunda = materias_service.atribuir_materias_para_turma_service(aluno_sample.turma_id, dados, db_session)
+        assert primeira["novas_matriculas"] == 1
+        assert segunda["novas_matriculas"] == 0
+        alunos = materias_service.listar_alunos_por_materia_service(materia_sample.id, db_session)
+        assert [a.id for a in alunos] == [aluno_sample.id]
+
 
 class TestTurmasService:
     """Testes unitários para turmas_service (2 testes)"""
@@ -86,3 +102,74 @@ class TestTurmasService:
         """Teste de listagem de turmas"""
         resultado = turmas_service.listar_turmas_service(db_session)
         assert len(resultado) >= 1
+
+
+class TestImportacaoService:
+    """Testes unitários para importacao_service (3 testes)"""
+
+    def test_gravar_lote_isola_linhas_com_falha(self, db_session, turma_sample, monkeypatch):
+        """Teste de lote que falha no INSERT em lote e é regravado linha a linha em SAVEPOINTs"""
+        inserir_em_lote = AlunoRepository.inserir_em_lote
+
+        def inserir_rejeitando(repo, dados):
+            if any(d["nome"] == "Rejeitado" for d in dados):
+                raise IntegrityError("INSERT INTO alunos", {}, Exception("nome rejeitado"))
+            return inserir_em_lote(repo, dados)
+
+        monkeypatch.setattr(AlunoRepository, "inserir_em_lote", inserir_rejeitando)
+        registros = [
+            (2, {"nome": "Aceito 1", "idade": 18, "turma_id": turma_sample.id, "bolsista": True}),
+            (3, {"nome": "Rejeitado", "idade": 18, "turma_id": turma_sample.id, "bolsista": False}),
+            (4, {"nome": "Sem turma", "idade": 18, "turma_id": 9999, "bolsista": False}),
+            (5, {"nome": "Aceito 2", "idade": 18, "turma_id": turma_sample.id, "bolsista": False}),
+        ]
+        criados, erros = importacao_service.gravar_lote_alunos_service(registros, db_session)
+        assert criados == 2
+        assert erros == [
+            {"linha": 4, "erro": "Turma com ID 9999 não encontrada"},
+            {"linha": 3, "erro": "nome rejeitado"},
+        ]
+        db_session.expire_all()
+        assert sorted(a.nome for a in db_session.query(Aluno)) == ["Aceito 1", "Aceito 2"]
+        assert turma_sample.total_bolsistas == 1
+
+    def test_gravar_lote_desfaz_savepoint_de_linha_rejeitada_pelo_banco(self, db_session, turma_sample):
+        """Teste de linha recusada pelo próprio banco: o SAVEPOINT desfaz também o contador de bolsistas"""
+        db_session.execute(text(
+            "CREATE TRIGGER rejeitar_aluno BEFORE INSERT ON alunos WHEN NEW.nome = 'Rejeitado' "
+            "BEGIN SELECT RAISE(ABORT, 'nome rejeitado'); END"
+        ))
+        db_session.commit()
+        registros = [
+            (2, {"nome": "Aceito 1", "idade": 18, "turma_id": turma_sample.id, "bolsista": True}),
+            (3, {"nome": "Rejeitado", "idade": 18, "turma_id": turma_sample.id, "bolsista": True}),
+            (4, {"nome": "Aceito 2", "idade": 18, "turma_id": turma_sample.id, "bolsista": False}),
+        ]
+        criados, erros = importacao_service.gravar_lote_alunos_service(registros, db_session)
+        assert criados == 2
+        assert erros == [{"linha": 3, "erro": "nome rejeitado"}]
+        db_session.commit()
+        db_session.expire_all()
+        assert sorted(a.nome for a in db_session.query(Aluno)) == ["Aceito 1", "Aceito 2"]
+        assert turma_sample.total_bolsistas == 1
+
+    def test_linha_longa_vira_erro_sem_ficar_em_memoria(self, monkeypatch):
+        """Teste de linha acima de IMPORTACAO_MAX_LINHA: vira erro e as seguintes continuam"""
+        monkeypatch.setattr(importacao_service, "IMPORTACAO_MAX_LINHA", 10)
+
+        async def corpo():
+            yield b'{"a": 1}\n['
+            for _ in range(1000):
+                yield b'{"a": 1}, '
+            yield b'{"a": 1}]\n{"a": 2}\n'
+            yield b"x" * 11
+
+        async def ler():
+            return [registro async for registro in importacao_service._registros(corpo(), "ndjson")]
+
+        assert asyncio.run(ler()) == [
+            (1, {"a": 1}),
+            (2, "Linha com mais de 10 caracteres"),
+            (3, {"a": 2}),
+            (4, "Linha com mais de 10 caracteres"),
+        ]